@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+fan_out.py
+
+Describes one rule to a number of subscribers (default 5,000) spread over
+several time zones and date formats, and reports the time taken with a
+fresh human_rrule per subscriber (the rule rebuilt in the subscriber's
+zone) and with fan_out.describe_for_viewers.
+
+Usage: fan_out.py [subscribers]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY
+from dateutil.rrule import FR
+from dateutil.tz import gettz
+
+from human_rrule2 import human_rrule
+from rrule_eq import replace_rrule
+from fan_out import viewer, describe_for_viewers
+
+ZONES = ["America/New_York", "America/Los_Angeles", "Europe/London", "Europe/Berlin", "Asia/Tokyo",
+         "Australia/Sydney"]
+DATE_FORMATS = ["%B %d, %Y", "%d/%m/%Y", "%Y-%m-%d"]
+
+
+def per_subscriber(rule, viewers):
+    descriptions = []
+    for seen in viewers:
+        zoned = replace_rrule(rule, dtstart=rule._dtstart.astimezone(seen.tzinfo))
+        descriptions.append(human_rrule(zoned).get_description(seen.date_format))
+    return descriptions
+
+
+def main(subscribers=5000):
+    zones = [gettz(name) for name in ZONES]
+    rule = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 9, tzinfo=zones[0]), count=24)
+    viewers = [viewer(zones[i % len(zones)], DATE_FORMATS[i % len(DATE_FORMATS)]) for i in xrange(subscribers)]
+    for name, describe in (("per subscriber", per_subscriber), ("fan out", describe_for_viewers)):
+        start = time.time()
+        describe(rule, viewers)
+        elapsed = time.time() - start
+        print "%-15s %8.1f ms for %d subscribers" % (name, elapsed * 1000, subscribers)
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(main(int(sys.argv[1])))
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+ics_stream.py
+
+Writes .ics files of increasing size, describes every recurring event in each
+with describe_ics, and reports throughput in events/sec along with peak
+resident memory, which should stay flat as the files grow.
+
+Usage: ics_stream.py [events ...]
+"""
+
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime, timedelta
+
+RECURRENCES = [
+    "FREQ=WEEKLY;BYDAY=MO;COUNT=10",
+    "FREQ=WEEKLY;BYDAY=TU,TH;UNTIL=20151231T235959Z",
+    "FREQ=MONTHLY;BYDAY=3FR;COUNT=12",
+    "FREQ=MONTHLY;BYMONTHDAY=1",
+    "FREQ=MONTHLY;INTERVAL=2;BYDAY=2WE;\r\n UNTIL=20160101T000000Z",
+]
+
+# Events get one of this many start days, so the files hold
+# len(RECURRENCES) * START_DAYS distinct rules.
+START_DAYS = 1000
+
+
+def write_ics(path, events):
+    out = open(path, "wb")
+    out.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//human_rrule//benchmark//EN\r\n")
+    first = datetime(2011, 8, 15, 9)
+    for i in xrange(events):
+        dtstart = first + timedelta(days=i % START_DAYS)
+        out.write("BEGIN:VEVENT\r\nUID:event-%d@example.com\r\nSUMMARY:Event %d\r\n"
+                  "DTSTART;TZID=America/New_York:%s\r\nRRULE:%s\r\nEND:VEVENT\r\n"
+                  % (i, i, dtstart.strftime("%Y%m%dT%H%M%S"), RECURRENCES[i % len(RECURRENCES)]))
+    out.write("END:VCALENDAR\r\n")
+    out.close()
+
+
+def describe(path):
+    from ics_stream import describe_ics
+    start = time.time()
+    events = 0
+    for uid, description in describe_ics(path):
+        events += 1
+    elapsed = time.time() - start
+    return events, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main(sizes=(10000, 100000)):
+    directory = tempfile.mkdtemp()
+    try:
+        for events in sizes:
+            path = os.path.join(directory, "%d.ics" % events)
+            write_ics(path, events)
+            output = subprocess.check_output([sys.executable, __file__, "--describe", path])
+            described, elapsed, rss = output.split()
+            print "%8d events %6.1f MB file: %8.0f events/sec, %6.1f MB peak RSS" % (
+                int(described), os.path.getsize(path) / 1048576.0,
+                int(described) / float(elapsed), int(rss) / 1024.0)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ["--describe"]:
+        print "%d %f %d" % describe(sys.argv[2])
+    elif len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+import_time.py
+
+Measures the cold-start cost of importing human_rrule, in fresh interpreters,
+and breaks it down per module the way python -X importtime does on Python 3:
+the time spent in each module's own body ("self") and including the modules
+it imports ("cumulative").
+
+Usage: import_time.py [--runs N] [--max-ms MS] [module]
+
+module defaults to human_rrule.human_rrule2. With --max-ms, exits with status
+1 if the median import takes longer, so the check can guard cold starts.
+"""
+
+import compileall
+import os
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, ROOT)
+
+DEFAULT_MODULE = "human_rrule.human_rrule2"
+
+
+def _profile(module):
+    """Import module with a timing __import__ and print one line per module
+    imported: self and cumulative microseconds and the module name."""
+    import __builtin__
+    original = __builtin__.__import__
+    timings = []
+    stack = [0.0]
+
+    def timed_import(name, *args, **kwargs):
+        known = set(sys.modules)
+        stack.append(0.0)
+        start = time.time()
+        try:
+            return original(name, *args, **kwargs)
+        finally:
+            elapsed = time.time() - start
+            nested = stack.pop()
+            stack[-1] += elapsed
+            new = [m for m in sys.modules if m not in known and sys.modules[m] is not None]
+            if new:
+                timings.append((elapsed - nested, elapsed, len(stack) - 1, name))
+
+    __builtin__.__import__ = timed_import
+    start = time.time()
+    try:
+        __import__(module)
+    finally:
+        __builtin__.__import__ = original
+    total = time.time() - start
+    for own, cumulative, depth, name in timings:
+        print "import time: %9d | %10d | %s%s" % (own * 1e6, cumulative * 1e6, "  " * depth, name)
+    print "total: %d" % (total * 1e6)
+
+
+def _time(module):
+    start = time.time()
+    __import__(module)
+    print "%d" % ((time.time() - start) * 1e6)
+
+
+def _run(flag, module):
+    return subprocess.check_output([sys.executable, os.path.abspath(__file__), flag, module], cwd=ROOT)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Measure the import time of human_rrule.")
+    parser.add_argument("module", nargs="?", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median import is slower")
+    parser.add_argument("--profile", action="store_true", help="(internal) print the per-module breakdown")
+    parser.add_argument("--time", action="store_true", help="(internal) time one import")
+    args = parser.parse_args(argv)
+
+    if args.time:
+        _time(args.module)
+        return 0
+    if args.profile:
+        _profile(args.module)
+        return 0
+    # Compile the modules first, so that the runs measure imports, not compilation,
+    # even where PYTHONDONTWRITEBYTECODE is set.
+    compileall.compile_dir(os.path.join(ROOT, "human_rrule"), quiet=True)
+    print "import time:  self [us] | cumulative | imported package"
+    print _run("--profile", args.module).rstrip()
+    runs = sorted([int(_run("--time", args.module)) / 1000.0 for i in range(args.runs)])
+    median = runs[len(runs) // 2]
+    print "%s: median %.1f ms, min %.1f ms, max %.1f ms over %d runs" % (args.module, median, runs[0], runs[-1],
+                                                                        len(runs))
+    if args.max_ms is not None and median > args.max_ms:
+        print "slower than the %.1f ms limit" % args.max_ms
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
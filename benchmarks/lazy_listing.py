@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+lazy_listing.py
+
+Times a listing view that only shows the occurrence phrase of each rule, with
+eager and lazy human_rrule instances.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY
+from dateutil.rrule import MO, TU, WE, TH, FR, SU
+
+from human_rrule2 import human_rrule
+
+RULES = [
+    rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10),
+    rr(MONTHLY, interval=2, byweekday=SU(1), dtstart=datetime(2011, 8, 15, 21), until=datetime(2015, 8, 15)),
+    rr(WEEKLY, byweekday=(MO, WE, FR), dtstart=datetime(2011, 8, 15, 9), until=datetime(2016, 1, 1)),
+    rr(YEARLY, bymonth=2, bymonthday=29, byweekday=TU, dtstart=datetime(2011, 8, 15), count=5),
+    rr(DAILY, dtstart=datetime(2011, 8, 15, 7, 30), count=5000),
+    rr(HOURLY, interval=6, dtstart=datetime(2011, 8, 15), until=datetime(2013, 8, 15)),
+    rr(MINUTELY, interval=10, byweekday=TH, dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15)),
+]
+
+
+def listing(lazy):
+    return [human_rrule(rule, lazy=lazy)["occurrence"] for rule in RULES]
+
+
+def main(number=200):
+    eager = min(timeit.repeat(lambda: listing(False), number=number, repeat=3))
+    lazy = min(timeit.repeat(lambda: listing(True), number=number, repeat=3))
+    per_rule = number * len(RULES)
+    print "eager: %8.1f us per rule" % (eager / per_rule * 1e6)
+    print "lazy:  %8.1f us per rule" % (lazy / per_rule * 1e6)
+    print "speedup: %.1fx" % (eager / lazy)
+
+if __name__ == '__main__':
+    main()
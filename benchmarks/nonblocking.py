@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+nonblocking.py
+
+Simulates an event loop that must run a short task every millisecond while
+also describing expensive rules (MINUTELY rules with BYMINUTE and an UNTIL
+two months out, whose occurrences have to be iterated), and reports how late
+the loop's ticks ran: rendering inline, with a describer on a thread pool,
+and with a describer on a process pool.
+
+Usage: nonblocking.py [--seconds N] [--every TICKS]
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MINUTELY, MONTHLY
+from dateutil.rrule import FR
+
+from human_rrule2 import human_rrule
+from nonblocking import describer
+
+TICK = 0.001
+DTSTART = datetime(2011, 8, 15, 9)
+
+
+def rules():
+    """An endless mix of one expensive rule to nine cheap ones."""
+    n = 0
+    while True:
+        n += 1
+        if n % 10:
+            yield rr(MONTHLY, byweekday=FR(n % 4 + 1), dtstart=DTSTART, count=10)
+        else:
+            yield rr(MINUTELY, byminute=(0, 30), dtstart=DTSTART, until=DTSTART + timedelta(days=60, minutes=n))
+
+
+def run_loop(describe, seconds, every):
+    """Tick every TICK seconds for seconds, describing a rule every every
+    ticks; return the lateness of each tick and the number described."""
+    source = rules()
+    pending = []
+    lateness = []
+    described = 0
+    start = time.time()
+    next_tick = start
+    ticks = 0
+    while next_tick - start < seconds:
+        now = time.time()
+        if now < next_tick:
+            time.sleep(next_tick - now)
+            now = time.time()
+        lateness.append(now - next_tick)
+        ticks += 1
+        next_tick += TICK
+        if ticks % every == 0:
+            pending.append(describe(source.next()))
+        still = []
+        for item in pending:
+            if item is True or item.done():
+                described += 1
+            else:
+                still.append(item)
+        pending = still
+    return lateness, described
+
+
+def report(name, lateness, described, seconds):
+    lateness = sorted(lateness)
+    def at(p):
+        return lateness[min(len(lateness) - 1, int(p * len(lateness)))] * 1000
+    print "%-10s tick lateness p50 %7.2f ms  p99 %7.2f ms  max %7.2f ms  %6.0f descriptions/s" % (
+        name, at(0.5), at(0.99), lateness[-1] * 1000, described / seconds)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Measure how long describing rules blocks an event loop.")
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--every", type=int, default=5, help="describe a rule every this many ticks")
+    args = parser.parse_args(argv)
+
+    def inline(rule):
+        human_rrule(rule).get_description()
+        return True
+    report("inline", *run_loop(inline, args.seconds, args.every) + (args.seconds,))
+
+    threads = describer(limit=2)
+    try:
+        report("threads", *run_loop(threads.describe, args.seconds, args.every) + (args.seconds,))
+    finally:
+        threads.close()
+
+    pool = multiprocessing.Pool(2)
+    try:
+        processes = describer(pool, limit=2)
+        report("processes", *run_loop(processes.describe, args.seconds, args.every) + (args.seconds,))
+    finally:
+        pool.terminate()
+        pool.join()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
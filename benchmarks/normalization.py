@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+normalization.py
+
+Builds a store of rules (default 20,000) in which each recurrence is written
+in several equivalent ways, as rules entered by hand and by different
+clients are, and reports how many distinct cache keys they have under
+rule_key, normal_key and occurrence_key, and what normalizing costs.
+
+Usage: normalization.py [rules]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY, DAILY
+from dateutil.rrule import MO, WE, FR
+
+from rrule_eq import rule_key
+from rrule_normal import normal_key, occurrence_key
+
+
+def spellings(start):
+    """Return rules written differently with the same occurrences, starting
+    on or after the Monday start."""
+    return [
+        rr(WEEKLY, dtstart=start, count=8),
+        rr(WEEKLY, byweekday=MO, dtstart=start, count=8),
+        rr(WEEKLY, byweekday=MO, dtstart=start - timedelta(days=2), count=8),
+        rr(WEEKLY, dtstart=start, until=start + timedelta(weeks=7, hours=12)),
+        rr(WEEKLY, byweekday=(FR, MO, WE), dtstart=start, count=12),
+        rr(WEEKLY, byweekday=(MO, WE, FR, MO), dtstart=start, count=12),
+        rr(MONTHLY, bymonth=range(1, 13), bymonthday=1, dtstart=start, count=6),
+        rr(MONTHLY, bymonthday=1, dtstart=start, count=6),
+        rr(DAILY, dtstart=start, count=1),
+        rr(DAILY, dtstart=start, until=start),
+    ]
+
+
+def main(rules=20000):
+    start = datetime(2011, 8, 15, 9)
+    store = []
+    for i in xrange(rules // 10):
+        store.extend(spellings(start + timedelta(weeks=i)))
+    for name, key in (("rule_key", rule_key), ("normal_key", normal_key), ("occurrence_key", occurrence_key)):
+        began = time.time()
+        keys = set([key(rule) for rule in store])
+        elapsed = time.time() - began
+        print "%-15s %6d distinct keys for %d rules, %6.1f µs per rule" % (
+            name, len(keys), len(store), elapsed / len(store) * 1e6)
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+number_words.py
+
+Times int2word and human_rrule.int_as_ordinal against the string-slicing
+implementation they replaced, for the values rrules use (ordinals from -366
+to 366, counts up to 10000) and for large numbers.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from int2word import int2word, int2ordinal
+
+# The previous implementation, kept here for comparison.
+
+def legacy_int2word(n):
+    """
+    convert an integer number n into a string of english words
+    """
+    if n < 0:
+        raise ValueError, "int2word works with zero and positive integers."
+    elif n == 0:
+        return "zero"
+        
+    # break the number into groups of 3 digits using slicing
+    # each group representing hundred, thousand, million, billion, ...
+    n3 = []
+    r1 = ""
+    # create numeric string
+    ns = str(n)
+    for k in range(3, 33, 3):
+        r = ns[-k:]
+        q = len(ns) - k
+        # break if end of ns has been reached
+        if q < -2:
+            break
+        else:
+            if q >= 0:
+                n3.append(int(r[:3]))
+            elif q >= -1:
+                n3.append(int(r[:2]))
+            elif q >= -2:
+                n3.append(int(r[:1]))
+        r1 = r
+
+    #print n3 # test
+
+    # break each group of 3 digits into
+    # ones, tens/twenties, hundreds
+    # and form a string
+    nw = ""
+    for i, x in enumerate(n3):
+        b1 = x % 10
+        b2 = (x % 100)//10
+        b3 = (x % 1000)//100
+        #print b1, b2, b3 # test
+        if x == 0:
+            continue # skip
+        else:
+            t = thousands[i]
+        if b2 == 0:
+            nw = ones[b1] + t + nw
+        elif b2 == 1:
+            nw = tens[b1] + t + nw
+        elif b2 > 1:
+            nw = twenties[b2] + ones[b1] + t + nw
+        if b3 > 0:
+            nw = ones[b3] + "hundred " + nw
+    return nw.rstrip()
+
+ones = ["", "one ","two ","three ","four ", "five ",
+"six ","seven ","eight ","nine "]
+
+tens = ["ten ","eleven ","twelve ","thirteen ", "fourteen ",
+"fifteen ","sixteen ","seventeen ","eighteen ","nineteen "]
+
+twenties = ["","","twenty ","thirty ","forty ",
+"fifty ","sixty ","seventy ","eighty ","ninety "]
+
+thousands = ["","thousand ","million ", "billion ", "trillion ",
+"quadrillion ", "quintillion ", "sextillion ", "septillion ","octillion ",
+"nonillion ", "decillion ", "undecillion ", "duodecillion ", "tredecillion ",
+"quattuordecillion ", "sexdecillion ", "septendecillion ", "octodecillion ",
+"novemdecillion ", "vigintillion "]
+
+LEGACY_ORDINAL_MAP = {
+    "one": u'first', "two": u'second', "three": u'third', "five": u'fifth',
+    "eight": u'eighth', "nine": u'ninth', "eleven": u'eleventh', "twelve": u'twelfth',
+    "twenty": u'twentieth', "thirty": u'thirtieth', "forty": u'fortieth', "fifty": u'fiftieth',
+    "sixty": u'sixtieth', "seventy": u'seventieth', "eighty": u'eightieth', "ninety": u'ninetieth',
+}
+
+
+def legacy_int2ordinal(i):
+    num = legacy_int2word(i).rstrip()
+    last_num = num.split()[-1:][0]
+    if last_num in LEGACY_ORDINAL_MAP:
+        d = num.split()[0:-1]
+        d.append(LEGACY_ORDINAL_MAP[last_num])
+        return " ".join(d)
+    return ''.join([num, "th"])
+
+
+CASES = (
+    ("ordinals 1..366", int2ordinal, legacy_int2ordinal, range(1, 367)),
+    ("counts 1..10000", int2word, legacy_int2word, range(1, 10001, 7)),
+    ("large numbers", int2word, legacy_int2word, [n * 1000003 for n in range(1, 1000, 3)]),
+)
+
+
+def main(repeat=5):
+    for name, new, old, values in CASES:
+        timings = []
+        for function in (old, new):
+            run = lambda: [function(n) for n in values]
+            timings.append(min(timeit.repeat(run, number=10, repeat=repeat)) / (10 * len(values)))
+        print "%-16s legacy %6.2f us  table %6.2f us  speedup %5.1fx" % (
+            name, timings[0] * 1e6, timings[1] * 1e6, timings[0] / timings[1])
+
+if __name__ == '__main__':
+    main()
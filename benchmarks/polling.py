@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+polling.py
+
+Polls the next few occurrences of a long-running series as "now" moves
+forward, the way a UI refreshing an event's preview does, and reports the
+time per poll: with dateutil's after() and between(), which iterate from
+DTSTART on every call, and with human_rrule.upcoming, which resumes from
+the previous poll.
+
+Usage: polling.py [--years N] [--polls N]
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import HOURLY
+
+from human_rrule2 import human_rrule
+
+NEXT = 5
+STEP = timedelta(minutes=10)
+
+
+def poll_dateutil(rule, now, polls):
+    for i in xrange(polls):
+        first = rule.after(now, inc=True)
+        rule.between(first, first + timedelta(hours=2 * NEXT), inc=True)[:NEXT]
+        now += STEP
+
+
+def poll_cursor(rule, now, polls):
+    hr = human_rrule(rule, lazy=True)
+    for i in xrange(polls):
+        hr.upcoming(NEXT, now)
+        now += STEP
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Time polling the next occurrences of a long-running series.")
+    parser.add_argument("--years", type=int, default=2, help="how long the series has run (default: %(default)s)")
+    parser.add_argument("--polls", type=int, default=200)
+    args = parser.parse_args(argv)
+    now = datetime(2011, 8, 15, 9)
+    rule = rr(HOURLY, interval=2, dtstart=now.replace(year=now.year - args.years))
+    for name, poll in (("dateutil", poll_dateutil), ("cursor", poll_cursor)):
+        start = time.time()
+        poll(rule, now, args.polls)
+        elapsed = time.time() - start
+        print "%-10s %9.1f us per poll" % (name, elapsed / args.polls * 1e6)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
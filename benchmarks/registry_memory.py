@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+registry_memory.py
+
+Loads a number of events (default 1,000,000) that share a small set of
+recurrences and reports peak resident memory with one rrule and description
+per event, and with rules interned through rule_registry.
+
+Usage: registry_memory.py [events]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import MO, TU, WE, TH, FR
+
+RECURRENCES = [
+    dict(freq=WEEKLY, byweekday=MO),
+    dict(freq=WEEKLY, byweekday=(TU, TH)),
+    dict(freq=MONTHLY, byweekday=FR(3)),
+    dict(freq=MONTHLY, bymonthday=1),
+    dict(freq=MONTHLY, interval=2, byweekday=WE(2)),
+]
+
+
+def load(events, interned):
+    from human_rrule2 import human_rrule
+    from rule_registry import rule_registry
+    registry = rule_registry()
+    loaded = []
+    for i in xrange(events):
+        params = RECURRENCES[i % len(RECURRENCES)]
+        rule = rr(dtstart=datetime(2011, 8, 15, 9), count=10, **params)
+        if interned:
+            entry = registry.intern(rule)
+            loaded.append((entry, entry.get_description()))
+        else:
+            loaded.append((rule, human_rrule(rule).get_description()))
+    if interned:
+        print >>sys.stderr, registry.stats()
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main(events=1000000):
+    for mode in ('plain', 'interned'):
+        output = subprocess.check_output([sys.executable, __file__, str(events), mode])
+        print "%-9s %8.1f MB peak RSS for %d events" % (mode, int(output) / 1024.0, events)
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        print load(int(sys.argv[1]), sys.argv[2] == 'interned')
+    elif len(sys.argv) == 2:
+        main(int(sys.argv[1]))
+    else:
+        main()
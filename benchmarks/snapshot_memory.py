@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+snapshot_memory.py
+
+Keeps a number of rendered descriptions (default 200,000) of rules with
+distinct start dates and reports the resident memory each one costs, kept
+as a human_rrule and as a description_snapshot.
+
+Usage: snapshot_memory.py [descriptions]
+"""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import MO, TU, TH, FR
+
+RECURRENCES = [
+    dict(freq=WEEKLY, byweekday=MO, count=10),
+    dict(freq=WEEKLY, byweekday=(TU, TH), until=datetime(2030, 1, 1)),
+    dict(freq=MONTHLY, byweekday=FR(3), count=12),
+    dict(freq=MONTHLY, bymonthday=1, until=datetime(2030, 1, 1)),
+]
+
+
+def resident():
+    """Return the resident memory of this process, in bytes."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def load(descriptions, mode):
+    from human_rrule2 import human_rrule
+    start = datetime(2011, 8, 15, 9)
+    loaded = []
+    # Imports and the first rendering are paid for before measuring.
+    human_rrule(rr(dtstart=start, **RECURRENCES[0])).snapshot().get_description()
+    before = resident()
+    for i in xrange(descriptions):
+        rule = rr(dtstart=start + timedelta(minutes=i), **RECURRENCES[i % len(RECURRENCES)])
+        hr = human_rrule(rule)
+        if mode == "dict":
+            loaded.append(hr)
+        else:
+            loaded.append(hr.snapshot())
+    return resident() - before
+
+
+def main(descriptions=200000):
+    for mode in ("dict", "snapshot"):
+        output = subprocess.check_output([sys.executable, __file__, str(descriptions), mode])
+        print "%-9s %7.0f bytes per description" % (mode, int(output) / float(descriptions))
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        print load(int(sys.argv[1]), sys.argv[2])
+    elif len(sys.argv) == 2:
+        main(int(sys.argv[1]))
+    else:
+        main()
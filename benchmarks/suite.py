@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+suite.py
+
+Times human_rrule construction and get_description for every frequency, for
+COUNT, UNTIL and unbounded rules over growing horizons and for wide BY* sets,
+along with int2word, int_as_ordinal, rrule_eq comparison and the bounds of a
+batch of simple rules, one by one and vectorized, and a persistent_cache
+lookup of a rendered rule. Results are saved
+as JSON, and two result files can be compared to catch regressions.
+
+Usage:
+    suite.py run [-o results.json] [-k substring] [--compare baseline.json]
+    suite.py compare baseline.json results.json [--threshold 0.1]
+
+compare, and run with --compare, exit with status 1 if any case got slower
+than the baseline by more than the threshold (a fraction, default 0.1).
+"""
+
+import atexit
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime
+
+import dateutil
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY
+from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU
+
+from human_rrule2 import human_rrule, VALID_FREQUENCIES, PERIOD_MAP
+from int2word import int2word
+from rrule_eq import rrule_eq
+from rrule_bounds import rrule_bounds
+import vector_bounds
+from persistent_cache import persistent_cache
+
+DTSTART = datetime(2011, 8, 15, 9, 30)
+
+# Each repeat of a case runs for at least this many seconds.
+MIN_REPEAT_TIME = 0.2
+REPEATS = 3
+
+DEFAULT_THRESHOLD = 0.1
+
+
+def _rule_cases(name, make_rule):
+    """The construct and describe cases for the rule make_rule returns."""
+    rule = make_rule()
+    return [
+        ("construct/" + name, lambda: human_rrule(rule)),
+        ("describe/" + name, lambda: human_rrule(rule).get_description()),
+    ]
+
+
+def cases():
+    """Return the benchmark cases as a list of (name, function to time)."""
+    found = []
+    for freq in VALID_FREQUENCIES:
+        found += _rule_cases("freq/%s" % PERIOD_MAP[freq],
+                             lambda freq=freq: rr(freq, dtstart=DTSTART, count=10))
+    for count in (10, 1000, 100000):
+        found += _rule_cases("terminal/count/daily/%d" % count,
+                             lambda count=count: rr(DAILY, dtstart=DTSTART, count=count))
+        found += _rule_cases("terminal/count/minutely/%d" % count,
+                             lambda count=count: rr(MINUTELY, byweekday=(MO, WE), dtstart=DTSTART, count=count))
+    for years in (1, 10, 100):
+        until = DTSTART.replace(year=DTSTART.year + years)
+        found += _rule_cases("terminal/until/daily/%dy" % years,
+                             lambda until=until: rr(DAILY, dtstart=DTSTART, until=until))
+        found += _rule_cases("terminal/until/monthly/%dy" % years,
+                             lambda until=until: rr(MONTHLY, byweekday=FR(3), dtstart=DTSTART, until=until))
+    found += _rule_cases("terminal/none/weekly", lambda: rr(WEEKLY, byweekday=(MO, TH), dtstart=DTSTART))
+    found += _rule_cases("terminal/none/secondly", lambda: rr(SECONDLY, interval=10, dtstart=DTSTART))
+    found += _rule_cases("by/weekday/all", lambda: rr(DAILY, byweekday=(MO, TU, WE, TH, FR, SA, SU),
+                                                      dtstart=DTSTART, count=100))
+    found += _rule_cases("by/monthday/all", lambda: rr(MONTHLY, bymonthday=range(1, 32), dtstart=DTSTART, count=100))
+    found += _rule_cases("by/month/all", lambda: rr(YEARLY, bymonth=range(1, 13), dtstart=DTSTART, count=100))
+    found += _rule_cases("by/nweekday/wide", lambda: rr(MONTHLY, byweekday=(MO(1), WE(2), FR(3), SU(-1)),
+                                                        dtstart=DTSTART, count=100))
+    found += _rule_cases("by/hour/all", lambda: rr(HOURLY, byhour=range(24), dtstart=DTSTART, count=1000))
+    found += _rule_cases("by/minute/all", lambda: rr(MINUTELY, byminute=range(60), dtstart=DTSTART, count=1000))
+    found += _rule_cases("by/setpos", lambda: rr(MONTHLY, byweekday=(MO, TU, WE, TH, FR), bysetpos=-1,
+                                                 dtstart=DTSTART, count=100))
+    found += [
+        ("int2word/counts", lambda: [int2word(n) for n in xrange(0, 10001, 37)]),
+        ("int2word/large", lambda: int2word(4321234567890)),
+        ("int_as_ordinal/all", lambda: [human_rrule.int_as_ordinal(n) for n in xrange(-366, 367) if n]),
+    ]
+    first = rrule_eq(MONTHLY, byweekday=FR(3), dtstart=DTSTART, count=10)
+    same = rrule_eq(MONTHLY, byweekday=FR(3), dtstart=DTSTART, count=10)
+    other = rrule_eq(MONTHLY, byweekday=FR(2), dtstart=DTSTART, count=10)
+    found += [
+        ("rrule_eq/equal", lambda: first == same),
+        ("rrule_eq/not_equal", lambda: first == other),
+        ("rrule_eq/hash", lambda: hash(first)),
+    ]
+    simple = [rr((MONTHLY, WEEKLY, DAILY)[n % 3], dtstart=DTSTART.replace(day=n % 28 + 1), count=n % 500 + 1)
+              for n in range(1000)]
+    found.append(("bounds/scalar/1000", lambda: [(b.first(), b.last()) for b in map(rrule_bounds, simple)]))
+    if vector_bounds.numpy is not None:
+        found.append(("bounds/vector/1000", lambda: vector_bounds.batch_bounds(simple)))
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, True)
+    cache = persistent_cache(os.path.join(directory, "descriptions.db"))
+    typical = rr(MONTHLY, byweekday=FR(3), dtstart=DTSTART, count=10)
+    cache.get_description(typical)
+    found.append(("persistent_cache/hit", lambda: cache.lookup(typical)))
+    return found
+
+
+def time_case(function):
+    """Return the best time per call, in seconds, of REPEATS timing runs."""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(function, number=number)
+        if elapsed >= MIN_REPEAT_TIME:
+            break
+        number *= max(2, min(10, int(MIN_REPEAT_TIME / max(elapsed, 1e-9))))
+    best = min([elapsed] + timeit.repeat(function, number=number, repeat=REPEATS - 1))
+    return best / number
+
+
+def run(pattern=None):
+    """Time every case whose name contains pattern; return the results dict."""
+    results = {}
+    for name, function in cases():
+        if pattern and pattern not in name:
+            continue
+        results[name] = time_case(function)
+        print "%-40s %12.2f us" % (name, results[name] * 1e6)
+    return {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "dateutil": dateutil.__version__,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print both timings of every case in current that baseline also has,
+    and return the names of those that got slower by more than threshold."""
+    regressions = []
+    for name in sorted(current["results"]):
+        if name not in baseline["results"]:
+            continue
+        before, after = baseline["results"][name], current["results"][name]
+        change = after / before - 1
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        print "%-40s %12.2f us %12.2f us %+7.1f%% %s" % (name, before * 1e6, after * 1e6, change * 100, flag)
+    return regressions
+
+
+def _load(path):
+    source = open(path)
+    try:
+        return json.load(source)
+    finally:
+        source.close()
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Time human_rrule and compare results.")
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", help="save the results as JSON to this file")
+    run_parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare the results with this file")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        current = run(args.pattern)
+        if args.output:
+            out = open(args.output, "w")
+            try:
+                json.dump(current, out, indent=2, sort_keys=True)
+            finally:
+                out.close()
+        baseline = args.compare and _load(args.compare)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+    if not baseline:
+        return 0
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print "%d regression(s) beyond %.0f%%: %s" % (len(regressions), args.threshold * 100, ", ".join(regressions))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+wire_format.py
+
+Encodes and decodes a number of rendered descriptions (default 20,000), as
+human_rrule instances and as description_snapshots, with cPickle and with
+wire_format, and reports the round trips per second and the bytes per
+description of each.
+
+Usage: wire_format.py [descriptions]
+"""
+
+import cPickle
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'human_rrule'))
+
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import MO, TU, TH, FR
+from dateutil.tz import gettz
+
+from human_rrule2 import human_rrule
+from wire_format import to_bytes, from_bytes
+
+RECURRENCES = [
+    dict(freq=WEEKLY, byweekday=MO, count=10),
+    dict(freq=WEEKLY, byweekday=(TU, TH), until=datetime(2030, 1, 1)),
+    dict(freq=MONTHLY, byweekday=FR(3), count=12),
+    dict(freq=MONTHLY, bymonthday=1, until=datetime(2030, 1, 1)),
+]
+
+
+def descriptions(n):
+    tz = gettz("America/New_York")
+    start = datetime(2011, 8, 15, 9)
+    found = []
+    for i in xrange(n):
+        params = dict(RECURRENCES[i % len(RECURRENCES)])
+        dtstart = start + timedelta(minutes=i)
+        if i % 5 == 0:
+            dtstart = dtstart.replace(tzinfo=tz)
+            if "until" in params:
+                params["until"] = params["until"].replace(tzinfo=tz)
+        found.append(human_rrule(rr(dtstart=dtstart, **params)))
+    return found
+
+
+def round_trip(name, items, dumps, loads):
+    start = time.time()
+    encoded = [dumps(item) for item in items]
+    decoded = [loads(data) for data in encoded]
+    elapsed = time.time() - start
+    size = sum([len(data) for data in encoded]) / float(len(encoded))
+    print "%-22s %9.0f round trips/s %7.0f bytes each" % (name, len(decoded) / elapsed, size)
+
+
+def main(n=20000):
+    rules = descriptions(n)
+    snapshots = [hr.snapshot() for hr in rules]
+    pickle = (lambda item: cPickle.dumps(item, 2), cPickle.loads)
+    round_trip("human_rrule/pickle", rules, *pickle)
+    round_trip("human_rrule/wire", rules, to_bytes, from_bytes)
+    round_trip("snapshot/pickle", snapshots, *pickle)
+    round_trip("snapshot/wire", snapshots, to_bytes, from_bytes)
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(main(int(sys.argv[1])))
+    sys.exit(main())
@@ -15,4 +15,23 @@ def get_version(short=False):
         vers.append('%s%i' % (__version_info__['releaselevel'][0], __version_info__['serial']))
     return ''.join(vers)
 
-__version__ = get_version()
\ No newline at end of file
+__version__ = get_version()
+
+# setup.py imports this package for get_version before dateutil is installed, so
+# the modules that need dateutil are only imported when first used.
+
+def describe_many(rules, *args, **kwargs):
+    """Return the descriptions of many rrules. See batch.describe_many."""
+    from human_rrule.batch import describe_many
+    return describe_many(rules, *args, **kwargs)
+
+def idescribe_many(rules, *args, **kwargs):
+    """Yield the descriptions of many rrules. See batch.idescribe_many."""
+    from human_rrule.batch import idescribe_many
+    return idescribe_many(rules, *args, **kwargs)
+
+def describe_ics(source, *args, **kwargs):
+    """Yield (uid, description) for the recurring events of an iCalendar
+    stream. See ics_stream.describe_ics."""
+    from human_rrule.ics_stream import describe_ics
+    return describe_ics(source, *args, **kwargs)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+batch.py
+
+Describes many rrules at once, rendering each distinct rule only once and
+spreading the work over a pool of worker processes. With NumPy installed,
+the bounds of the simple rules of each chunk are computed together (see
+vector_bounds). Given a cache file, the workers look descriptions up in it
+before rendering them, and store the ones they render (see
+persistent_cache).
+"""
+
+import itertools
+import multiprocessing
+from collections import OrderedDict
+
+from human_rrule2 import human_rrule, DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from rrule_eq import rule_key
+from vector_bounds import batch_bounds
+from persistent_cache import persistent_cache
+
+DEFAULT_CHUNKSIZE = 100
+
+# How many chunks per worker are read from the input and deduplicated at a time.
+CHUNKS_PER_WORKER = 4
+
+# How many descriptions of distinct rules are remembered from earlier blocks.
+MEMO_SIZE = 4096
+
+# The persistent caches opened by this process, by path.
+_caches = {}
+
+
+def _cache(path):
+    cache = _caches.get(path)
+    if cache is None:
+        cache = _caches[path] = persistent_cache(path)
+    return cache
+
+
+def _describe_chunk(args):
+    """Render a chunk of rules. Runs in the worker processes."""
+    rules, date_format, time_format, errors, cache_path = args
+    cache = None
+    if cache_path:
+        cache = _cache(cache_path)
+        stored = [cache.lookup(rule, date_format, time_format) for rule in rules]
+    else:
+        stored = [None] * len(rules)
+    bounds = iter(batch_bounds([rule for rule, description in zip(rules, stored) if description is None]))
+    descriptions = []
+    for rule, description in zip(rules, stored):
+        if description is None:
+            known = bounds.next()
+            try:
+                description = human_rrule(rule, bounds=known).get_description(date_format, time_format)
+            except Exception, e:
+                if errors == "raise":
+                    raise
+                description = e
+            else:
+                if cache is not None:
+                    cache.store(rule, description, date_format, time_format)
+        descriptions.append(description)
+    if cache is not None:
+        cache.flush()
+    return descriptions
+
+
+def idescribe_many(rules, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                   workers=None, chunksize=DEFAULT_CHUNKSIZE, errors="raise", cache_path=None):
+    """Yield the description of each rule in rules, in input order.
+
+    Rules that compare equal (see rrule_eq) are rendered once, and the
+    descriptions of the last MEMO_SIZE distinct rules are kept for reuse by
+    later blocks. rules may be any iterable and is read a block at a time.
+    workers is the number of worker processes, defaulting to one per CPU; with
+    workers=1 the rules are rendered in this process. If errors is "return",
+    a rule that cannot be described yields the exception instead of raising
+    it. cache_path names a persistent_cache file shared by the workers."""
+    if errors not in ("raise", "return"):
+        raise ValueError, "errors must be 'raise' or 'return', not %r" % (errors,)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.Pool(workers)
+    memo = OrderedDict()
+    rules = iter(rules)
+    try:
+        while True:
+            block = list(itertools.islice(rules, chunksize * workers * CHUNKS_PER_WORKER))
+            if not block:
+                break
+            keys = [rule_key(rule) for rule in block]
+            rendered = {}
+            todo = {}
+            for key, rule in zip(keys, block):
+                if key in rendered or key in todo:
+                    continue
+                description = memo.pop(key, None)
+                if description is None:
+                    todo[key] = rule
+                else:
+                    rendered[key] = memo[key] = description
+            todo = todo.items()
+            chunks = [todo[i:i + chunksize] for i in range(0, len(todo), chunksize)]
+            jobs = [([rule for key, rule in chunk], date_format, time_format, errors, cache_path)
+                    for chunk in chunks]
+            if pool:
+                results = pool.imap(_describe_chunk, jobs)
+            else:
+                results = itertools.imap(_describe_chunk, jobs)
+            for chunk, descriptions in itertools.izip(chunks, results):
+                for (key, rule), description in zip(chunk, descriptions):
+                    rendered[key] = memo[key] = description
+            while len(memo) > MEMO_SIZE:
+                memo.popitem(last=False)
+            for key in keys:
+                yield rendered[key]
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+
+
+def describe_many(rules, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                  workers=None, chunksize=DEFAULT_CHUNKSIZE, errors="raise", cache_path=None):
+    """Return a list of the descriptions of rules, in input order. See idescribe_many."""
+    return list(idescribe_many(rules, date_format, time_format, workers, chunksize, errors, cache_path))
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+catalogs.py
+
+Locale catalogs: the words, ordinal rules and word order used to describe
+rrules in a given language.
+
+A catalog is a module named locale_<name> next to this one (locale_es for
+"es", locale_pt_BR for "pt_BR"), or any object registered with
+register_catalog, defining:
+
+    WEEKDAYS        the seven weekday names, Monday first
+    MONTHS          the twelve month names, January first
+    UNITS           {"year"|"month"|"week"|"day"|"hour"|"minute"|"second":
+                     (singular, plural)}
+    cardinal(n)     n >= 0 in words (or digits)
+    ordinal(n)      n as an ordinal; negative n counts from the end
+    PATTERNS        the phrases below, as unicode.format patterns
+    DATE_FORMAT, TIME_FORMAT
+                    the default strftime-style formats; only %d %m %Y %y %H
+                    %I %M %S %p %B %b %A %a and %% are allowed
+
+and optionally WEEKDAY_ABBRS, MONTH_ABBRS, AM_PM (for %a, %b and %p; the
+first three letters of each name and ("AM", "PM") by default), LIST_SEPARATOR
+and LAST_SEPARATOR (joining lists of days or months), and SENTENCE, the order
+of the parts of a description (default: interval, days, weeks, months,
+hours, setpos, start, terminal, timezone). Parts that do not apply to a rule
+are left out.
+
+PATTERNS, with their fields:
+
+    every           interval 1: unit, units
+    every_other     interval 2, optional: unit, units
+    every_n         other intervals: n, cardinal, ordinal, unit, units
+    on              days: days (the joined list)
+    nth_weekday     an nth weekday: ordinal, weekday
+    monthday        a day of the month: n, ordinal
+    monthday_from_end
+                    a day counted from the end of the month: n (positive),
+                    ordinal (of -n)
+    in              months: months (the joined list)
+    starting        the first occurrence: datetime
+    count           COUNT: n, cardinal
+    once            COUNT=1, optional
+    until           the last occurrence of an UNTIL rule: datetime
+    timezone        timezone
+    datetime        optional, how DATE_FORMAT and TIME_FORMAT are combined:
+                    date, time (default "{time} {date}")
+
+and, for the rarer parts of rules, which describe raises ValueError for
+rather than leave out when a catalog does not define them:
+
+    yearday         a day of the year (BYYEARDAY): n, ordinal
+    easter          Easter Sunday (BYEASTER=0)
+    easter_after    a day after it: n, ordinal
+    easter_before   a day before it: n (positive), ordinal (of n)
+    weeknos         weeks of the year (BYWEEKNO): numbers, ordinals (the
+                    joined lists)
+    hours           hours of the day (BYHOUR), when they are not just the
+                    hour of the start: numbers
+    setpos          the occurrences kept of each period (BYSETPOS):
+                    ordinals, unit, units
+
+The every patterns may be given per unit, for languages where the words
+agree with it: every_week, every_n_week and so on take precedence over every
+and every_n. A part whose phrase starts with a comma is attached to the part
+before it without a space.
+
+Catalogs are imported and compiled the first time a locale is asked for.
+"""
+
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY
+
+from description_template import compile_format
+
+SENTENCE = ("interval", "days", "weeks", "months", "hours", "setpos", "start", "terminal", "timezone")
+
+UNIT_NAMES = {
+    YEARLY: "year",
+    MONTHLY: "month",
+    WEEKLY: "week",
+    DAILY: "day",
+    HOURLY: "hour",
+    MINUTELY: "minute",
+    SECONDLY: "second",
+}
+
+REQUIRED_PATTERNS = ("every", "every_n", "on", "nth_weekday", "monthday", "monthday_from_end",
+                     "in", "starting", "count", "until", "timezone")
+
+# Ordinals and cardinals of catalogs are memoized up to this value.
+TABLE_LIMIT = 366
+
+# The parts of a rule that descriptions are made of, in any language.
+rule_parts = namedtuple("rule_parts", "unit interval weekdays nweekdays monthdays nmonthdays months count until "
+                                      "yeardays easter weeknos hours setpos")
+
+
+def analyse(rule):
+    """Return the rule_parts of a dateutil rrule."""
+    hours = tuple(sorted(rule._byhour or ()))
+    if rule._freq < HOURLY and hours == (rule._dtstart.hour,):
+        # Filled in from DTSTART, whose hour the start already shows.
+        hours = ()
+    return rule_parts(
+        unit=UNIT_NAMES[rule._freq],
+        interval=rule._interval,
+        weekdays=tuple(sorted(rule._byweekday or ())),
+        nweekdays=tuple(rule._bynweekday or ()),
+        monthdays=tuple(sorted(rule._bymonthday or ())),
+        nmonthdays=tuple(sorted(rule._bynmonthday or (), reverse=True)),
+        months=tuple(sorted(rule._bymonth or ())),
+        count=rule._count,
+        until=bool(rule._until),
+        yeardays=tuple(sorted(rule._byyearday or ())),
+        easter=tuple(sorted(rule._byeaster or ())),
+        weeknos=tuple(sorted(rule._byweekno or ())),
+        hours=hours,
+        setpos=tuple(sorted(rule._bysetpos or ())),
+    )
+
+
+class locale_catalog(object):
+    """A catalog compiled into lookup tables. Use get_catalog to share them."""
+
+    def __init__(self, name, source):
+        self.name = name
+        missing = [attr for attr in ("WEEKDAYS", "MONTHS", "UNITS", "PATTERNS", "DATE_FORMAT", "TIME_FORMAT",
+                                     "cardinal", "ordinal")
+                   if not hasattr(source, attr)]
+        missing += [key for key in REQUIRED_PATTERNS if key not in getattr(source, "PATTERNS", {})]
+        if missing:
+            raise ValueError, "locale %s does not define %s" % (name, ", ".join(missing))
+        self.weekdays = tuple(source.WEEKDAYS)
+        self.months = tuple(source.MONTHS)
+        self.units = dict(source.UNITS)
+        self.patterns = dict(source.PATTERNS)
+        self.sentence = tuple(getattr(source, "SENTENCE", SENTENCE))
+        self.list_separator = getattr(source, "LIST_SEPARATOR", u", ")
+        self.last_separator = getattr(source, "LAST_SEPARATOR", self.list_separator)
+        self.datetime_pattern = self.patterns.get("datetime", u"{time} {date}")
+        self.date_format = source.DATE_FORMAT
+        self.time_format = source.TIME_FORMAT
+        self._cardinal = source.cardinal
+        self._ordinal = source.ordinal
+        self._cardinals = {}
+        self._ordinals = {}
+        self._formats = {}
+        self._names = {
+            "B": ("",) + self.months,
+            "b": ("",) + tuple(getattr(source, "MONTH_ABBRS", [month[:3] for month in self.months])),
+            "A": self.weekdays,
+            "a": tuple(getattr(source, "WEEKDAY_ABBRS", [day[:3] for day in self.weekdays])),
+            "p": tuple(getattr(source, "AM_PM", ("AM", "PM"))),
+        }
+        # Compile the default formats now, so that a bad catalog fails here.
+        self.format_datetime(datetime(2000, 1, 1))
+
+    def cardinal(self, n):
+        word = self._cardinals.get(n)
+        if word is None:
+            word = self._cardinal(n)
+            if n <= TABLE_LIMIT:
+                self._cardinals[n] = word
+        return word
+
+    def ordinal(self, n):
+        word = self._ordinals.get(n)
+        if word is None:
+            word = self._ordinal(n)
+            if -TABLE_LIMIT <= n <= TABLE_LIMIT:
+                self._ordinals[n] = word
+        return word
+
+    def format_datetime(self, dt, date_format=None, time_format=None):
+        formats = (date_format or self.date_format, time_format or self.time_format)
+        format_datetime = self._formats.get(formats)
+        if format_datetime is None:
+            datetime_format = self.datetime_pattern.format(date=formats[0], time=formats[1])
+            format_datetime = self._formats[formats] = compile_format(datetime_format, self._names)
+        return format_datetime(dt)
+
+    def join(self, items):
+        if len(items) < 2:
+            return u"".join(items)
+        return self.last_separator.join([self.list_separator.join(items[:-1]), items[-1]])
+
+    def describe(self, parts, start, until=None, timezone=None, date_format=None, time_format=None):
+        """Return the description of a rule in this locale.
+
+        parts are the rule's rule_parts (see analyse); start and until its
+        first and last occurrence, as found by rrule_bounds."""
+        patterns = self.patterns
+        unit, units = self.units[parts.unit]
+        every = patterns.get("every_" + parts.unit) or patterns["every"]
+        every_other = patterns.get("every_other_" + parts.unit) or patterns.get("every_other")
+        every_n = patterns.get("every_n_" + parts.unit) or patterns["every_n"]
+        fields = {}
+        if parts.interval == 1:
+            fields["interval"] = every.format(unit=unit, units=units)
+        elif parts.interval == 2 and every_other:
+            fields["interval"] = every_other.format(unit=unit, units=units)
+        else:
+            fields["interval"] = every_n.format(n=parts.interval, cardinal=self.cardinal(parts.interval),
+                                               ordinal=self.ordinal(parts.interval), unit=unit, units=units)
+        days = [self.weekdays[day] for day in parts.weekdays]
+        days += [patterns["nth_weekday"].format(ordinal=self.ordinal(n), weekday=self.weekdays[day])
+                 for day, n in parts.nweekdays]
+        days += [patterns["monthday"].format(n=n, ordinal=self.ordinal(n)) for n in parts.monthdays]
+        days += [patterns["monthday_from_end"].format(n=-n, ordinal=self.ordinal(n)) for n in parts.nmonthdays]
+        days += [self._pattern("yearday").format(n=n, ordinal=self.ordinal(n)) for n in parts.yeardays]
+        for n in parts.easter:
+            if n == 0:
+                days.append(self._pattern("easter"))
+            elif n > 0:
+                days.append(self._pattern("easter_after").format(n=n, ordinal=self.ordinal(n)))
+            else:
+                days.append(self._pattern("easter_before").format(n=-n, ordinal=self.ordinal(-n)))
+        if days:
+            fields["days"] = patterns["on"].format(days=self.join(days))
+        if parts.weeknos:
+            fields["weeks"] = self._pattern("weeknos").format(
+                numbers=self.join([unicode(n) for n in parts.weeknos]),
+                ordinals=self.join([self.ordinal(n) for n in parts.weeknos]))
+        if parts.months:
+            fields["months"] = patterns["in"].format(months=self.join([self.months[month - 1]
+                                                                          for month in parts.months]))
+        if parts.hours:
+            fields["hours"] = self._pattern("hours").format(numbers=self.join([unicode(n) for n in parts.hours]))
+        if parts.setpos:
+            fields["setpos"] = self._pattern("setpos").format(
+                ordinals=self.join([self.ordinal(n) for n in parts.setpos]), unit=unit, units=units)
+        if start:
+            fields["start"] = patterns["starting"].format(
+                datetime=self.format_datetime(start, date_format, time_format))
+        if parts.count == 1 and "once" in patterns:
+            fields["terminal"] = patterns["once"]
+        elif parts.count:
+            fields["terminal"] = patterns["count"].format(n=parts.count, cardinal=self.cardinal(parts.count))
+        elif parts.until and until:
+            fields["terminal"] = patterns["until"].format(
+                datetime=self.format_datetime(until, date_format, time_format))
+        if timezone:
+            fields["timezone"] = patterns["timezone"].format(timezone=timezone)
+        return self._sentence(fields)
+
+    def describe_seen_from(self, start, until, timezone, date_format=None, time_format=None):
+        """Return the first and last occurrences of a rule as seen from
+        another time zone, worded as the start, until and timezone parts of
+        a description are; until is None unless the rule's own description
+        shows it."""
+        patterns = self.patterns
+        fields = {"timezone": patterns["timezone"].format(timezone=timezone)}
+        if start:
+            fields["start"] = patterns["starting"].format(
+                datetime=self.format_datetime(start, date_format, time_format))
+        if until:
+            fields["terminal"] = patterns["until"].format(
+                datetime=self.format_datetime(until, date_format, time_format))
+        return self._sentence(fields).lstrip(u", ")
+
+    def _pattern(self, name):
+        """Return the pattern name, which describe needs for the rule at
+        hand; raises ValueError if the catalog does not define it."""
+        pattern = self.patterns.get(name)
+        if pattern is None:
+            raise ValueError, "locale %s cannot describe rules that need the %s pattern" % (self.name, name)
+        return pattern
+
+    def _sentence(self, fields):
+        """Join the phrases in fields in the catalog's sentence order; raises
+        ValueError if the order leaves any of them out."""
+        left_out = [part for part in fields if part not in self.sentence]
+        if left_out:
+            raise ValueError, "locale %s has no place in its sentence for %s" % (self.name,
+                                                                                ", ".join(sorted(left_out)))
+        description = []
+        for part in self.sentence:
+            phrase = fields.get(part)
+            if phrase:
+                if description and not phrase.startswith(u","):
+                    description.append(u" ")
+                description.append(phrase)
+        return u"".join(description)
+
+
+_catalogs = {}
+_registered = {}
+_lock = threading.Lock()
+
+
+def _normalize(locale):
+    return locale.replace("-", "_")
+
+
+def register_catalog(locale, source):
+    """Make source, a module or any object with the attributes of a catalog,
+    the catalog of locale. Replaces a catalog already loaded for it."""
+    locale = _normalize(locale)
+    with _lock:
+        _registered[locale] = source
+        _catalogs.pop(locale, None)
+
+
+def get_catalog(locale):
+    """Return the compiled catalog of locale, loading it on first use.
+
+    A locale with a region ("pt_BR", "es-MX") falls back to its language
+    ("es") when there is no catalog for the region. Raises ValueError for a
+    locale without a catalog."""
+    locale = _normalize(locale)
+    catalog = _catalogs.get(locale)
+    if catalog is not None:
+        return catalog
+    with _lock:
+        catalog = _catalogs.get(locale)
+        if catalog is None:
+            catalog = _catalogs[locale] = _load(locale)
+        return catalog
+
+
+def _load(locale):
+    candidates = [locale]
+    if "_" in locale:
+        candidates.append(locale.split("_")[0])
+    for name in candidates:
+        source = _registered.get(name)
+        if source is None:
+            try:
+                source = __import__("locale_%s" % name, globals())
+            except ImportError:
+                continue
+        return locale_catalog(locale, source)
+    raise ValueError, "no catalog for locale %s" % locale
+
+
+def available_locales():
+    """Return the names of the registered locales and of the catalog modules
+    shipped with human_rrule, without loading them."""
+    names = set(_registered)
+    for filename in os.listdir(os.path.dirname(os.path.abspath(__file__))):
+        if filename.startswith("locale_") and filename.endswith(".py"):
+            names.add(filename[len("locale_"):-len(".py")])
+    return sorted(names)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+cli.py
+
+The human-rrule command: describes rrules read from files or stdin, one per
+line, and writes one JSON record per rule to stdout.
+
+Each input line is either an RRULE string, optionally preceded by its DTSTART
+("DTSTART:19970902T090000;RRULE:FREQ=DAILY;INTERVAL=10;COUNT=5"), or a JSON
+object holding one in its "rrule" field and, optionally, an iCalendar
+DATE-TIME in its "dtstart" field. Each output record is the input object (or
+{"rrule": line}) plus a "description" field, or an "error" field if the rule
+could not be described. The exit status is 1 if any rule failed.
+"""
+
+import json
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from collections import deque
+
+from human_rrule2 import DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from batch import idescribe_many, DEFAULT_CHUNKSIZE
+from ics_stream import rrule_from_string, parse_datetime
+
+# Output records are written this many at a time.
+OUTPUT_BATCH = 1000
+
+# At most this many latencies are kept for the --stats percentiles.
+LATENCY_SAMPLES = 10000
+
+PERCENTILES = (50, 90, 99)
+
+
+def _error(e):
+    return "%s: %s" % (type(e).__name__, e)
+
+
+def _string_field(record, name):
+    """Return the string in record's field name, or None if it has none."""
+    value = record.get(name)
+    if value is not None and not isinstance(value, basestring):
+        raise ValueError, "the %s field must be a string, not %s" % (name, type(value).__name__)
+    return value
+
+
+def read_records(lines, field="rrule"):
+    """Yield (record, rule, read_time) for each non-blank line, where rule is
+    the parsed rrule or, if the line could not be parsed, the exception."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        read_time = time.time()
+        try:
+            if line.startswith("{"):
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError, "expected a JSON object"
+            else:
+                record = {field: line}
+        except ValueError, e:
+            yield {"input": line}, e, read_time
+            continue
+        try:
+            dtstart = _string_field(record, "dtstart")
+            if dtstart is not None:
+                dtstart = parse_datetime(dtstart)
+            rule = rrule_from_string(_string_field(record, field) or "", dtstart)
+        except ValueError, e:
+            rule = e
+        yield record, rule, read_time
+
+
+def describe_records(records, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                     workers=None, chunksize=DEFAULT_CHUNKSIZE, cache_path=None):
+    """Yield (record, description, read_time) for each item of read_records,
+    in order, where description is the exception for rules that failed."""
+    pending = deque()
+
+    def rules():
+        for record, rule, read_time in records:
+            pending.append((record, rule, read_time))
+            if not isinstance(rule, Exception):
+                yield rule
+
+    for description in idescribe_many(rules(), date_format, time_format, workers, chunksize,
+                                      errors="return", cache_path=cache_path):
+        while True:
+            record, rule, read_time = pending.popleft()
+            if isinstance(rule, Exception):
+                yield record, rule, read_time
+            else:
+                yield record, description, read_time
+                break
+    while pending:
+        yield pending.popleft()
+
+
+class run_stats(object):
+    """Counts records and samples their latency, from being read to being
+    written, for the --stats summary."""
+
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.started = time.time()
+        self.records = self.errors = 0
+        self.samples = samples
+        self.latencies = []
+
+    def add(self, latency, failed=False):
+        self.records += 1
+        if failed:
+            self.errors += 1
+        # Reservoir sampling keeps memory flat however many records there are.
+        if len(self.latencies) < self.samples:
+            self.latencies.append(latency)
+        else:
+            i = random.randrange(self.records)
+            if i < self.samples:
+                self.latencies[i] = latency
+
+    def summary(self):
+        elapsed = time.time() - self.started
+        lines = ["records: %d (%d errors)" % (self.records, self.errors),
+                 "elapsed: %.3f s, %.1f records/sec" % (elapsed, elapsed and self.records / elapsed or 0.0)]
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            points = ["p%d %.3f ms" % (p, 1000 * latencies[min(len(latencies) - 1, len(latencies) * p // 100)])
+                      for p in PERCENTILES]
+            points.append("max %.3f ms" % (1000 * latencies[-1]))
+            lines.append("latency: " + ", ".join(points))
+        return "\n".join(lines)
+
+
+def _input_lines(paths, stdin):
+    if not paths:
+        paths = ["-"]
+    for path in paths:
+        if path == "-":
+            for line in stdin:
+                yield line
+        else:
+            source = open(path, "rU")
+            try:
+                for line in source:
+                    yield line
+            finally:
+                source.close()
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    parser = ArgumentParser(prog="human-rrule",
+                            description="Describe rrules read one per line as RRULE strings or JSON objects.")
+    parser.add_argument("files", nargs="*", metavar="FILE", help="input files; - or none for stdin")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU; 1 renders in this process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="rules per task sent to a worker (default: %(default)s)")
+    parser.add_argument("--date-format", default=DEFAULT_DATE_FORMAT,
+                        help="strftime format for dates (default: %(default)s)")
+    parser.add_argument("--time-format", default=DEFAULT_TIME_FORMAT,
+                        help="strftime format for times (default: %(default)s)")
+    parser.add_argument("--field", default="rrule", help="JSON field holding the rule (default: %(default)s)")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="SQLite file of descriptions shared across runs (see persistent_cache)")
+    parser.add_argument("--stats", action="store_true",
+                        help="print throughput and latency percentiles to stderr")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    stats = run_stats()
+    records = read_records(_input_lines(args.files, stdin), args.field)
+    described = describe_records(records, args.date_format, args.time_format, args.workers, args.chunk_size,
+                                 args.cache)
+    output = []
+    for record, description, read_time in described:
+        failed = isinstance(description, Exception)
+        if failed:
+            record["error"] = _error(description)
+        else:
+            record["description"] = description
+        output.append(json.dumps(record))
+        if len(output) >= OUTPUT_BATCH:
+            output.append("")
+            stdout.write("\n".join(output))
+            output = []
+        stats.add(time.time() - read_time, failed)
+    if output:
+        output.append("")
+        stdout.write("\n".join(output))
+    stdout.flush()
+    if args.stats:
+        print >>stderr, stats.summary()
+    return stats.errors and 1 or 0
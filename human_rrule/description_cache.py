@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+description_cache.py
+
+A bounded, least-recently-used cache of rendered rrule descriptions.
+"""
+
+import threading
+from collections import OrderedDict
+
+import instrumentation
+from human_rrule2 import human_rrule, DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from rrule_eq import rule_key
+from rrule_normal import normalize_with_bounds
+
+DEFAULT_MAXSIZE = 4096
+
+
+class description_cache(object):
+    """Caches descriptions by (rule_key(rule), date_format, time_format).
+
+    Holds at most maxsize descriptions; when full, the least recently used one
+    is evicted. hits, misses and evictions count lookups since the last clear().
+    Safe to share between threads.
+
+    If normalize is True, rules are described in their normal form (see
+    rrule_normal), so that rules written differently share a rendering; the
+    description is kept under both the rule's own key and its normal key,
+    taking up to two of the maxsize entries, and a rule is only normalized
+    when its own key is not cached."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, normalize=False):
+        if maxsize < 1:
+            raise ValueError, "maxsize must be at least 1, not %s" % maxsize
+        self.maxsize = maxsize
+        self.normalize = normalize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get_description(self, rule, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+        """Return human_rrule(rule).get_description(date_format, time_format),
+        rendering it only if it is not already cached."""
+        key = (rule_key(rule), date_format, time_format)
+        description = self._lookup(key)
+        if description is not None:
+            return description
+        bounds = None
+        keys = [key]
+        if self.normalize:
+            # Normalizing is only paid for on a miss: the description is then
+            # kept under the rule's own key as well as its normal key.
+            rule, bounds = normalize_with_bounds(rule)
+            normal = (rule_key(rule), date_format, time_format)
+            if normal != key:
+                description = self._lookup(normal)
+                if description is not None:
+                    self._store([key], description)
+                    return description
+                keys.append(normal)
+        with self._lock:
+            self.misses += 1
+        if instrumentation.enabled:
+            instrumentation.count("description_cache.misses")
+        description = human_rrule(rule, bounds=bounds).get_description(date_format, time_format)
+        self._store(keys, description)
+        return description
+
+    def _lookup(self, key):
+        with self._lock:
+            description = self._entries.pop(key, None)
+            if description is None:
+                return None
+            self._entries[key] = description
+            self.hits += 1
+        if instrumentation.enabled:
+            instrumentation.count("description_cache.hits")
+        return description
+
+    def _store(self, keys, description):
+        with self._lock:
+            for key in keys:
+                self._entries[key] = description
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+                if instrumentation.enabled:
+                    instrumentation.count("description_cache.evictions")
+
+    def stats(self):
+        """Return the counters and current size as a dict."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        """Drop every cached description and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
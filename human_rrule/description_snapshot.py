@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+description_snapshot.py
+
+A compact, immutable copy of a rendered human_rrule for keeping in bulk.
+
+A human_rrule is a dict holding the rule it describes, whose dateutil
+iteration cache can hold many datetimes, and six strings of its own. A
+description_snapshot holds only the first and last occurrences and one
+shared tuple of the phrase fragments (interval, occurrence, period,
+terminal and timezone), which every snapshot of a rule with the same
+wording points to, as long as that wording is among the SHARED_FRAGMENTS
+most recently used. It renders the same text as human_rrule.get_description,
+in any date and time format, though only in English.
+"""
+
+import threading
+from collections import OrderedDict
+
+from description_template import compile_template, DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+
+FRAGMENT_KEYS = ("interval", "occurrence", "period", "terminal", "timezone")
+
+_FRAGMENT_INDEX = dict([(key, i) for i, key in enumerate(FRAGMENT_KEYS)])
+
+# How many distinct fragment tuples are kept for sharing. Snapshots made
+# after one is dropped hold a copy of their own, which compares equal.
+SHARED_FRAGMENTS = 10000
+
+# The fragment tuples shared, least recently used first.
+_shared_fragments = OrderedDict()
+_shared_lock = threading.Lock()
+
+
+def _intern(fragments):
+    with _shared_lock:
+        shared = _shared_fragments.pop(fragments, None)
+        if shared is None:
+            shared = fragments
+            while len(_shared_fragments) >= SHARED_FRAGMENTS:
+                _shared_fragments.popitem(last=False)
+        _shared_fragments[shared] = shared
+    return shared
+
+
+class description_snapshot(object):
+    """The parts of a human_rrule's description, detached from its rule.
+
+    Looking up "interval", "occurrence", "period", "terminal" or "timezone"
+    gives the fragment of that name; a terminal of "until ..." is kept as
+    just "until", the date coming from until when rendered. Immutable."""
+
+    __slots__ = ('_fragments', 'start', 'until', 'seen_from')
+
+    def __init__(self, fragments, start, until=None, seen_from=None):
+        """fragments holds the values of FRAGMENT_KEYS in order, with None
+        for a missing terminal; start and until are the first and last
+        occurrences the description starts at and runs until. seen_from is
+        None, or the (timezone, start, until) of another zone (see in_zone)."""
+        object.__setattr__(self, '_fragments', _intern(tuple(fragments)))
+        object.__setattr__(self, 'start', start)
+        object.__setattr__(self, 'until', until)
+        object.__setattr__(self, 'seen_from', seen_from)
+
+    def __setattr__(self, name, value):
+        raise AttributeError, "description_snapshot is immutable"
+
+    def __reduce__(self):
+        return description_snapshot, (self._fragments, self.start, self.until, self.seen_from)
+
+    def __getitem__(self, key):
+        value = self._fragments[_FRAGMENT_INDEX[key]]
+        # Like human_rrule, an unbounded rule has no terminal, while every
+        # rule has a timezone, if only None.
+        if value is None and key != "timezone":
+            raise KeyError(key)
+        return value
+
+    # The datetimes description_template renders, under human_rrule's names.
+
+    def _get_starttime(self):
+        return self.start
+
+    def _get_untiltime(self):
+        return self.until
+
+    def in_zone(self, tzinfo):
+        """Return a snapshot of the same description followed by its first
+        and last occurrences as seen from the time zone tzinfo, e.g. "...
+        in the America/New_York time zone (starting at ... in the Asia/Tokyo
+        time zone)".
+
+        The days and times the description names stay those of the rule's
+        own zone: in another zone an occurrence can fall on another day,
+        which "each Monday" cannot say. A snapshot of a rule without a time
+        zone, or seen from its own zone, is returned as is."""
+        timezone = self["timezone"]
+        if tzinfo is None or timezone is None or "%s" % tzinfo == timezone:
+            return self
+        seen_from = ("%s" % tzinfo, self.start and self.start.astimezone(tzinfo),
+                     self.until and self.until.astimezone(tzinfo))
+        return description_snapshot(self._fragments, self.start, self.until, seen_from)
+
+    def get_description(self, date_format=None, time_format=None):
+        """Return the description, as human_rrule.get_description does."""
+        template = compile_template(date_format or DEFAULT_DATE_FORMAT, time_format or DEFAULT_TIME_FORMAT)
+        description = template.render(self)
+        if self.seen_from is not None:
+            timezone, start, until = self.seen_from
+            description = "%s (%s)" % (description, template.render_seen_from(start, until, timezone))
+        return description
+
+    def __unicode__(self):
+        return unicode(self.get_description())
+
+    def __eq__(self, other):
+        if not isinstance(other, description_snapshot):
+            return NotImplemented
+        return (self._fragments == other._fragments and self.start == other.start and
+                self.until == other.until and self.seen_from == other.seen_from)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash((self._fragments, self.start, self.until, self.seen_from))
+
+    def __repr__(self):
+        return "description_snapshot(%r, %r, %r, %r)" % (self._fragments, self.start, self.until, self.seen_from)
+
+
+def take_snapshot(hr):
+    """Return a description_snapshot of the human_rrule hr."""
+    fragments = [hr.get(key) for key in FRAGMENT_KEYS]
+    terminal = fragments[_FRAGMENT_INDEX["terminal"]]
+    until = None
+    if terminal and terminal.startswith("until"):
+        fragments[_FRAGMENT_INDEX["terminal"]] = "until"
+        until = hr._get_untiltime()
+    return description_snapshot(fragments, hr._get_starttime(), until)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+description_template.py
+
+Compiles a (date_format, time_format, layout) combination once into a renderer
+that turns human_rrule instances into descriptions.
+"""
+
+import calendar
+import re
+from datetime import datetime, time
+
+import instrumentation
+
+DEFAULT_DATE_FORMAT = "%B %d, %Y"
+DEFAULT_TIME_FORMAT = "%I:%M %p"
+
+# The fields of a description, in the order get_description puts them.
+DEFAULT_LAYOUT = ("interval", "occurrence", "period", "begin_time", "terminal", "timezone")
+
+DIRECTIVE = re.compile(r"%(.)")
+
+# Runs of spaces, which fragments joined from empty parts can hold.
+SPACES = re.compile(" {2,}")
+
+
+# Zero-padded renderings of 0..99, for %d, %m, %y, %H, %I, %M and %S.
+TWO_DIGITS = tuple(["%02d" % i for i in range(100)])
+
+
+def compile_format(datetime_format, names=None):
+    """Return a function formatting a datetime like datetime_format.
+
+    Formats built only from the directives below are turned into a single
+    %-interpolation of precomputed strings, with the names of months, weekdays
+    and AM/PM captured from the current locale; anything else goes through
+    strftime. names may replace those names: it maps "B" and "b" to month
+    names indexed from 1, "A" and "a" to weekday names from Monday, and "p" to
+    the (AM, PM) pair."""
+    names = names or {}
+    month_names = tuple(names.get("B") or calendar.month_name)
+    month_abbrs = tuple(names.get("b") or calendar.month_abbr)
+    day_names = tuple(names.get("A") or calendar.day_name)
+    day_abbrs = tuple(names.get("a") or calendar.day_abbr)
+    am_pm = tuple(names.get("p") or (time(0).strftime("%p"), time(12).strftime("%p")))
+    directives = {
+        'd': lambda dt: TWO_DIGITS[dt.day],
+        'm': lambda dt: TWO_DIGITS[dt.month],
+        'Y': lambda dt: dt.year,
+        'y': lambda dt: TWO_DIGITS[dt.year % 100],
+        'H': lambda dt: TWO_DIGITS[dt.hour],
+        'I': lambda dt: TWO_DIGITS[dt.hour % 12 or 12],
+        'M': lambda dt: TWO_DIGITS[dt.minute],
+        'S': lambda dt: TWO_DIGITS[dt.second],
+        'p': lambda dt: am_pm[dt.hour >= 12],
+        'B': lambda dt: month_names[dt.month],
+        'b': lambda dt: month_abbrs[dt.month],
+        'A': lambda dt: day_names[dt.weekday()],
+        'a': lambda dt: day_abbrs[dt.weekday()],
+    }
+    if datetime_format == " ".join([DEFAULT_TIME_FORMAT, DEFAULT_DATE_FORMAT]):
+        # The default format, spelled out to avoid calling a getter per directive.
+        def format_default(dt):
+            hour = dt.hour
+            return "%s:%s %s %s %s, %d" % (TWO_DIGITS[hour % 12 or 12], TWO_DIGITS[dt.minute],
+                                           am_pm[hour >= 12], month_names[dt.month],
+                                           TWO_DIGITS[dt.day], dt.year)
+        return format_default
+    pattern = []
+    getters = []
+    position = 0
+    for match in DIRECTIVE.finditer(datetime_format):
+        directive = match.group(1)
+        pattern.append(datetime_format[position:match.start()].replace("%", "%%"))
+        position = match.end()
+        if directive == "%":
+            pattern.append("%%")
+        elif directive in directives:
+            pattern.append("%s")
+            getters.append(directives[directive])
+        else:
+            if names:
+                raise ValueError, "%%%s cannot be formatted with localized names" % directive
+            return lambda dt: dt.strftime(datetime_format)
+    pattern.append(datetime_format[position:].replace("%", "%%"))
+    pattern = "".join(pattern)
+    getters = tuple(getters)
+    return lambda dt: pattern % tuple([getter(dt) for getter in getters])
+
+
+class description_template(object):
+    """A compiled description layout.
+
+    layout lists the fields of the description in order: any human_rrule key,
+    where "begin_time" and "terminal" are re-rendered with this template's date
+    and time formats. Use compile_template to share instances."""
+
+    def __init__(self, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                 layout=DEFAULT_LAYOUT):
+        self.date_format = date_format
+        self.time_format = time_format
+        self.layout = tuple(layout)
+        self.format_datetime = compile_format(" ".join([time_format, date_format]))
+        renderers = {
+            "begin_time": self._render_begin_time,
+            "terminal": self._render_terminal,
+            "timezone": self._render_timezone,
+        }
+        self._fields = tuple([(key, renderers.get(key)) for key in self.layout])
+
+    def render(self, hr):
+        """Return the description of the human_rrule hr."""
+        start = instrumentation.enabled and instrumentation.clock()
+        parts = []
+        for key, renderer in self._fields:
+            if renderer:
+                part = renderer(hr)
+            else:
+                try:
+                    part = hr[key]
+                except KeyError:
+                    continue
+                part = part and part.strip()
+            if part:
+                parts.append(part)
+        description = SPACES.sub(" ", " ".join(parts))
+        if start:
+            instrumentation.record("render", instrumentation.clock() - start)
+        return description
+
+    def _format(self, dt):
+        start = instrumentation.enabled and instrumentation.clock()
+        formatted = self.format_datetime(dt)
+        if start:
+            instrumentation.record("render.format", instrumentation.clock() - start)
+        return formatted
+
+    def _render_begin_time(self, hr):
+        starttime = hr._get_starttime()
+        if starttime:
+            return "starting at %s" % self._format(starttime)
+        return None
+
+    def _render_terminal(self, hr):
+        try:
+            terminal = hr["terminal"]
+        except KeyError:
+            return None
+        if terminal and terminal.startswith("until"):
+            untiltime = hr._get_untiltime()
+            if untiltime:
+                return "until %s" % self._format(untiltime)
+            return "until"
+        return terminal
+
+    def render_seen_from(self, start, until, timezone):
+        """Return the first and last occurrences of a rule as seen from the
+        time zone named timezone, worded as the begin time, terminal and
+        timezone of a description are; until is None unless the rule's own
+        description shows it."""
+        parts = []
+        if start:
+            parts.append("starting at %s" % self._format(start))
+        if until:
+            parts.append("until %s" % self._format(until))
+        parts.append("in the %s time zone" % timezone)
+        return " ".join(parts)
+
+    def _render_timezone(self, hr):
+        timezone = hr["timezone"]
+        if timezone:
+            return "in the %s time zone" % timezone
+        return None
+
+
+_templates = {}
+
+
+def compile_template(date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                     layout=DEFAULT_LAYOUT):
+    """Return the shared description_template for these formats and layout.
+
+    Month, weekday and AM/PM names are taken from the locale in effect when a
+    template is first compiled; call clear_templates after changing locale."""
+    key = (date_format, time_format, layout)
+    template = _templates.get(key)
+    if template is None:
+        start = instrumentation.enabled and instrumentation.clock()
+        template = _templates[key] = description_template(date_format, time_format, layout)
+        if start:
+            instrumentation.record("template.compile", instrumentation.clock() - start)
+    return template
+
+
+def clear_templates():
+    """Forget every compiled template."""
+    _templates.clear()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+fan_out.py
+
+Describes one rule to many viewers, each with their own time zone, date and
+time formats and locale, as a shared calendar shows an event to its
+subscribers.
+
+The rule is analysed and its first and last occurrences found once; each
+distinct time zone then only converts those two datetimes, and each
+distinct viewer only formats them. Viewers that see the rule alike share
+one rendering.
+"""
+
+from collections import namedtuple
+
+from human_rrule2 import human_rrule
+
+# How one subscriber sees rules. Any field left out is None, which is the
+# rule's own time zone, the default formats or English.
+viewer = namedtuple("viewer", "tzinfo date_format time_format locale")
+viewer.__new__.__defaults__ = (None, None, None, None)
+
+
+def describe_for_viewers(rule, viewers):
+    """Return a list of the description of rule, an rrule or a human_rrule,
+    for each of viewers, in order; see human_rrule.get_description_in."""
+    if not isinstance(rule, human_rrule):
+        rule = human_rrule(rule)
+    snapshot = None
+    zoned = {}
+    rendered = {}
+    descriptions = []
+    for seen in viewers:
+        description = rendered.get(seen)
+        if description is None:
+            tzinfo, date_format, time_format, locale = seen
+            if locale is None:
+                if snapshot is None:
+                    snapshot = rule.snapshot()
+                in_zone = zoned.get(tzinfo)
+                if in_zone is None:
+                    in_zone = zoned[tzinfo] = snapshot.in_zone(tzinfo)
+                description = in_zone.get_description(date_format, time_format)
+            else:
+                description = rule.get_description_in(tzinfo, date_format, time_format, locale)
+            rendered[seen] = description
+        descriptions.append(description)
+    return descriptions
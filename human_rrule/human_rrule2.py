@@ -7,11 +7,6 @@ Created by William Bert on 2011-08-12.
 Copyright (c) 2011. All rights reserved.
 """
 
-# TODO Add i18n
-
-import sys
-import os
-import unittest
 from datetime import datetime, time
 
 # import dateutil
@@ -19,11 +14,16 @@ from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SEC
 from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU, weekdays
 from dateutil.rrule import weekday
 from dateutil.rrule import rrule as rr
-from dateutil.relativedelta import relativedelta as rd
 
-from int2word import int2word
+from int2word import int2word, int2ordinal
+
+from rrule_eq import RRULE_PARAMS, replace_rrule
+
+from rrule_bounds import rrule_bounds, known_bounds, budget_exceeded
 
-from rrule_eq import rrule_eq 
+from description_template import compile_template
+
+import instrumentation
 
 VALID_FREQUENCIES = [YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY]
 
@@ -79,45 +79,6 @@ MONTH_MAP = (
     "December"
 )
 
-INT_ORDINAL_MAP = {
-    1: u'first',
-    2: u'second',
-    3: u'third',
-    5: u'fifth',
-    8: u'eighth',
-    9: u'ninth',
-    11: u'eleventh',
-    12: u'twelfth',
-    20: u'twentieth',
-    30: u'thirtieth',
-    40: u'fortieth',
-    50: u'fiftieth',
-    60: u'sixtieth',
-    70: u'seventieth',
-    80: u'eightieth',
-    90: u'ninetieth',    
-    -1: u'last'
-}
-
-NUM_ORDINAL_MAP = {
-    "one": u'first',
-    "two": u'second',
-    "three": u'third',
-    "five": u'fifth',
-    "eight": u'eighth',
-    "nine": u'ninth',
-    "eleven": u'eleventh',
-    "twelve": u'twelfth',
-    "twenty": u'twentieth',
-    "thirty": u'thirtieth',
-    "forty": u'fortieth',
-    "fifty": u'fiftieth',
-    "sixty": u'sixtieth',
-    "seventy": u'seventieth',
-    "eighty": u'eightieth',
-    "ninety": u'ninetieth',    
-}
-
 WEEKDAY_LONG_MAP = (
     (7, u'Sunday'),
     (1, u'Monday'),
@@ -132,6 +93,34 @@ DEFAULT_DATE_FORMAT = "%B %d, %Y"
 DEFAULT_TIME_FORMAT = "%I:%M %p"
 DEFAULT_DATETIME_FORMAT = " ".join([DEFAULT_TIME_FORMAT, DEFAULT_DATE_FORMAT])
 
+# The keys of a human_rrule, in the order they are built, and the method that builds each.
+KEY_BUILDERS = (
+    ("period", "_get_period"),
+    ("interval", "_get_interval"),
+    ("occurrence", "_get_occurrence"),
+    ("begin_time", "_get_begin_time"),
+    ("terminal", "_get_terminal"),
+    ("timezone", "_get_timezone"),
+)
+KEY_BUILDER_MAP = dict(KEY_BUILDERS)
+
+# The rrule parameters each key is built from. The first occurrence, and so
+# begin_time, depends on every parameter but COUNT (UNTIL only cuts it off);
+# terminal depends on the last occurrence, and so on all of them.
+FIRST_OCCURRENCE_PARAMS = RRULE_PARAMS - frozenset(["count", "until"])
+KEY_PARAMS = {
+    "period": frozenset(["freq"]),
+    "interval": frozenset(["interval"]),
+    "occurrence": RRULE_PARAMS - frozenset(["interval", "wkst", "count", "until"]),
+    "begin_time": RRULE_PARAMS - frozenset(["count"]),
+    "terminal": RRULE_PARAMS,
+    "timezone": frozenset(["dtstart"]),
+}
+
+# The keys whose building is timed when instrumentation is enabled; the others
+# are table lookups.
+TIMED_KEYS = frozenset(["occurrence", "begin_time", "terminal"])
+
         
 class human_rrule(dict):
     """Represents a verbal description of an rrule.
@@ -146,143 +135,361 @@ class human_rrule(dict):
     terminal = [ ]
     timezone
     """
+
+    # Keys not built yet; see _refresh_dict. The class default covers instances
+    # being unpickled, whose items are restored before their attributes.
+    __pending = ()
+    # The locale-independent parts of the rule, analysed on first use by a
+    # description in another locale.
+    __parts = None
+    __budget = None
+    # The occurrence_cursor of upcoming, between and remaining, made on first use.
+    __cursor = None
+    # True once a bound had to fall back to the rule's own DTSTART or UNTIL.
+    approximate = False
     
-    def __init__(self, rrule):
+    def __init__(self, rrule, lazy=False, budget=None, bounds=None):
+        """If lazy is True, each key is built the first time it is looked up
+        rather than all of them up front. The keys not built yet are not in
+        the underlying dict, so code that reads it directly, without calling
+        the methods of this class, sees only the built ones: in CPython,
+        dict(hr) and f(**hr) do, and json.dumps(hr) gives {} until a key is
+        built. Pass such code hr.copy(), a plain dict with every key, instead.
+
+        budget, an rrule_bounds.iteration_budget, limits the occurrences a rule
+        that cannot be analysed is iterated for to find its first and last
+        occurrences. Once it runs out, the description starts at the rule's
+        DTSTART and runs until its UNTIL, and approximate is set.
+
+        bounds, if given, is used for the first and last occurrences of rrule
+        instead of an rrule_bounds; see vector_bounds.batch_bounds."""
         super(human_rrule, self).__init__()
         self.__rrule = rrule
-        self._refresh_dict()
+        self.__lazy = lazy
+        self.__budget = budget
+        self._refresh_dict(bounds)
     
     def get_rrule(self):
         return self.__rrule
 
     def set_rrule(self, rrule):
-        self.__rule = rrule
+        self.__rrule = rrule
         self._refresh_dict()
 
     rrule = property(get_rrule, set_rrule)
+
+    def update_rrule(self, **changes):
+        """Replace the rule with one built from its parameters with those in
+        changes replaced, e.g. count=5 or byweekday=(MO, FR); see
+        rrule_eq.replace_rrule.
+
+        Only the keys built from the changed parameters (see KEY_PARAMS) are
+        rebuilt, and when only COUNT or UNTIL change the first occurrence is
+        kept rather than found again."""
+        rule = replace_rrule(self.__rrule, **changes)
+        if not rule._freq in VALID_FREQUENCIES:
+            raise ValueError, "Invalid frequency in rrule: %s" % rule._freq
+        changed = frozenset(changes)
+        bounds = rrule_bounds(rule, self.__budget)
+        if not changed & FIRST_OCCURRENCE_PARAMS:
+            bounds.carry_first(self.__bounds)
+        self.__rrule = rule
+        self.__bounds = bounds
+        self.__parts = None
+        self.__cursor = None
+        self.approximate = False
+        stale = set([key for key, builder in KEY_BUILDERS if KEY_PARAMS[key] & changed])
+        for key in stale:
+            dict.pop(self, key, None)
+        pending = set(self.__pending) | stale
+        self.__pending = [key for key, builder in KEY_BUILDERS
+                          if key in pending and (key != "terminal" or rule._count or rule._until)]
+        if not self.__lazy:
+            self._fill()
     
-    def get_description(self, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+    def get_description(self, date_format=None, time_format=None, locale=None):
         """Convenience method for returning a string consisting of all the values of an human_rrule in 
-        an order that reflects an English language description of the rrule."""
+        an order that reflects an English language description of the rrule.
+
+        If locale is given, the description is worded by that locale's catalog
+        (see catalogs.py) instead, with the catalog's date and time formats
+        unless others are given. The first and last occurrences and the parts of
+        the rule are worked out once and shared by every locale."""
+        if locale is None:
+            return compile_template(date_format or DEFAULT_DATE_FORMAT,
+                                    time_format or DEFAULT_TIME_FORMAT).render(self)
+        # Imported here, so that English-only users never load the catalogs.
+        from catalogs import analyse, get_catalog
+        if self.__parts is None:
+            self.__parts = analyse(self.__rrule)
+        until = self.__parts.until and not self.__parts.count and self._get_untiltime()
+        return get_catalog(locale).describe(self.__parts, self._get_starttime(), until, self["timezone"],
+                                            date_format, time_format)
         
-        datetime_format = " ".join([time_format, date_format])
-        desc = []
-        # desc.append(self["frequency"])
-        desc.append(self["interval"])
-        desc.append(self["occurrence"])
-        desc.append(self["period"])
-        desc.append("starting at %s" % self._get_starttime().strftime(datetime_format)) 
-        if self["terminal"].startswith("until"):            
-            untiltime = self._get_untiltime()
-            desc.append(' '.join(["until", untiltime.strftime(datetime_format) if untiltime else ""]))
-        else:
-            desc.append(self["terminal"])
+    def get_description_in(self, tzinfo, date_format=None, time_format=None, locale=None):
+        """Return the description followed by the first and last occurrences
+        as seen from the time zone tzinfo (see description_snapshot.in_zone).
+        The rest of the wording, e.g. "each Monday", stays that of the rule's
+        own zone, where its days are. A rule without a time zone is floating,
+        and is described as get_description does, as is one seen from its
+        own zone."""
+        if tzinfo is None or self.__rrule._tzinfo is None or "%s" % tzinfo == self["timezone"]:
+            return self.get_description(date_format, time_format, locale)
+        if locale is None:
+            return self.snapshot().in_zone(tzinfo).get_description(date_format, time_format)
+        description = self.get_description(date_format, time_format, locale)
+        from catalogs import get_catalog
+        until = self.__parts.until and not self.__parts.count and self._get_untiltime()
+        start = self._get_starttime()
+        return u"%s (%s)" % (description, get_catalog(locale).describe_seen_from(
+            start and start.astimezone(tzinfo), until and until.astimezone(tzinfo), "%s" % tzinfo,
+            date_format, time_format))
 
-        if self["timezone"]:
-            desc.append("in the %s time zone" % self["timezone"])
-
-        return " ".join(desc).replace("  ", " ")
-        
     def __unicode__(self):
         return unicode(self.get_description())
 
-    def _refresh_dict(self):
+    def _get_state(self):
+        """Return what wire_format keeps of this human_rrule besides its rule:
+        the keys built so far, the bounds found so far (see
+        rrule_bounds.found) and whether it is lazy and approximate."""
+        return dict.items(self), self.__bounds.found(), self.__lazy, self.approximate
+
+    @classmethod
+    def _from_state(cls, rrule, items, found, lazy, approximate):
+        """Rebuild a human_rrule from rrule and _get_state's values, without
+        building its keys or finding its bounds again."""
+        if "first" in found and "last" in found:
+            bounds = known_bounds(found["first"], found["last"])
+        else:
+            bounds = rrule_bounds(rrule)
+            if "first" in found:
+                bounds.carry_first(known_bounds(found["first"], None))
+        hr = cls(rrule, lazy=True, bounds=bounds)
+        dict.update(hr, items)
+        hr.__pending = [key for key in hr.__pending if not dict.__contains__(hr, key)]
+        hr.__lazy = lazy
+        hr.approximate = approximate
+        if not lazy:
+            hr._fill()
+        return hr
+
+    def snapshot(self):
+        """Return a description_snapshot: a compact, immutable copy of the
+        description that does not keep the rule."""
+        # Imported here, like the catalogs, to keep importing this module fast.
+        from description_snapshot import take_snapshot
+        return take_snapshot(self)
+
+    def _get_cursor(self):
+        if self.__cursor is None:
+            from occurrence_cursor import occurrence_cursor
+            self.__cursor = occurrence_cursor(self.__rrule)
+        return self.__cursor
+
+    def upcoming(self, n, after=None):
+        """Return a list of the next n occurrences at or after after, by
+        default now.
+
+        upcoming, between and remaining share an occurrence_cursor, so that
+        polling them with a later time each call only computes the
+        occurrences since the last one."""
+        return self._get_cursor().upcoming(n, after)
+
+    def between(self, start, end):
+        """Return a list of the occurrences at or after start and before end."""
+        return self._get_cursor().between(start, end)
+
+    def remaining(self, after=None):
+        """Return the number of occurrences at or after after, by default now,
+        or None if the rule never ends."""
+        return self._get_cursor().remaining(after)
+
+    def _refresh_dict(self, bounds=None):
         # Populate the human_rrule components with values based on the properties of 
         # self.__rrule
+        dict.clear(self)
         rr = self.__rrule
-        dtstart = rr._dtstart # datetime of when each occurrence starts. Defaults to now, down to the second.
         if not rr._freq in VALID_FREQUENCIES:
             raise ValueError, "Invalid frequency in rrule: %s" % rr._freq
-        freq = rr._freq # when the recurrence recurs, secondly through yearly. Required.
-        interval = rr._interval # how often the recurrence happens, each time through every nth time. Defaults to 1.
-        wkst = rr._wkst # Integer representing week start day, ie, an int representing which day of the week starts the week, usually 0 for Sunday or 1 for Monday. Defaults to calendar.firstweekday().
-        until = rr._until # datetime until which the recurrence continues. Only it or count is set, not both.
-        count = rr._count # Number of times the event happens before it stops. Only it or until is set, not both.
-        tzinfo = rr._tzinfo # Time zone information. Defaults to the tzinfo of dtstart.
-        bymonth = rr._bymonth # Tuple. Which month a yearly event recurs in.
-        byweekno = rr._byweekno # Tuple. Which week number a yearly event recurs in.
-        byyearday = rr._byyearday # Tuple. Which day of the year a yearly event recurs in.
-        byweekday = rr._byweekday # Tuple. Which weekday an event recurs in.
-        bynweekday = rr._bynweekday # Tuple. By the nth weekday, e.g., FR(3) is the third Friday of the period. Only used if freq is < MONTHLY
-        byeaster = rr._byeaster # Tuple.
+        # The first and last occurrences are computed at most once per rule and
+        # reused by every get_description call; a new rule gets fresh bounds.
+        self.__bounds = bounds or rrule_bounds(rr, self.__budget)
+        self.__parts = None
+        self.__cursor = None
+        self.approximate = False
+        # Keys that have not been built yet. In lazy mode each one is built by
+        # __missing__ the first time it is looked up.
+        self.__pending = [key for key, builder in KEY_BUILDERS
+                          if key != "terminal" or rr._count or rr._until]
+        if not self.__lazy:
+            self._fill()
+
+    def _fill(self):
+        """Build every key that has not been built yet."""
+        while self.__pending:
+            self[self.__pending[0]]
+
+    def __missing__(self, key):
+        if key not in self.__pending:
+            raise KeyError(key)
+        self.__pending.remove(key)
+        start = instrumentation.enabled and key in TIMED_KEYS and instrumentation.clock()
+        value = getattr(self, KEY_BUILDER_MAP[key])()
+        if start:
+            instrumentation.record("build." + key, instrumentation.clock() - start)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _get_period(self):
+        # Initialize the period, which is derived from the frequency. 
+        freq = self.__rrule._freq # when the recurrence recurs, secondly through yearly. Required.
+        if freq in [HOURLY, MINUTELY, SECONDLY]:
+            return "" # Expresing periods doesn't make sense for these frequencies (e.g., 
+        return ' '.join(["of the", PERIOD_MAP[freq]])
+
+    def _get_interval(self):
+        # (What I think of as frequency, namely how often this recurrence occurs, e.g.,
+        # each time, every other time, every third time, etc., rrule calls interval.)
+        interval = self.__rrule._interval # how often the recurrence happens, each time through every nth time. Defaults to 1.
+        if interval < len(INTERVAL_MAP):
+            return INTERVAL_MAP[interval]
+        return u"every %s" % human_rrule.int_as_ordinal(interval)
+
+    def _get_occurrence(self):
+        rr = self.__rrule
+        freq = rr._freq
         bymonthday = rr._bymonthday # Tuple. Relative day of the month
-        bynmonthday = rr._bynmonthday # Tuple. Relative day of the month, if negative (counting from the end of the month)
-        bysetpos = rr._bysetpos # Tuple. For sets of seconds/minutes/hours/days/weeks/months/years, specifies which position in the list to pay attention to.
-        byhour = rr._byhour # Tuple. The hour of the occurrence.
-        byminute = rr._byminute # Tuple. The minutes of the occurrence.
-        bysecond = rr._bysecond # Tuple. The second of the occurrence.
-        timeset = rr._timeset # If freq < HOURLY and all three of hour, minute, and second are set, timeset is a tuple of datetime.times representing when the occurrence occurs. None if otherwise.
         # YEARLY needs to have bymonth and bymonthday set
         # MONTHLY needs to have bymonthday set 
         # WEEKLY needs to have byweekday set
         # Or else they will be filled in from dtstart?
-        
-        # Get the frequency. YEARLY, MONTHLY, etc. 
-        # (What I think of as frequency, namely how often this recurrence occurs, e.g.,
-        # each time, every other time, every third time, etc., rrule calls interval.)
-        # self["frequency"] = FREQUENCY_MAP[freq]
-        
-        # Initialize the period, which is derived from the frequency. 
-        if freq in [HOURLY, MINUTELY, SECONDLY]:
-            self["period"] = "" # Expresing periods doesn't make sense for these frequencies (e.g., 
-        else:
-            self["period"] = ' '.join(["of the", PERIOD_MAP[freq]])
-        self["interval"] = INTERVAL_MAP[interval]       
- 
-                
-        if freq == YEARLY:
-            self["occurrence"] = self._build_occurrence()
-
-            
-        elif freq == MONTHLY:        
-            self["occurrence"] = self._build_occurrence()    
-            # # bynweekday is a tuple of (weekday, week_in_period) tuples
-            # for rule_pair in bynweekday:
-            # 
-            #     # Get the ordinal. TODO handle multiple ordinals
-            #     ord_text = []
-            #     ord_text.append(human_rrule.int_as_ordinal(rule_pair[1]))
-            # 
-            #     #  Get the weekday name
-            #     p_weekday = weekday(rule_pair[0])
-            #     name = [WEEKDAY_MAP[unicode(p_weekday)]]
-            #     ord_text.extend(name)
-            #     self["occurrence"] = " ".join(ord_text)                
-                                        
-        elif freq == WEEKLY:
-            self["occurrence"] = self._build_occurrence()
+        if freq in [YEARLY, MONTHLY, WEEKLY]:
             # check wkst to see which day of week is first
-            
-            
+            return self._build_occurrence()
         elif freq == DAILY:
-            self["occurrence"] = "day"
-                          
-            
+            return "day"
         elif freq == HOURLY:
-            self["occurrence"] = "hour"
-
+            return "hour"
         elif freq == MINUTELY:
-            self["occurrence"] = "minute"
-
+            return "minute"
         elif freq == SECONDLY:
-            self["occurrence"] = "second"
+            occurrence = "second"
             if bymonthday:                  
                 s = "".join(["of the ", human_rrule.int_as_ordinal(bymonthday[0]), " day of the month"]) # TODO work with multiple bymonthdays
-                self["occurrence"] = " ".join([self["occurrence"], s])
+                occurrence = " ".join([occurrence, s])
+            return occurrence
+        raise ValueError, "Frequency value of %s is not valid." % freq
 
+    def _get_begin_time(self):
+        starttime = self._get_starttime()
+        return "starting at %s" % starttime.strftime(DEFAULT_DATETIME_FORMAT) if starttime else ""
 
-        else:
-            raise human_rruleError, "Frequency value of %s is not valid." % freq
-            
-        self["begin_time"] = " ".join(["starting at", self._get_starttime().strftime(DEFAULT_DATETIME_FORMAT)])
-        
+    def _get_terminal(self):
+        count = self.__rrule._count # Number of times the event happens before it stops. Only it or until is set, not both.
         if count:
-            self["terminal"] = "%s times" % int2word(count).rstrip()
-        elif until:
-            untiltime = self._get_untiltime()
-            self["terminal"] = "until %s" % untiltime.strftime(DEFAULT_DATETIME_FORMAT) if untiltime else ""
-            
-        self["timezone"] = tzinfo and "%s" % tzinfo or None
+            return "%s times" % int2word(count).rstrip()
+        untiltime = self._get_untiltime()
+        return "until %s" % untiltime.strftime(DEFAULT_DATETIME_FORMAT) if untiltime else ""
+
+    def _get_timezone(self):
+        tzinfo = self.__rrule._tzinfo # Time zone information. Defaults to the tzinfo of dtstart.
+        return tzinfo and "%s" % tzinfo or None
+
+    # Lookups that must see every key build the pending ones first, so a lazy
+    # human_rrule compares, iterates and prints like the eager one. CPython's
+    # own dict copying and merging bypass them; see __init__.
+
+    def __setitem__(self, key, value):
+        if key in self.__pending:
+            self.__pending.remove(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if key in self.__pending:
+            self.__pending.remove(key)
+            return
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self.__pending or dict.__contains__(self, key)
+
+    has_key = __contains__
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __len__(self):
+        return len(self.__pending) + dict.__len__(self)
+
+    def __iter__(self):
+        self._fill()
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._fill()
+        if isinstance(other, human_rrule):
+            other._fill()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._fill()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self._fill()
+        return dict.keys(self)
+
+    def values(self):
+        self._fill()
+        return dict.values(self)
+
+    def items(self):
+        self._fill()
+        return dict.items(self)
+
+    def iterkeys(self):
+        self._fill()
+        return dict.iterkeys(self)
+
+    def itervalues(self):
+        self._fill()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self._fill()
+        return dict.iteritems(self)
+
+    def copy(self):
+        self._fill()
+        return dict.copy(self)
+
+    def pop(self, key, *default):
+        if key in self.__pending:
+            self[key]
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._fill()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def clear(self):
+        self.__pending = []
+        dict.clear(self)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).iteritems():
+            self[key] = value
    
     def _build_occurrence(self):
         """
@@ -319,7 +526,7 @@ class human_rrule(dict):
         if bynmonthday:
             s = ""
             for i, nmonthday in enumerate(bynmonthday):                    
-                s = "".join([" and " if i>0 else "", "the %s to last day of the month" % human_rrule.int_as_ordinal(bynmonthday)])
+                s = "".join([" and " if i>0 else " ", "%s day" % human_rrule.int_as_ordinal(nmonthday)])
                 o = "".join([o, s]) # 
         if byweekday:
             s = ""
@@ -327,9 +534,9 @@ class human_rrule(dict):
                 s = "".join([", " if i>0 else "", WEEKDAY_MAP[unicode(weekday(p_weekday))]])
                 o = "".join([o, s])
         if byweekno:
-            o = " ".join([o, "the %s week" % human_rrule.int_as_ordinal(byweekno)])
+            o = " ".join([o, "%s week" % " and ".join(map(human_rrule.int_as_ordinal, byweekno))])
         if byyearday:
-            o = " ".join([o, "the %s year" % human_rrule.int_as_ordinal(byyearday)])
+            o = " ".join([o, "%s day" % " and ".join(map(human_rrule.int_as_ordinal, byyearday))])
         if bynweekday:
             for rule_pair in bynweekday:
 
@@ -348,46 +555,25 @@ class human_rrule(dict):
  
     def _get_starttime(self):
         """Get the actual starttime of the recurrence. dtstart is used as a boundary, but depending on the rules, it may or may not be the actual datetime when the first instance of the recurrence occurs."""
-        for d in self.__rrule:
-            return d
+        try:
+            return self.__bounds.first()
+        except budget_exceeded:
+            self.approximate = True
+            return self.__rrule._dtstart
 
     def _get_untiltime(self):
         """Get the actual untiltime of the recurrence. until is used as a boundary, but depending on the rules, it may or may not be the actual datetime when the last instance of the recurrence occurs."""        
-        last = None
-        for d in self.__rrule:
-            last = d             
-        return last
+        try:
+            return self.__bounds.last()
+        except budget_exceeded:
+            self.approximate = True
+            return self.__rrule._until
                 
     @staticmethod
     def int_as_ordinal(i):
         """Return a string representing an int as an ordinal number."""
-        num = int2word(i)
-        last_num = num.split()[-1:][0]
-        if last_num in NUM_ORDINAL_MAP:
-            d = num.split()[0:-1]
-            d.append(NUM_ORDINAL_MAP[last_num])
-            return " ".join(d)
-            
-        return ''.join([num, human_rrule._ordinal_ending(i)])
+        return int2ordinal(i)
     
-    # @staticmethod
-    # def num_as_ordinal(num):
-
-    @staticmethod
-    def _ordinal_ending(i):
-
-        last_digit = str(i)[-1:]
-        if last_digit == '1':
-            return "st"
-        elif last_digit == '2':
-            return "nd"
-        elif last_digit == '3':
-            return "rd"
-        elif last_digit in ['4', '5', '6', '7', '8', '9', '0']:
-            return "th"
-        else:
-            raise ValueError, "%s was not a number." % last_digit
-        
     @staticmethod
     def _get_dict_vals(pdict):
         """Recursively includes all and only the values of a dictionary in a string. When it encounters a 
@@ -411,110 +597,3 @@ class human_rrule(dict):
                 human_rrule._do_get_dict_vals(v, list)
             else:       
                 list.append(v)
-            
-    
-class human_rruleTests(unittest.TestCase):
-    def setUp(self):
-        pass
-
-    def test_int_as_ordinal(self):
-        self.assertEqual(human_rrule.int_as_ordinal(1), "first")
-        self.assertEqual(human_rrule.int_as_ordinal(11), "eleventh")
-        self.assertEqual(human_rrule.int_as_ordinal(30), "thirtieth")
-        self.assertEqual(human_rrule.int_as_ordinal(44), "forty fourth")
-        self.assertEqual(human_rrule.int_as_ordinal(59), "fifty ninth")
-        self.assertEqual(human_rrule.int_as_ordinal(160), "one hundred sixtieth")
-        self.assertEqual(human_rrule.int_as_ordinal(200), "two hundredth")
-        self.assertEqual(human_rrule.int_as_ordinal(278), "two hundred seventy eighth")    
-        
-        
-    def test_invalid_freq(self):    
-        testrr = rrule_eq("a", byweekday=MO, dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15))
-        self.assertRaises(ValueError, human_rrule, rrule=testrr)
-    
-        testrr = rrule_eq(None, byweekday=MO, dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15))
-        self.assertRaises(ValueError, human_rrule, rrule=testrr)
-        
-    def test_secondly(self):
-        correct = u"each second starting at 00:00:00 AM August 15, 2011 ten times"
-        testrr = rrule_eq(SECONDLY, dtstart=datetime(2011, 8, 15), count=10)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)
-        
-        correct = "each second of the twenty first day of the month starting at 00:00:00 AM August 21, 2011 ten times"
-        testrr = rrule_eq(SECONDLY, dtstart=datetime(2011, 8, 15), count=10, bymonthday=21)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)
-        
-    def test_minutely(self):
-        correct = u"each minute starting at 00:00:00 AM August 15, 2011 ten times"
-        testrr = rrule_eq(MINUTELY, dtstart=datetime(2011, 8, 15), count=10)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)
-        
-    def test_hourly(self):
-        correct = u"each hour starting at 00:00:00 AM August 15, 2011 ten times"
-        testrr = rrule_eq(HOURLY, dtstart=datetime(2011, 8, 15), count=10)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)        
-            
-    def test_weekly(self):
-        correct = u"each Monday of the week starting at 12:00 AM August 15, 2011 ten times"
-        testrr = rrule_eq(WEEKLY, dtstart=datetime(2011, 8, 15), count=10)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(), correct)
-        
-    def test_yearly(self):
-        correct = u"each August 15 of the year starting at 12:00 AM August 15, 2011 ten times"
-        testrr = rrule_eq(YEARLY, dtstart=datetime(2011, 8, 15), count=10)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(), correct)
-
-        correct = u"each Tuesday of the year starting at 12:00 AM August 16, 2011 ten times"
-        testrr = rrule_eq(YEARLY, dtstart=datetime(2011, 8, 15), count=10, byweekday=TU)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(), correct)
-
-    def test_monthly(self):
-        correct = u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times"
-        testrr = rrule_eq(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(), correct)
-
-        correct = u"every other first Sunday of the month starting at 09:00 PM October 02, 2011 until 09:00 PM August 05, 2012"
-        testrr = rrule_eq(MONTHLY, interval=2, byweekday=SU(1), dtstart=datetime(2011, 8, 15, 21, 0, 0), until=datetime(2012, 8, 15))
-        hr = human_rrule(testrr)
-        self.assertEqual(hr.get_description(), correct)
-
-        correct = u"every other first Sunday of the month starting at 09:00 PM 10/02/2011 until 09:00 PM 08/05/2012"
-        self.assertEqual(hr.get_description(date_format="%m/%d/%Y"), correct)
-
-        correct = u"every other first Sunday of the month starting at 21:00 October 02, 2011 until 21:00 August 05, 2012"
-        self.assertEqual(hr.get_description(time_format="%H:%M"), correct)
-         
-         
-         
-    # def test_get_dict_vals(self):
-        # d1 = { 
-            # 'a': "I",
-            # 'b': {
-                # 'a': "am",
-                # 'b': "a"
-                # },
-            # 'c': "recursive",
-            # 'd': {
-                # "a": "but",
-                # "b": "simple"
-                # },
-            # 'e': "function."
-        # } 
-
-        # l = ["I", "am", "a", "recursive", "but", "simple", "function."]
-        # dict_vals = human_rrule._get_dict_vals(d1)
-        # for i in dict_vals:
-            # self.assertIn(i, l)
-        # for i in l:
-            # self.assertIn(i, dict_vals)
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
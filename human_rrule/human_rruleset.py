@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+human_rruleset.py
+
+Describes a dateutil rruleset: its rules, its extra dates (RDATE) and its
+exclusions (EXRULE and EXDATE), along with the actual first and last
+occurrences of the whole set.
+
+The bounds of the set are merged from the bounds of its rules, which
+rrule_bounds mostly finds without iterating them; the rules are only
+iterated past those bounds when an exclusion falls on one. Each rule is
+interned in a rule_registry, so a rule that appears in many sets is
+analysed and described once.
+"""
+
+import heapq
+
+from human_rrule2 import DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from description_template import compile_template
+from rule_registry import rule_registry
+
+# The registry the rules of every human_rruleset are interned in by default.
+shared_registry = rule_registry()
+
+_UNSET = object()
+
+
+def _join(parts):
+    if len(parts) < 2:
+        return "".join(parts)
+    return " and ".join([", ".join(parts[:-1]), parts[-1]])
+
+
+def _forward(first, rule):
+    """Yield the occurrences of rule from first on; the rule is only iterated
+    if more than first is asked for."""
+    yield first
+    for dt in rule:
+        if dt > first:
+            yield dt
+
+
+def _backward(last, rule):
+    """Yield the occurrences of rule from last back."""
+    dt = last
+    while dt is not None:
+        yield dt
+        dt = rule.before(dt)
+
+
+class human_rruleset(object):
+    """Represents a verbal description of a dateutil rruleset."""
+
+    def __init__(self, ruleset, registry=None):
+        if registry is None:
+            registry = shared_registry
+        self.ruleset = ruleset
+        self._rules = [registry.intern(rule) for rule in ruleset._rrule]
+        self._exrules = [registry.intern(rule) for rule in ruleset._exrule]
+        self._rdates = sorted(ruleset._rdate)
+        self._exdates = sorted(ruleset._exdate)
+        self._excluded_dates = frozenset(self._exdates)
+        self._first = self._last = _UNSET
+
+    def _excluded(self, dt):
+        if dt in self._excluded_dates:
+            return True
+        for exrule in self._exrules:
+            bounds = exrule.bounds()
+            first = bounds.first()
+            if first is None or dt < first:
+                continue
+            if (exrule.rule._count or exrule.rule._until) and dt > bounds.last():
+                continue
+            if dt in exrule.rule:
+                return True
+        return False
+
+    def first(self):
+        """Return the first occurrence of the set, or None if it has none."""
+        if self._first is _UNSET:
+            streams = [iter(self._rdates)]
+            for member in self._rules:
+                first = member.bounds().first()
+                if first is not None:
+                    streams.append(_forward(first, member.rule))
+            self._first = None
+            for dt in heapq.merge(*streams):
+                if not self._excluded(dt):
+                    self._first = dt
+                    break
+        return self._first
+
+    def last(self):
+        """Return the last occurrence of the set, or None if it has none or
+        never ends, because one of its rules has neither COUNT nor UNTIL."""
+        if self._last is _UNSET:
+            self._last = self._find_last()
+        return self._last
+
+    def _find_last(self):
+        streams = [iter(reversed(self._rdates))]
+        for member in self._rules:
+            rule = member.rule
+            if not (rule._count or rule._until):
+                return None
+            last = member.bounds().last()
+            if last is not None:
+                streams.append(_backward(last, rule))
+        heads = []
+        for stream in streams:
+            for dt in stream:
+                heads.append([dt, stream])
+                break
+        while heads:
+            head = max(heads)
+            dt, stream = head
+            if not self._excluded(dt):
+                return dt
+            # Equal occurrences of other streams are excluded just the same.
+            for other in [h for h in heads if h[0] == dt]:
+                for earlier in other[1]:
+                    other[0] = earlier
+                    break
+                else:
+                    heads.remove(other)
+        return None
+
+    def get_description(self, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+        """Return the descriptions of the rules of the set, followed by its
+        extra dates and its exclusions."""
+        template = compile_template(date_format, time_format)
+        parts = [_join([member.get_description(date_format, time_format) for member in self._rules])]
+        if self._rdates:
+            parts.append("also on %s" % _join([template.format_datetime(dt) for dt in self._rdates]))
+        if self._exdates:
+            parts.append("except on %s" % _join([template.format_datetime(dt) for dt in self._exdates]))
+        if self._exrules:
+            parts.append("except %s" % _join([member.get_description(date_format, time_format)
+                                              for member in self._exrules]))
+        return ", ".join([part for part in parts if part])
+
+    def __unicode__(self):
+        return unicode(self.get_description())
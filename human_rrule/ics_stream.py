@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+ics_stream.py
+
+Reads iCalendar (.ics) data a line at a time and describes the RRULE of each
+VEVENT, holding no more than one event in memory.
+"""
+
+import re
+from datetime import datetime
+
+from dateutil.rrule import rrulestr
+from dateutil.tz import gettz, tzutc
+
+from human_rrule2 import DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from description_cache import description_cache
+from rrule_eq import mark_given
+
+# NAME;PARAM=VALUE;PARAM="QUOTED:VALUE":VALUE
+CONTENT_LINE = re.compile(r'([^;:]+)((?:;[^;:=]+=(?:"[^"]*"|[^;:"]*))*):(.*)$')
+PARAMETER = re.compile(r';([^;:=]+)=("[^"]*"|[^;:"]*)')
+UNTIL = re.compile(r'(UNTIL=)([^;]*)', re.IGNORECASE)
+
+UTC = tzutc()
+
+
+def unfold(lines):
+    """Yield the logical lines of iCalendar data, joining each line that starts
+    with a space or tab onto the line before it (RFC 5545, section 3.1)."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_line(line):
+    """Split a content line into (NAME, {PARAM: value}, value)."""
+    match = CONTENT_LINE.match(line)
+    if not match:
+        raise ValueError, "invalid content line: %r" % line
+    name, params, value = match.groups()
+    params = dict([(param.upper(), param_value.strip('"'))
+                   for param, param_value in PARAMETER.findall(params)])
+    return name.upper(), params, value
+
+
+def parse_datetime(value, params=None, tzinfos=None):
+    """Return the datetime of a DATE or DATE-TIME value.
+
+    Values ending in Z are UTC; a TZID parameter is looked up with
+    dateutil.tz.gettz, and memoized in tzinfos if given. Times in an unknown
+    zone, like floating times, come back naive."""
+    params = params or {}
+    try:
+        if len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d")
+        if value.endswith("Z") or value.endswith("z"):
+            return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=UTC)
+        dt = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    except ValueError:
+        raise ValueError, "invalid date or date-time: %r" % value
+    tzid = params.get("TZID")
+    if tzid:
+        if tzinfos is None:
+            tzinfos = {}
+        if tzid not in tzinfos:
+            tzinfos[tzid] = gettz(tzid)
+        if tzinfos[tzid]:
+            dt = dt.replace(tzinfo=tzinfos[tzid])
+    return dt
+
+
+def build_rrule(value, dtstart):
+    """Return the dateutil rrule for an RRULE value starting at dtstart.
+
+    UNTIL is brought to the same kind of datetime as dtstart, as RFC 5545
+    requires and dateutil needs to compare them: UTC if dtstart has a time
+    zone, floating if it does not."""
+    if value.upper().startswith("RRULE:"):
+        value = value[6:]
+    # BYDAY is the only part named unlike dateutil's parameter.
+    given = [part.split("=")[0].strip().lower().replace("byday", "byweekday") for part in value.split(";")]
+    if dtstart.tzinfo is None:
+        return mark_given(rrulestr(value, dtstart=dtstart, ignoretz=True), given)
+
+    def until_in_utc(match):
+        until = parse_datetime(match.group(2))
+        if until.tzinfo is None:
+            until = until.replace(tzinfo=dtstart.tzinfo)
+        return match.group(1) + until.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+    return mark_given(rrulestr(UNTIL.sub(until_in_utc, value), dtstart=dtstart), given)
+
+
+def rrule_from_string(text, dtstart=None):
+    """Return the dateutil rrule for a DTSTART and RRULE written as text.
+
+    The DTSTART line, if any, comes first and is separated from the RRULE by a
+    line break or a semicolon, as in
+    "DTSTART:19970902T090000;RRULE:FREQ=DAILY;INTERVAL=10;COUNT=5"; the RRULE:
+    prefix is optional. A dtstart given as an argument is used when the text
+    has none. Raises ValueError if there is no start or the text is invalid."""
+    text = text.strip()
+    position = text.upper().find("RRULE:")
+    if position > 0:
+        name, params, value = parse_line(text[:position].rstrip(" \t\r\n;"))
+        if name != "DTSTART":
+            raise ValueError, "expected DTSTART before RRULE, not %s" % name
+        dtstart = parse_datetime(value, params)
+        text = text[position:]
+    if dtstart is None:
+        raise ValueError, "no DTSTART for %r" % text
+    try:
+        return build_rrule(text, dtstart)
+    except (KeyError, TypeError), e:
+        raise ValueError, "invalid RRULE %r" % text
+
+
+def iter_rules(lines, skip_invalid=False):
+    """Yield (uid, rrule) for each VEVENT in lines that has an RRULE.
+
+    lines is any iterable of the lines of an iCalendar stream, such as an open
+    file. Properties of components nested in a VEVENT (VALARMs) and of other
+    components (VTIMEZONE rules) are ignored; only the first RRULE of an event
+    is used. An event whose DTSTART or RRULE cannot be read raises ValueError,
+    or is left out if skip_invalid is True."""
+    tzinfos = {}
+    components = []
+    event = None
+    for line in unfold(lines):
+        if not line.strip():
+            continue
+        try:
+            name, params, value = parse_line(line)
+        except ValueError:
+            if skip_invalid:
+                continue
+            raise
+        if name == "BEGIN":
+            components.append(value.upper())
+            if components == ["VCALENDAR", "VEVENT"] or components == ["VEVENT"]:
+                event = {}
+        elif name == "END":
+            if components and components[-1] == "VEVENT" and event is not None:
+                rule = None
+                if "RRULE" in event:
+                    try:
+                        if "DTSTART" not in event:
+                            raise ValueError, "RRULE without DTSTART"
+                        dtstart = parse_datetime(event["DTSTART"][1], event["DTSTART"][0], tzinfos)
+                        rule = build_rrule(event["RRULE"][1], dtstart)
+                    except ValueError, e:
+                        if not skip_invalid:
+                            raise ValueError, "event %s: %s" % (event.get("UID", (None, None))[1], e)
+                if rule is not None:
+                    yield event.get("UID", (None, None))[1], rule
+                event = None
+            if components:
+                components.pop()
+        elif event is not None and components[-1] == "VEVENT":
+            if name in ("UID", "DTSTART", "RRULE") and name not in event:
+                event[name] = (params, value)
+
+
+def describe_ics(source, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                 cache=None, skip_invalid=False):
+    """Yield (uid, description) for each recurring VEVENT in source.
+
+    source is a filename or an iterable of lines, such as an open file; it is
+    read lazily, so memory use does not grow with its size. Descriptions come
+    from cache, a description_cache, so that events sharing a rule render it
+    once; by default a new cache of the default size is used.
+
+    An event whose rule cannot be read or described raises ValueError naming
+    its UID, or is left out if skip_invalid is True."""
+    if isinstance(source, basestring):
+        source = open(source, "rU")
+        close = source.close
+    else:
+        close = None
+    if cache is None:
+        cache = description_cache()
+    try:
+        for uid, rule in iter_rules(source, skip_invalid):
+            try:
+                description = cache.get_description(rule, date_format, time_format)
+            except Exception, e:
+                if skip_invalid:
+                    continue
+                raise ValueError, "event %s: cannot describe its rule: %s: %s" % (uid, type(e).__name__, e)
+            yield uid, description
+    finally:
+        if close:
+            close()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+instrumentation.py
+
+Opt-in timing of the stages of describing an rrule, and counters for the work
+done along the way.
+
+Nothing is recorded until enable() is called. While disabled, each
+instrumented call site costs one attribute lookup and test. While enabled,
+each stage duration and counter increment goes to the shared registry, whose
+snapshot() can be polled, and to every hook added with add_hook, which is
+called as hook(kind, name, value) with kind "timer" (value in seconds) or
+"counter" (value the increment).
+
+Stages timed:
+    build.<key>           building the occurrence, begin_time and terminal
+                          keys of a human_rrule
+    bounds.first          finding the first occurrence of a rule
+    bounds.last           finding the last occurrence of a rule
+    render                rendering a description from a template
+    render.format         formatting the start and end datetimes
+    template.compile      compiling a description template
+
+Counters:
+    bounds.analytic, bounds.iterated    rules whose bounds were computed or
+                                        found by iterating the rule
+    occurrences_iterated                occurrences generated by iterating
+    ordinal_conversions                 calls to int2ordinal
+    description_cache.hits, .misses, .evictions
+    rule_registry.hits, .misses
+"""
+
+import sys
+import threading
+import time
+import weakref
+
+enabled = False
+
+# The most precise wall clock, as timeit.default_timer picks it.
+if sys.platform == "win32":
+    clock = time.clock
+else:
+    clock = time.time
+
+_hooks = []
+
+
+class metrics_registry(object):
+    """Accumulates stage durations and counters.
+
+    Each thread records into its own dicts, so recording takes no lock;
+    snapshot() adds up the dicts of every thread that has recorded anything.
+    Once a thread has finished, its dicts are added to those of the threads
+    before it and dropped, as another thread starts recording or a snapshot
+    is taken, so that threads started per request do not pile up."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # (weak reference to the thread, timers, counters) for each thread.
+        self._threads = []
+        # What the finished threads recorded.
+        self._finished = ({}, {})
+
+    def _thread_dicts(self):
+        timers, counters = self._local.timers, self._local.counters = {}, {}
+        with self._lock:
+            self._prune()
+            self._threads.append((weakref.ref(threading.current_thread()), timers, counters))
+        return timers, counters
+
+    def _prune(self):
+        """Fold the dicts of finished threads into _finished; call with the
+        lock held."""
+        alive = []
+        for entry in self._threads:
+            thread = entry[0]()
+            if thread is not None and thread.is_alive():
+                alive.append(entry)
+            else:
+                _merge(self._finished, entry[1:])
+        self._threads = alive
+
+    def record(self, name, seconds):
+        try:
+            timers = self._local.timers
+        except AttributeError:
+            timers = self._thread_dicts()[0]
+        timer = timers.get(name)
+        if timer is None:
+            timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def count(self, name, n=1):
+        try:
+            counters = self._local.counters
+        except AttributeError:
+            counters = self._thread_dicts()[1]
+        counters[name] = counters.get(name, 0) + n
+
+    def snapshot(self):
+        """Return the timers and counters as a dict:
+        {"timers": {name: {"count", "total", "mean", "max"}}, "counters": {name: n}}."""
+        merged_timers = {}
+        merged_counters = {}
+        merged = (merged_timers, merged_counters)
+        with self._lock:
+            self._prune()
+            _merge(merged, self._finished)
+            threads = [entry[1:] for entry in self._threads]
+        for dicts in threads:
+            _merge(merged, dicts)
+        timers = dict([(name, {"count": count, "total": total, "mean": total / count, "max": longest})
+                       for name, (count, total, longest) in merged_timers.items()])
+        return {"timers": timers, "counters": merged_counters}
+
+    def reset(self):
+        with self._lock:
+            self._prune()
+            for thread, timers, counters in self._threads:
+                timers.clear()
+                counters.clear()
+            self._finished = ({}, {})
+
+
+def _merge(into, dicts):
+    """Add the (timers, counters) dicts to the (timers, counters) into."""
+    merged_timers, merged_counters = into
+    timers, counters = dicts
+    for name, (count, total, longest) in timers.items():
+        merged = merged_timers.setdefault(name, [0, 0.0, longest])
+        merged[0] += count
+        merged[1] += total
+        merged[2] = max(merged[2], longest)
+    for name, n in counters.items():
+        merged_counters[name] = merged_counters.get(name, 0) + n
+
+
+registry = metrics_registry()
+
+
+def enable():
+    """Start recording."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Stop recording. What was recorded stays in the registry."""
+    global enabled
+    enabled = False
+
+
+def add_hook(hook):
+    """Call hook(kind, name, value) for everything recorded from now on."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+
+def snapshot():
+    """Return what the registry has recorded; see metrics_registry.snapshot."""
+    return registry.snapshot()
+
+
+def reset():
+    """Forget everything the registry has recorded."""
+    registry.reset()
+
+
+def record(name, seconds):
+    """Record that the stage name took seconds. Call sites measure with clock()
+    and only call this while enabled is true."""
+    registry.record(name, seconds)
+    if _hooks:
+        for hook in _hooks:
+            hook("timer", name, seconds)
+
+
+def count(name, n=1):
+    """Add n to the counter name. Call sites only call this while enabled is true."""
+    registry.count(name, n)
+    if _hooks:
+        for hook in _hooks:
+            hook("counter", name, n)
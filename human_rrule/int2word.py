@@ -1,80 +1,118 @@
 # integer number to english word conversion
 # can be used for numbers as large as 999 vigintillion
 # (vigintillion --> 10 to the power 60)
-# tested with Python24 vegaseat 07dec2006
-# from http://www.daniweb.com/software-development/python/code/216839
- 
+# originally from http://www.daniweb.com/software-development/python/code/216839
+# (vegaseat 07dec2006); now table driven, with an arithmetic fallback that
+# collects words in a list and joins them once.
+
+import instrumentation
+
 def int2word(n):
     """
     convert an integer number n into a string of english words
     """
     if n < 0:
         raise ValueError, "int2word works with zero and positive integers."
-    elif n == 0:
-        return "zero"
-        
-    # break the number into groups of 3 digits using slicing
-    # each group representing hundred, thousand, million, billion, ...
-    n3 = []
-    r1 = ""
-    # create numeric string
-    ns = str(n)
-    for k in range(3, 33, 3):
-        r = ns[-k:]
-        q = len(ns) - k
-        # break if end of ns has been reached
-        if q < -2:
-            break
-        else:
-            if q >= 0:
-                n3.append(int(r[:3]))
-            elif q >= -1:
-                n3.append(int(r[:2]))
-            elif q >= -2:
-                n3.append(int(r[:1]))
-        r1 = r
-
-    #print n3 # test
-
-    # break each group of 3 digits into
-    # ones, tens/twenties, hundreds
-    # and form a string
-    nw = ""
-    for i, x in enumerate(n3):
-        b1 = x % 10
-        b2 = (x % 100)//10
-        b3 = (x % 1000)//100
-        #print b1, b2, b3 # test
-        if x == 0:
+    if n <= CARDINAL_LIMIT:
+        word = cardinals[n]
+        if word is None:
+            word = cardinals[n] = " ".join(_words(n))
+        return word
+    return " ".join(_words(n))
+
+def int2ordinal(n):
+    """
+    convert an integer number n into an english ordinal, e.g. "forty fourth".
+    negative numbers count from the end: -1 is "last", -2 "second to last".
+    """
+    if instrumentation.enabled:
+        instrumentation.count("ordinal_conversions")
+    if -ORDINAL_LIMIT <= n <= ORDINAL_LIMIT:
+        word = ordinals[n + ORDINAL_LIMIT]
+        if word is None:
+            word = ordinals[n + ORDINAL_LIMIT] = _ordinal(n)
+        return word
+    return _ordinal(n)
+
+def _words(n):
+    """Return the list of english words for the integer n >= 0."""
+    if n == 0:
+        return ["zero"]
+    # split n into groups of 3 digits, least significant first,
+    # each group representing units, thousands, millions, ...
+    groups = []
+    while n:
+        n, group = divmod(n, 1000)
+        groups.append(group)
+    if len(groups) > len(thousands):
+        raise ValueError, "int2word works with numbers below 10 to the power %d." % (3 * len(thousands))
+
+    # break each group of 3 digits into hundreds, tens/twenties and ones
+    words = []
+    for scale in range(len(groups) - 1, -1, -1):
+        group = groups[scale]
+        if group == 0:
             continue # skip
-        else:
-            t = thousands[i]
-        if b2 == 0:
-            nw = ones[b1] + t + nw
-        elif b2 == 1:
-            nw = tens[b1] + t + nw
-        elif b2 > 1:
-            nw = twenties[b2] + ones[b1] + t + nw
-        if b3 > 0:
-            nw = ones[b3] + "hundred " + nw
-    return nw.rstrip()
+        hundred, rest = divmod(group, 100)
+        if hundred:
+            words.append(ones[hundred])
+            words.append("hundred")
+        if rest >= 20:
+            ten, one = divmod(rest, 10)
+            words.append(twenties[ten])
+            if one:
+                words.append(ones[one])
+        elif rest >= 10:
+            words.append(tens[rest - 10])
+        elif rest:
+            words.append(ones[rest])
+        if scale:
+            words.append(thousands[scale])
+    return words
+
+def _ordinal(n):
+    if n < 0:
+        if n == -1:
+            return "last"
+        return _ordinal(-n) + " to last"
+    words = _words(n)
+    last = words[-1]
+    words[-1] = ordinal_words.get(last) or last + "th"
+    return " ".join(words)
 
 ############# globals ################
 
-ones = ["", "one ","two ","three ","four ", "five ",
-"six ","seven ","eight ","nine "]
+ones = ["", "one","two","three","four", "five",
+"six","seven","eight","nine"]
+
+tens = ["ten","eleven","twelve","thirteen", "fourteen",
+"fifteen","sixteen","seventeen","eighteen","nineteen"]
 
-tens = ["ten ","eleven ","twelve ","thirteen ", "fourteen ",
-"fifteen ","sixteen ","seventeen ","eighteen ","nineteen "]
+twenties = ["","","twenty","thirty","forty",
+"fifty","sixty","seventy","eighty","ninety"]
 
-twenties = ["","","twenty ","thirty ","forty ",
-"fifty ","sixty ","seventy ","eighty ","ninety "]
+thousands = ["","thousand","million", "billion", "trillion",
+"quadrillion", "quintillion", "sextillion", "septillion","octillion",
+"nonillion", "decillion", "undecillion", "duodecillion", "tredecillion",
+"quattuordecillion", "sexdecillion", "septendecillion", "octodecillion",
+"novemdecillion", "vigintillion"]
 
-thousands = ["","thousand ","million ", "billion ", "trillion ",
-"quadrillion ", "quintillion ", "sextillion ", "septillion ","octillion ",
-"nonillion ", "decillion ", "undecillion ", "duodecillion ", "tredecillion ",
-"quattuordecillion ", "sexdecillion ", "septendecillion ", "octodecillion ",
-"novemdecillion ", "vigintillion "]
+# ordinals that are not simply the cardinal plus "th"
+ordinal_words = {"one": "first", "two": "second", "three": "third",
+"five": "fifth", "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+"twenty": "twentieth", "thirty": "thirtieth", "forty": "fortieth",
+"fifty": "fiftieth", "sixty": "sixtieth", "seventy": "seventieth",
+"eighty": "eightieth", "ninety": "ninetieth"}
+
+# tables of words for the values rrules use most: counts up to
+# CARDINAL_LIMIT, and ordinals for every BYMONTHDAY, BYYEARDAY, BYWEEKNO
+# and nth-weekday value, positive or negative. each entry is filled in the
+# first time it is asked for, so importing the module stays cheap.
+CARDINAL_LIMIT = 10000
+ORDINAL_LIMIT = 366
+
+cardinals = [None] * (CARDINAL_LIMIT + 1)
+ordinals = [None] * (2 * ORDINAL_LIMIT + 1)
 
 if __name__ == '__main__':
     # select an integer number n for testing or get it from user input
@@ -88,4 +126,4 @@ if __name__ == '__main__':
 
     print "-"*50
     print int2word(n)
-    print "-"*50
\ No newline at end of file
+    print "-"*50
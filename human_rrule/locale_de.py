@@ -0,0 +1,83 @@
+# encoding: utf-8
+"""
+locale_de.py
+
+The German catalog. See catalogs.py.
+"""
+
+WEEKDAYS = (u"Montag", u"Dienstag", u"Mittwoch", u"Donnerstag", u"Freitag", u"Samstag", u"Sonntag")
+
+MONTHS = (u"Januar", u"Februar", u"März", u"April", u"Mai", u"Juni", u"Juli",
+          u"August", u"September", u"Oktober", u"November", u"Dezember")
+
+UNITS = {
+    "year": (u"Jahr", u"Jahre"),
+    "month": (u"Monat", u"Monate"),
+    "week": (u"Woche", u"Wochen"),
+    "day": (u"Tag", u"Tage"),
+    "hour": (u"Stunde", u"Stunden"),
+    "minute": (u"Minute", u"Minuten"),
+    "second": (u"Sekunde", u"Sekunden"),
+}
+
+LIST_SEPARATOR = u", "
+LAST_SEPARATOR = u" und "
+
+PATTERNS = {
+    "every": u"jeden {unit}",
+    "every_year": u"jedes {unit}",
+    "every_week": u"jede {unit}",
+    "every_hour": u"jede {unit}",
+    "every_minute": u"jede {unit}",
+    "every_second": u"jede {unit}",
+    "every_n": u"alle {n} {units}",
+    "on": u"am {days}",
+    "nth_weekday": u"{ordinal} {weekday}",
+    "monthday": u"{n}.",
+    "monthday_from_end": u"{ordinal} Tag des Monats",
+    "in": u"im {months}",
+    "starting": u"ab {datetime}",
+    "count": u", {n} Mal",
+    "once": u", einmal",
+    "until": u"bis {datetime}",
+    "timezone": u"in der Zeitzone {timezone}",
+    "yearday": u"{ordinal} Tag des Jahres",
+    "easter": u"Ostersonntag",
+    "easter_after": u"{ordinal} Tag nach Ostersonntag",
+    "easter_before": u"{ordinal} Tag vor Ostersonntag",
+    "weeknos": u"in Kalenderwoche {numbers}",
+    "hours": u"um {numbers} Uhr",
+    "setpos": u"davon jeweils den {ordinals} je {unit}",
+    "datetime": u"{date}, {time} Uhr",
+}
+
+DATE_FORMAT = "%d. %B %Y"
+TIME_FORMAT = "%H:%M"
+
+# Ordinal stems; the dative ending is added by ordinal().
+STEMS = (u"", u"erst", u"zweit", u"dritt", u"viert", u"fünft", u"sechst", u"siebt", u"acht", u"neunt",
+         u"zehnt", u"elft", u"zwölft")
+
+
+def cardinal(n):
+    return unicode(n)
+
+
+def _stem(n):
+    if n < len(STEMS):
+        return STEMS[n]
+    return None
+
+
+def ordinal(n):
+    """The dative form used after "am": "dritten", "vorletzten", "drittletzten"."""
+    if n < 0:
+        if n == -1:
+            return u"letzten"
+        if n == -2:
+            return u"vorletzten"
+        stem = _stem(-n)
+        if stem:
+            return stem + u"letzten"
+        return u"%d.-letzten" % -n
+    return (_stem(n) or u"%d." % n) + (n < len(STEMS) and u"en" or u"")
@@ -0,0 +1,52 @@
+# encoding: utf-8
+"""
+locale_en.py
+
+The English catalog. See catalogs.py.
+"""
+
+from int2word import int2word as cardinal, int2ordinal as ordinal
+
+WEEKDAYS = (u"Monday", u"Tuesday", u"Wednesday", u"Thursday", u"Friday", u"Saturday", u"Sunday")
+
+MONTHS = (u"January", u"February", u"March", u"April", u"May", u"June", u"July",
+          u"August", u"September", u"October", u"November", u"December")
+
+UNITS = {
+    "year": (u"year", u"years"),
+    "month": (u"month", u"months"),
+    "week": (u"week", u"weeks"),
+    "day": (u"day", u"days"),
+    "hour": (u"hour", u"hours"),
+    "minute": (u"minute", u"minutes"),
+    "second": (u"second", u"seconds"),
+}
+
+LIST_SEPARATOR = u", "
+LAST_SEPARATOR = u" and "
+
+PATTERNS = {
+    "every": u"every {unit}",
+    "every_other": u"every other {unit}",
+    "every_n": u"every {ordinal} {unit}",
+    "on": u"on {days}",
+    "nth_weekday": u"the {ordinal} {weekday}",
+    "monthday": u"the {ordinal} day of the month",
+    "monthday_from_end": u"the {ordinal} day of the month",
+    "in": u"in {months}",
+    "starting": u"starting at {datetime}",
+    "count": u"{cardinal} times",
+    "once": u"once",
+    "until": u"until {datetime}",
+    "timezone": u"in the {timezone} time zone",
+    "yearday": u"the {ordinal} day of the year",
+    "easter": u"Easter Sunday",
+    "easter_after": u"the {ordinal} day after Easter Sunday",
+    "easter_before": u"the {ordinal} day before Easter Sunday",
+    "weeknos": u"in the {ordinals} week of the year",
+    "hours": u"at {numbers} o'clock",
+    "setpos": u"taking the {ordinals} of each {unit}",
+}
+
+DATE_FORMAT = "%B %d, %Y"
+TIME_FORMAT = "%I:%M %p"
@@ -0,0 +1,70 @@
+# encoding: utf-8
+"""
+locale_es.py
+
+The Spanish catalog. See catalogs.py.
+"""
+
+WEEKDAYS = (u"lunes", u"martes", u"miércoles", u"jueves", u"viernes", u"sábado", u"domingo")
+
+MONTHS = (u"enero", u"febrero", u"marzo", u"abril", u"mayo", u"junio", u"julio",
+          u"agosto", u"septiembre", u"octubre", u"noviembre", u"diciembre")
+
+UNITS = {
+    "year": (u"año", u"años"),
+    "month": (u"mes", u"meses"),
+    "week": (u"semana", u"semanas"),
+    "day": (u"día", u"días"),
+    "hour": (u"hora", u"horas"),
+    "minute": (u"minuto", u"minutos"),
+    "second": (u"segundo", u"segundos"),
+}
+
+LIST_SEPARATOR = u", "
+LAST_SEPARATOR = u" y "
+
+PATTERNS = {
+    "every": u"cada {unit}",
+    "every_n": u"cada {n} {units}",
+    "on": u"el {days}",
+    "nth_weekday": u"{ordinal} {weekday}",
+    "monthday": u"día {n}",
+    "monthday_from_end": u"{ordinal} día del mes",
+    "in": u"en {months}",
+    "starting": u"a partir del {datetime}",
+    "count": u", {n} veces",
+    "once": u", una vez",
+    "until": u"hasta el {datetime}",
+    "timezone": u"en la zona horaria {timezone}",
+    "yearday": u"{ordinal} día del año",
+    "easter": u"domingo de Pascua",
+    "easter_after": u"{ordinal} día después del domingo de Pascua",
+    "easter_before": u"{ordinal} día antes del domingo de Pascua",
+    "weeknos": u"en la semana {numbers} del año",
+    "hours": u"a las {numbers} horas",
+    "setpos": u"tomando el {ordinals} de cada {unit}",
+    "datetime": u"{date} a las {time}",
+}
+
+DATE_FORMAT = "%d de %B de %Y"
+TIME_FORMAT = "%H:%M"
+
+# Ordinals before a noun, which is all they are used for here.
+ORDINALS = (u"", u"primer", u"segundo", u"tercer", u"cuarto", u"quinto", u"sexto", u"séptimo",
+            u"octavo", u"noveno", u"décimo")
+
+ORDINALS_FROM_END = (u"", u"último", u"penúltimo", u"antepenúltimo")
+
+
+def cardinal(n):
+    return unicode(n)
+
+
+def ordinal(n):
+    if n < 0:
+        if -n < len(ORDINALS_FROM_END):
+            return ORDINALS_FROM_END[-n]
+        return u"%s desde el final" % ordinal(-n)
+    if n < len(ORDINALS):
+        return ORDINALS[n]
+    return u"%d.º" % n
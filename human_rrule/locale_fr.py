@@ -0,0 +1,77 @@
+# encoding: utf-8
+"""
+locale_fr.py
+
+The French catalog. See catalogs.py.
+"""
+
+WEEKDAYS = (u"lundi", u"mardi", u"mercredi", u"jeudi", u"vendredi", u"samedi", u"dimanche")
+
+MONTHS = (u"janvier", u"février", u"mars", u"avril", u"mai", u"juin", u"juillet",
+          u"août", u"septembre", u"octobre", u"novembre", u"décembre")
+
+MONTH_ABBRS = (u"janv.", u"févr.", u"mars", u"avr.", u"mai", u"juin", u"juil.",
+               u"août", u"sept.", u"oct.", u"nov.", u"déc.")
+
+UNITS = {
+    "year": (u"an", u"ans"),
+    "month": (u"mois", u"mois"),
+    "week": (u"semaine", u"semaines"),
+    "day": (u"jour", u"jours"),
+    "hour": (u"heure", u"heures"),
+    "minute": (u"minute", u"minutes"),
+    "second": (u"seconde", u"secondes"),
+}
+
+LIST_SEPARATOR = u", "
+LAST_SEPARATOR = u" et "
+
+PATTERNS = {
+    "every": u"chaque {unit}",
+    "every_n": u"tous les {n} {units}",
+    # Feminine units.
+    "every_n_week": u"toutes les {n} {units}",
+    "every_n_hour": u"toutes les {n} {units}",
+    "every_n_minute": u"toutes les {n} {units}",
+    "every_n_second": u"toutes les {n} {units}",
+    "on": u"le {days}",
+    "nth_weekday": u"{ordinal} {weekday}",
+    "monthday": u"{n}",
+    "monthday_from_end": u"{ordinal} jour du mois",
+    "in": u"en {months}",
+    "starting": u"à partir du {datetime}",
+    "count": u"{n} fois",
+    "once": u"une fois",
+    "until": u"jusqu'au {datetime}",
+    "timezone": u"dans le fuseau horaire {timezone}",
+    "yearday": u"{ordinal} jour de l'année",
+    "easter": u"dimanche de Pâques",
+    "easter_after": u"{ordinal} jour après le dimanche de Pâques",
+    "easter_before": u"{ordinal} jour avant le dimanche de Pâques",
+    "weeknos": u"pendant la semaine {numbers} de l'année",
+    "hours": u"à {numbers} heures",
+    "setpos": u"en retenant le {ordinals} de chaque {unit}",
+    "datetime": u"{date} à {time}",
+}
+
+DATE_FORMAT = "%d %B %Y"
+TIME_FORMAT = "%H:%M"
+
+ORDINALS = (u"", u"premier", u"deuxième", u"troisième", u"quatrième", u"cinquième", u"sixième",
+            u"septième", u"huitième", u"neuvième", u"dixième")
+
+
+def cardinal(n):
+    return unicode(n)
+
+
+def ordinal(n):
+    if n < 0:
+        if n == -1:
+            return u"dernier"
+        if n == -2:
+            return u"avant-dernier"
+        return u"%s en partant de la fin" % ordinal(-n)
+    if n < len(ORDINALS):
+        return ORDINALS[n]
+    return u"%de" % n
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+nonblocking.py
+
+Describing rules from an event loop without blocking it.
+
+describe and describe_many return a pending_description straight away: a
+handle the loop can poll with done(), be told about with add_done_callback,
+or wait on with result(timeout). Rules whose bounds can be found without
+iterating many occurrences are rendered inline, before describe returns.
+The rest are rendered by an executor, a thread pool by default or anything
+with the apply_async of multiprocessing.Pool (a process pool keeps the GIL
+free for the loop too), at most limit at a time and in the order they were
+asked for.
+
+A timeout fails the description but cannot stop it once the executor has
+started rendering it: the rendering runs on and keeps its place among the
+limit until it ends, when its result is dropped. Timeouts bound how long
+callers wait, while limit bounds the work actually running.
+
+Done callbacks run in the thread that finished the description: the
+executor's, the timeout watchdog's, or the caller's. Callbacks that touch
+the loop should hand over to it, e.g. with tornado's IOLoop.add_callback.
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from multiprocessing import TimeoutError
+from multiprocessing.pool import ThreadPool
+
+from human_rrule2 import human_rrule, DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from rrule_bounds import rrule_bounds
+
+DEFAULT_LIMIT = 4
+
+# Rules with a COUNT of at most this many occurrences are rendered inline
+# even when their occurrences have to be iterated.
+INLINE_COUNT = 1000
+
+PENDING, RUNNING, FINISHED, FAILED, CANCELLED = range(5)
+
+
+class CancelledError(Exception):
+    pass
+
+
+def is_cheap(rule, bounds=None):
+    """Return whether describing rule iterates at most INLINE_COUNT occurrences.
+    bounds is the rrule_bounds of rule, if already made."""
+    try:
+        if (bounds or rrule_bounds(rule)).analytic:
+            return True
+    except Exception:
+        # Invalid rules fail just as quickly inline.
+        return True
+    if rule._until is None:
+        return rule._count is None or rule._count <= INLINE_COUNT
+    return False
+
+
+def _render(rule, date_format, time_format, bounds=None):
+    """Describe rule in the executor, or inline with the rrule_bounds bounds.
+    Returns (True, description) or (False, exception), since apply_async
+    has no error callback."""
+    try:
+        return True, human_rrule(rule, bounds=bounds).get_description(date_format, time_format)
+    except Exception, e:
+        return False, e
+
+
+class pending_description(object):
+    """A description that may not be rendered yet."""
+
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self._state = PENDING
+        self._value = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+
+    def _start(self):
+        """Mark as running; return False if cancelled or timed out first."""
+        with self._lock:
+            if self._state != PENDING:
+                return False
+            self._state = RUNNING
+            return True
+
+    def _finish(self, state, value):
+        with self._lock:
+            if self._state not in (PENDING, RUNNING):
+                return False
+            self._state = state
+            self._value = value
+            callbacks, self._callbacks = self._callbacks, None
+        self._event.set()
+        for callback in callbacks:
+            callback(self)
+        return True
+
+    def _expire(self):
+        if self.deadline is not None and not self._event.is_set() and time.time() >= self.deadline:
+            self._finish(FAILED, TimeoutError("description timed out"))
+
+    def done(self):
+        """Return whether the description is rendered, failed, timed out or
+        was cancelled."""
+        self._expire()
+        return self._event.is_set()
+
+    def cancelled(self):
+        return self._state == CANCELLED
+
+    def cancel(self):
+        """Cancel the description unless it is being rendered or done. Returns
+        whether it was cancelled."""
+        with self._lock:
+            if self._state != PENDING:
+                return self._state == CANCELLED
+        return self._finish(CANCELLED, None)
+
+    def add_done_callback(self, callback):
+        """Call callback(pending) once done, or now if done already."""
+        with self._lock:
+            if self._callbacks is not None:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def result(self, timeout=None):
+        """Return the description, waiting up to timeout seconds for it.
+
+        Raises multiprocessing.TimeoutError if it is still not rendered, or
+        its own timeout ran out, CancelledError if it was cancelled, and the
+        exception describing the rule raised if that failed."""
+        if self.deadline is not None:
+            remaining = max(self.deadline - time.time(), 0)
+            if timeout is None or remaining < timeout:
+                timeout = remaining
+        self._event.wait(timeout)
+        self._expire()
+        if not self._event.is_set():
+            raise TimeoutError("description not rendered yet")
+        if self._state == FINISHED:
+            return self._value
+        if self._state == CANCELLED:
+            raise CancelledError("description cancelled")
+        raise self._value
+
+
+class _gathered(pending_description):
+    """The descriptions of several pending_descriptions, as a list."""
+
+    def __init__(self, parts):
+        pending_description.__init__(self)
+        self._parts = parts
+        self._remaining = len(parts)
+        self._count_lock = threading.Lock()
+        if not parts:
+            self._finish(FINISHED, [])
+        for part in parts:
+            part.add_done_callback(self._part_done)
+
+    def _part_done(self, part):
+        if part._state != FINISHED:
+            if self._finish(FAILED, part._state == CANCELLED and CancelledError("description cancelled")
+                            or part._value):
+                self.cancel_parts()
+            return
+        with self._count_lock:
+            self._remaining -= 1
+            remaining = self._remaining
+        if not remaining:
+            self._finish(FINISHED, [p._value for p in self._parts])
+
+    def cancel_parts(self):
+        for part in self._parts:
+            part.cancel()
+
+    def cancel(self):
+        """Cancel the descriptions not being rendered yet, and this one."""
+        with self._lock:
+            if self._state != PENDING:
+                return self._state == CANCELLED
+        cancelled = self._finish(CANCELLED, None)
+        self.cancel_parts()
+        return cancelled
+
+
+def gather(parts):
+    """Return a pending_description of the list of the descriptions of
+    parts. It fails as soon as one of them fails or times out, cancelling
+    the others."""
+    return _gathered(list(parts))
+
+
+class describer(object):
+    """Describes rules without blocking the caller.
+
+    executor is used for the rules that are not cheap (see is_cheap);
+    by default, a thread pool of limit threads is created when first needed,
+    and shut down by close(). At most limit descriptions are handed to the
+    executor at once, counting those that timed out while being rendered
+    until they end; the others wait in turn. timeout, in seconds, is the
+    default for describe and describe_many."""
+
+    def __init__(self, executor=None, limit=DEFAULT_LIMIT, timeout=None):
+        if limit < 1:
+            raise ValueError, "limit must be at least 1, not %s" % limit
+        self.limit = limit
+        self.timeout = timeout
+        self._executor = executor
+        self._own_executor = executor is None
+        self._queue = deque()
+        self._running = 0
+        self._deadlines = []
+        # Descriptions done since the deadlines and queue were last pruned.
+        self._stale = 0
+        self._watchdog = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def describe(self, rule, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT, timeout=None):
+        """Return a pending_description of rule. timeout, in seconds, defaults
+        to the describer's; a description not rendered by then fails with
+        multiprocessing.TimeoutError, and is not started if still waiting."""
+        if timeout is None:
+            timeout = self.timeout
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        pending = pending_description(deadline)
+        try:
+            bounds = rrule_bounds(rule)
+        except Exception:
+            # Invalid rules fail just as quickly inline.
+            bounds = None
+        if bounds is None or is_cheap(rule, bounds):
+            # The bounds analysed to tell are the ones the description uses.
+            pending._start()
+            ok, value = _render(rule, date_format, time_format, bounds)
+            pending._finish(ok and FINISHED or FAILED, value)
+            return pending
+        with self._lock:
+            self._queue.append((pending, (rule, date_format, time_format)))
+            if pending.deadline is not None:
+                self._watch(pending)
+        if pending.deadline is not None:
+            pending.add_done_callback(self._forget)
+        self._submit()
+        return pending
+
+    def describe_many(self, rules, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT,
+                      timeout=None):
+        """Return a pending_description of the list of the descriptions of
+        rules, in order; see gather. timeout applies to each rule."""
+        return gather([self.describe(rule, date_format, time_format, timeout) for rule in rules])
+
+    def close(self):
+        """Cancel the descriptions still waiting and shut down the thread pool
+        the describer created, if any."""
+        with self._lock:
+            waiting = [pending for pending, args in self._queue]
+            self._queue.clear()
+            executor, self._executor = self._own_executor and self._executor, None
+        for pending in waiting:
+            pending.cancel()
+        if executor:
+            executor.close()
+            executor.join()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPool(self.limit)
+        return self._executor
+
+    def _submit(self):
+        """Hand waiting descriptions to the executor, up to limit at a time."""
+        while True:
+            with self._lock:
+                if self._running >= self.limit or not self._queue:
+                    return
+                pending, args = self._queue.popleft()
+                if not pending._start():
+                    continue
+                self._running += 1
+                executor = self._get_executor()
+            callback = lambda result, pending=pending: self._done(pending, result)
+            try:
+                executor.apply_async(_render, args, callback=callback)
+            except Exception, e:
+                self._done(pending, (False, e))
+
+    def _done(self, pending, result):
+        ok, value = result
+        with self._lock:
+            self._running -= 1
+        pending._finish(ok and FINISHED or FAILED, value)
+        self._submit()
+
+    def _watch(self, pending):
+        """Time out pending at its deadline even if nobody polls it. Called
+        with the lock held."""
+        heapq.heappush(self._deadlines, (pending.deadline, id(pending), pending))
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._expire_loop, name="human_rrule timeouts")
+            self._watchdog.daemon = True
+            self._watchdog.start()
+        self._changed.notify()
+
+    def _forget(self, pending):
+        """Count pending as done; once more than half the deadlines are of
+        descriptions done, drop those and the done ones still queued."""
+        with self._lock:
+            self._stale += 1
+            if self._stale <= len(self._deadlines) // 2:
+                return
+            self._stale = 0
+            self._deadlines = [entry for entry in self._deadlines if not entry[-1]._event.is_set()]
+            heapq.heapify(self._deadlines)
+            self._queue = deque([entry for entry in self._queue if not entry[0]._event.is_set()])
+            self._changed.notify()
+
+    def _expire_loop(self, now=time.time, heappop=heapq.heappop):
+        # now and heappop are bound early, since a daemon thread can outlive
+        # the module's globals at interpreter shutdown.
+        while True:
+            with self._lock:
+                while True:
+                    wait = None
+                    if self._deadlines:
+                        wait = self._deadlines[0][0] - now()
+                        if wait <= 0:
+                            break
+                    self._changed.wait(wait)
+                expired = []
+                while self._deadlines and self._deadlines[0][0] <= now():
+                    expired.append(heappop(self._deadlines)[-1])
+            for pending in expired:
+                pending._expire()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def _default_describer():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = describer()
+        return _default
+
+
+def describe(rule, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT, timeout=None):
+    """describer.describe, with a describer shared by the whole process."""
+    return _default_describer().describe(rule, date_format, time_format, timeout)
+
+
+def describe_many(rules, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT, timeout=None):
+    """describer.describe_many, with a describer shared by the whole process."""
+    return _default_describer().describe_many(rules, date_format, time_format, timeout)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+occurrence_cursor.py
+
+A cursor over the occurrences of an rrule that resumes where it stopped.
+
+dateutil's after() and between() iterate the rule from DTSTART on every
+call, so polling a long-running series for its next occurrences costs more
+the longer it has run. The cursor instead keeps its iteration of the rule
+and the occurrences it has computed but not yet passed: as the time it is
+asked about moves forward, it only computes the occurrences it has not
+seen. Moving it back to before its position starts the iteration over.
+"""
+
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+from rrule_bounds import rrule_bounds
+
+# How many occurrences remaining() keeps ahead of the cursor when it has to
+# iterate the rest of a rule to count them.
+COUNTED_AHEAD = 64
+
+
+def _iterate_from(rule, skip):
+    """Yield the occurrences of rule after the first skip, iterating it only
+    once the first of them is asked for."""
+    for dt in islice(rule, skip, None):
+        yield dt
+
+
+class occurrence_cursor(object):
+    """Iterates rule forward from the last time it was moved to.
+
+    position is the time the cursor was last moved to, passed the number of
+    occurrences before it. Not safe to share between threads."""
+
+    def __init__(self, rule):
+        self.rule = rule
+        self._total = None
+        self._restart()
+
+    def __getstate__(self):
+        # The iteration of the rule cannot be pickled; an unpickled cursor
+        # starts over.
+        return {'rule': self.rule, '_total': self._total}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._restart()
+
+    def _restart(self):
+        self._iterator = iter(self.rule)
+        self._ahead = deque()
+        self._exhausted = False
+        self.position = None
+        self.passed = 0
+
+    def now(self):
+        """Return the current time, in the rule's time zone if it has one."""
+        return datetime.now(self.rule._tzinfo)
+
+    def _compute(self):
+        """Compute the next occurrence; return False if there is none."""
+        for dt in self._iterator:
+            self._ahead.append(dt)
+            return True
+        self._exhausted = True
+        # Every occurrence has been seen, so their number is known for free.
+        self._total = self.passed + len(self._ahead)
+        return False
+
+    def move(self, after=None):
+        """Move the cursor to after (by default, now): occurrences before it
+        are passed, those at or after it are ahead."""
+        if after is None:
+            after = self.now()
+        if self.position is not None and after < self.position:
+            self._restart()
+        self.position = after
+        ahead = self._ahead
+        while ahead or self._compute():
+            if ahead[0] >= after:
+                break
+            ahead.popleft()
+            self.passed += 1
+
+    def upcoming(self, n, after=None):
+        """Return a list of the next n occurrences at or after after (by
+        default, now)."""
+        self.move(after)
+        while len(self._ahead) < n and self._compute():
+            pass
+        return list(islice(self._ahead, n))
+
+    def between(self, start, end):
+        """Return a list of the occurrences at or after start and before end."""
+        self.move(start)
+        ahead = self._ahead
+        while (not ahead or ahead[-1] < end) and self._compute():
+            pass
+        return [dt for dt in ahead if dt < end]
+
+    def remaining(self, after=None):
+        """Return the number of occurrences at or after after (by default,
+        now), or None if the rule has neither COUNT nor UNTIL.
+
+        The total number of occurrences of a rule with UNTIL is found once:
+        by rrule_bounds where it analyses the rule, otherwise by iterating
+        on from the cursor's position to count the rest, of which only
+        COUNTED_AHEAD are kept."""
+        rule = self.rule
+        if not (rule._count or rule._until):
+            return None
+        self.move(after)
+        if self._total is None:
+            if rule._count and not rule._until:
+                self._total = rule._count
+            else:
+                self._total = rrule_bounds(rule).count()
+                if self._total is None:
+                    self._count_rest()
+        return max(self._total - self.passed, 0)
+
+    def _count_rest(self):
+        """Set _total by counting the occurrences the iteration has not
+        reached, keeping COUNTED_AHEAD of them ahead."""
+        ahead = self._ahead
+        while len(ahead) < COUNTED_AHEAD and self._compute():
+            pass
+        if self._exhausted:
+            return
+        reached = self.passed + len(ahead)
+        n = reached
+        for n, dt in enumerate(self._iterator, reached + 1):
+            pass
+        self._total = n
+        # The iteration was used up counting; a fresh one skips to where it
+        # was, once an occurrence past those ahead is needed.
+        self._iterator = _iterate_from(self.rule, reached)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+persistent_cache.py
+
+A cache of rendered rrule descriptions kept in an SQLite file, so that new
+processes start warm: a worker looks up the rules an earlier worker already
+rendered instead of iterating them again.
+
+Many processes on one host may share the file. It is opened in WAL mode, in
+which readers never wait for a writer, and new descriptions are written a
+batch at a time. Each description is stored with the version of human_rrule,
+of dateutil and of the file's layout it was rendered with, and only looked
+up by processes of that version, so an upgrade never serves stale text; old
+and new workers running side by side during an upgrade each keep their own
+entries. Call prune() once no process uses the old version any more.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+import dateutil
+
+import instrumentation
+from human_rrule2 import human_rrule, DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from rrule_eq import rule_key
+
+try:
+    from human_rrule import __version__ as _library_version
+except ImportError:
+    _library_version = "unknown"
+
+# Bump when the layout of the file or the rendering of descriptions changes
+# without a new release.
+SCHEMA = 2
+
+# The tables of layout 1, which kept one version at a time, for prune().
+SCHEMA_1_TABLES = ("descriptions", "meta")
+
+CACHE_VERSION = "%s/%s/%d" % (_library_version, dateutil.__version__, SCHEMA)
+
+# New descriptions are written this many at a time, or on flush() or close().
+FLUSH_EVERY = 100
+
+# How long to wait for another process's write to finish, in seconds.
+BUSY_TIMEOUT = 10.0
+
+
+def persistent_key(rule, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+    """Return the key rule's description is stored under, which is the same
+    in every process, or None if rule has no such key (its tzinfo has no
+    stable repr)."""
+    text = repr((rule_key(rule), date_format, time_format))
+    if " at 0x" in text:
+        return None
+    return hashlib.sha1(text).hexdigest()
+
+
+class persistent_cache(object):
+    """Caches descriptions by persistent_key in the SQLite file at path.
+
+    hits and misses count lookups by this object since the last clear(). Safe
+    to share between threads; after a fork, the child opens its own
+    connection."""
+
+    def __init__(self, path, version=CACHE_VERSION, flush_every=FLUSH_EVERY):
+        if flush_every < 1:
+            raise ValueError, "flush_every must be at least 1, not %s" % flush_every
+        self.path = path
+        self.version = version
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._pending = {}
+        self.hits = self.misses = 0
+
+    def _connect(self):
+        """Return this process's connection, opening it and creating the
+        table first if need be. Called with the lock held."""
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        # A connection inherited over fork() must not be used, or closed.
+        self._pending = {}
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        connection.text_factory = unicode
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS versioned_descriptions "
+                               "(version TEXT, key TEXT, description TEXT, PRIMARY KEY (version, key))")
+        self._connection, self._pid = connection, os.getpid()
+        return connection
+
+    def lookup(self, rule, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+        """Return the stored description of rule, or None."""
+        key = persistent_key(rule, date_format, time_format)
+        if key is None:
+            return None
+        with self._lock:
+            connection = self._connect()
+            description = self._pending.get(key)
+            if description is None:
+                row = connection.execute("SELECT description FROM versioned_descriptions "
+                                         "WHERE version = ? AND key = ?", (self.version, key)).fetchone()
+                description = row and row[0]
+            if description is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if instrumentation.enabled:
+            instrumentation.count(description is None and "persistent_cache.misses" or "persistent_cache.hits")
+        return description
+
+    def store(self, rule, description, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+        """Store the description of rule, writing it with the next batch."""
+        key = persistent_key(rule, date_format, time_format)
+        if key is None:
+            return
+        with self._lock:
+            self._connect()
+            self._pending[key] = unicode(description)
+            if len(self._pending) >= self.flush_every:
+                self._write()
+
+    def get_description(self, rule, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+        """Return human_rrule(rule).get_description(date_format, time_format),
+        rendering it only if it is not already stored."""
+        description = self.lookup(rule, date_format, time_format)
+        if description is None:
+            description = human_rrule(rule).get_description(date_format, time_format)
+            self.store(rule, description, date_format, time_format)
+        return description
+
+    def _write(self):
+        """Write the pending descriptions. Called with the lock held."""
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO versioned_descriptions VALUES (?, ?, ?)",
+                                         [(self.version, key, description)
+                                          for key, description in self._pending.iteritems()])
+        self._pending = {}
+
+    def flush(self):
+        """Write the descriptions stored since the last write."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._write()
+
+    def close(self):
+        """Write the pending descriptions and close the file; it is opened
+        again if the cache is used after."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._write()
+                self._connection.close()
+            self._connection = None
+
+    def stats(self):
+        """Return the counters and the number of stored descriptions as a dict."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self),
+        }
+
+    def clear(self):
+        """Drop every stored description of this version, for every process
+        sharing the file, and reset the counters."""
+        with self._lock:
+            connection = self._connect()
+            self._pending = {}
+            with connection:
+                connection.execute("DELETE FROM versioned_descriptions WHERE version = ?", (self.version,))
+            self.hits = self.misses = 0
+
+    def prune(self, keep=()):
+        """Drop the descriptions stored by every version but this one and
+        those in keep, and the tables of layout 1, e.g. once an upgrade has
+        reached every process sharing the file. Returns how many were
+        dropped."""
+        versions = [self.version] + list(keep)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                dropped = connection.execute("DELETE FROM versioned_descriptions WHERE version NOT IN (%s)" %
+                                             ", ".join("?" * len(versions)), versions).rowcount
+                for table in SCHEMA_1_TABLES:
+                    connection.execute("DROP TABLE IF EXISTS %s" % table)
+            return dropped
+
+    def __len__(self):
+        with self._lock:
+            connection = self._connect()
+            self._write()
+            return connection.execute("SELECT COUNT(*) FROM versioned_descriptions WHERE version = ?",
+                                      (self.version,)).fetchone()[0]
@@ -0,0 +1,675 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+rrule_bounds.py
+
+Computes the first and last occurrence of an rrule arithmetically instead of
+walking every occurrence the rule generates.
+"""
+
+import calendar
+import types
+from datetime import date, datetime, time, timedelta
+from time import time as _now
+
+import dateutil.rrule
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY
+
+import instrumentation
+
+SECONDS_PER_DAY = 86400
+
+UNIT_SECONDS = {
+    HOURLY: 3600,
+    MINUTELY: 60,
+    SECONDLY: 1,
+}
+
+# Days of the year preceding each month, for common and leap years.
+M365RANGE = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365)
+M366RANGE = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335, 366)
+
+# Marks a boundary that has not been computed yet; None is a valid result.
+_UNSET = object()
+
+# The Gregorian calendar repeats every 400 years, so a rule that selects nothing
+# in 400 * interval years never selects anything.
+CALENDAR_CYCLE_YEARS = 400
+
+# How many candidate periods dateutil scans between checks of a budget's
+# clock while it looks for the next occurrence.
+CLOCK_CHECK_PERIODS = 64
+
+# How many candidate periods a budget with occurrences but not periods lets
+# dateutil scan for each occurrence.
+PERIODS_PER_OCCURRENCE = 1000
+
+
+class budget_exceeded(Exception):
+    """Raised when finding a bound would iterate a rule past its budget."""
+
+
+class iteration_budget(object):
+    """Limits how much of a rule rrule_bounds may iterate to find its first
+    and last occurrences: at most occurrences occurrences, at most periods
+    candidate periods scanned for them, at most seconds of wall-clock time,
+    or any of these together. Rules that are analysed cost nothing.
+
+    A candidate period is one step of the rule's FREQ (a year, a month, ...,
+    a second) that dateutil tries, whether or not it selects anything from
+    it; a rule that selects nothing for millions of hours scans millions of
+    them. periods defaults to PERIODS_PER_OCCURRENCE times occurrences. The
+    clock is checked every CLOCK_CHECK_PERIODS periods."""
+
+    __slots__ = ('occurrences', 'seconds', 'periods')
+
+    def __init__(self, occurrences=None, seconds=None, periods=None):
+        if occurrences is None and seconds is None and periods is None:
+            raise ValueError, "a budget needs occurrences, seconds or periods"
+        if periods is None and occurrences is not None:
+            periods = occurrences * PERIODS_PER_OCCURRENCE
+        self.occurrences = occurrences
+        self.seconds = seconds
+        self.periods = periods
+
+    def __repr__(self):
+        return "iteration_budget(occurrences=%r, seconds=%r, periods=%r)" % (self.occurrences, self.seconds,
+                                                                            self.periods)
+
+    def __reduce__(self):
+        return iteration_budget, (self.occurrences, self.seconds, self.periods)
+
+
+class _watched_iterinfo(dateutil.rrule._iterinfo):
+    """dateutil's per-iteration calendar information, which calls watch each
+    time dateutil asks it for the days of the next candidate period."""
+
+    def __init__(self, rule, watch):
+        dateutil.rrule._iterinfo.__init__(self, rule)
+        self.watch = watch
+
+    def ydayset(self, year, month, day):
+        self.watch()
+        return dateutil.rrule._iterinfo.ydayset(self, year, month, day)
+
+    def mdayset(self, year, month, day):
+        self.watch()
+        return dateutil.rrule._iterinfo.mdayset(self, year, month, day)
+
+    def wdayset(self, year, month, day):
+        self.watch()
+        return dateutil.rrule._iterinfo.wdayset(self, year, month, day)
+
+    def ddayset(self, year, month, day):
+        self.watch()
+        return dateutil.rrule._iterinfo.ddayset(self, year, month, day)
+
+
+def _watched_iter(rule, watch):
+    """Return an iterator over the occurrences of rule that calls watch once
+    for each candidate period dateutil scans, or None if rule does not
+    iterate with dateutil's rrule._iter.
+
+    It runs a copy of rrule._iter whose globals build a _watched_iterinfo
+    in place of dateutil's _iterinfo."""
+    method = getattr(rule.__class__, '_iter', None)
+    if getattr(method, 'im_func', None) is not rr._iter.im_func:
+        return None
+    function = method.im_func
+    scope = dict(function.func_globals)
+    scope['_iterinfo'] = lambda rule: _watched_iterinfo(rule, watch)
+    return types.FunctionType(function.func_code, scope, function.func_name, function.func_defaults,
+                              function.func_closure)(rule)
+
+
+class rrule_bounds(object):
+    """Finds the actual first and last occurrence of an rrule.
+
+    The rule is analysed month by month: for each calendar month the set of
+    selected days is computed from the BY* parts and the interval, and the
+    times of day come from the rule's timeset (or from the step grid for
+    HOURLY, MINUTELY and SECONDLY rules). Rules using BYSETPOS, BYWEEKNO,
+    BYYEARDAY or BYEASTER are not analysed; for those, and for sub-daily
+    rules whose BYHOUR/BYMINUTE/BYSECOND differ from the defaults, the rule
+    is iterated just as dateutil would.
+
+    With an iteration_budget, first() and last() raise budget_exceeded
+    rather than iterate past it; the budget covers both of them.
+    """
+
+    def __init__(self, rrule, budget=None):
+        self.rrule = rrule
+        self.budget = budget
+        self._spent = self._scanned = 0
+        self._deadline = None
+        self._first = self._last = _UNSET
+        self.analytic = self._is_analytic()
+        if self.analytic:
+            self._prepare()
+        if instrumentation.enabled:
+            instrumentation.count(self.analytic and "bounds.analytic" or "bounds.iterated")
+
+    def first(self):
+        """Return the first occurrence of the rule, or None if it has none."""
+        if self._first is _UNSET:
+            start = instrumentation.enabled and instrumentation.clock()
+            self._first = self._find_first()
+            if start:
+                instrumentation.record("bounds.first", instrumentation.clock() - start)
+        return self._first
+
+    def last(self):
+        """Return the last occurrence of the rule, or None if it has none.
+
+        A rule with neither COUNT nor UNTIL ends with the last occurrence
+        dateutil can represent, in the year datetime.MAXYEAR."""
+        if self._last is _UNSET:
+            start = instrumentation.enabled and instrumentation.clock()
+            self._last = self._find_last()
+            if start:
+                instrumentation.record("bounds.last", instrumentation.clock() - start)
+        return self._last
+
+    def found(self):
+        """Return a dict of the bounds found so far, by "first" and "last"."""
+        found = {}
+        if self._first is not _UNSET:
+            found["first"] = self._first
+        if self._last is not _UNSET:
+            found["last"] = self._last
+        return found
+
+    def carry_first(self, other):
+        """Take the first occurrence the rrule_bounds other found, if it did,
+        for a rule that differs from other's only in COUNT or UNTIL."""
+        first = other._first
+        if first is _UNSET or first is None:
+            return
+        until = self.rrule._until
+        if until and first > until:
+            first = None
+        self._first = first
+
+    def _find_first(self):
+        if not self.analytic:
+            for d in self._iterate():
+                if instrumentation.enabled:
+                    instrumentation.count("occurrences_iterated")
+                return d
+            return None
+        until = self.rrule._until
+        if self.subdaily:
+            first = self._first_subdaily()
+        else:
+            first = self._first_daily()
+        if first is None or (until and first > until):
+            return None
+        return first
+
+    def _find_last(self):
+        if not self.analytic:
+            last = None
+            n = 0
+            for n, d in enumerate(self._iterate(), 1):
+                last = d
+            if instrumentation.enabled:
+                instrumentation.count("occurrences_iterated", n)
+            return last
+        first = self.first()
+        if first is None:
+            return None
+        rule = self.rrule
+        bound = rule._until or datetime(9999, 12, 31, 23, 59, 59, tzinfo=rule._tzinfo)
+        if rule._count:
+            nth = self.nth(rule._count, first)
+            if nth is not None and nth <= bound:
+                return nth
+        if self.subdaily:
+            return self._last_subdaily(bound, first)
+        return self._last_daily(bound, first)
+
+    def _iterate(self):
+        if self.budget is None:
+            return iter(self.rrule)
+        return self._iterate_within(self.budget)
+
+    def _iterate_within(self, budget):
+        """Iterate the rule, raising budget_exceeded once the budget is spent."""
+        if budget.seconds is not None and self._deadline is None:
+            self._deadline = _now() + budget.seconds
+        limit = budget.occurrences
+        deadline = self._deadline
+        iterator = None
+        if deadline is not None or budget.periods is not None:
+            iterator = _watched_iter(self.rrule, self._periods_watch(budget))
+        if iterator is None:
+            iterator = iter(self.rrule)
+        for d in iterator:
+            self._spent += 1
+            if limit is not None and self._spent > limit:
+                raise budget_exceeded("iterated more than %d occurrences" % limit)
+            if deadline is not None and _now() > deadline:
+                raise budget_exceeded("iterated for more than %s seconds" % budget.seconds)
+            yield d
+
+    def _periods_watch(self, budget):
+        """Return a function for _watched_iter that counts the periods
+        scanned against budget and checks its clock."""
+        limit = budget.periods
+        deadline = self._deadline
+
+        def watch():
+            self._scanned += 1
+            if limit is not None and self._scanned > limit:
+                raise budget_exceeded("scanned more than %d periods" % limit)
+            if deadline is not None and not self._scanned % CLOCK_CHECK_PERIODS and _now() > deadline:
+                raise budget_exceeded("iterated for more than %s seconds" % budget.seconds)
+        return watch
+
+    def nth(self, n, first=None):
+        """Return the nth (1-based) occurrence of the rule, ignoring UNTIL.
+
+        Returns the last representable occurrence if the rule runs out of
+        years before reaching the nth one."""
+        if first is None:
+            first = self.first()
+        if first is None:
+            return None
+        if self.subdaily:
+            return self._nth_subdaily(n, first)
+        return self._nth_daily(n, first)
+
+    def count(self):
+        """Return the number of occurrences of an analysed rule, found by
+        bisecting nth for the last occurrence, or None if the rule is not
+        analysed."""
+        if not self.analytic:
+            return None
+        last = self.last()
+        if last is None:
+            return 0
+        first = self.first()
+        # nth stops at the last representable occurrence, which is no
+        # earlier than last, so this ends.
+        low, high = 1, 1
+        while self.nth(high, first) < last:
+            low, high = high + 1, high * 2
+        while low < high:
+            middle = (low + high) // 2
+            if self.nth(middle, first) < last:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _is_analytic(self):
+        rule = self.rrule
+        if rule._bysetpos or rule._byweekno or rule._byyearday or rule._byeaster:
+            return False
+        if rule._freq >= HOURLY:
+            dtstart = rule._dtstart
+            defaults = {
+                HOURLY: (None, (dtstart.minute,), (dtstart.second,)),
+                MINUTELY: (None, None, (dtstart.second,)),
+                SECONDLY: (None, None, None),
+            }
+            if (rule._byhour, rule._byminute, rule._bysecond) != defaults[rule._freq]:
+                return False
+            step = rule._interval * UNIT_SECONDS[rule._freq]
+            if self._has_day_filter() and SECONDS_PER_DAY % step:
+                # Filtered days only keep the step grid identical from day to day
+                # when the step divides a day.
+                return False
+        return True
+
+    def _has_day_filter(self):
+        rule = self.rrule
+        return bool(rule._bymonth or rule._byweekday or rule._bynweekday or
+                    rule._bymonthday or rule._bynmonthday)
+
+    def _prepare(self):
+        rule = self.rrule
+        dtstart = rule._dtstart
+        self.subdaily = rule._freq >= HOURLY
+        self.ordinal = dtstart.toordinal()
+        self.month_index = dtstart.year * 12 + dtstart.month - 1
+        self.week_ordinal = self.ordinal - (dtstart.weekday() - rule._wkst) % 7
+        self.weekdays = rule._byweekday and set(rule._byweekday) or None
+        self.limit_year = min(datetime.max.year,
+                              dtstart.year + CALENDAR_CYCLE_YEARS * rule._interval)
+        self._year_nweekdays = {}
+        if self.subdaily:
+            self.step = rule._interval * UNIT_SECONDS[rule._freq]
+            self.start_seconds = dtstart.hour * 3600 + dtstart.minute * 60 + dtstart.second
+            self.offset = self.start_seconds % self.step
+            self.slots = SECONDS_PER_DAY // self.step
+            self.filtered = self._has_day_filter()
+        else:
+            self.timeset = rule._timeset
+            start_day = dtstart.date()
+            self.start_times = [t for t in self.timeset
+                                if datetime.combine(start_day, t) >= dtstart]
+            self.stride = self._stride()
+
+    def _stride(self):
+        """Return the number of days or months between selected days when every
+        selected period holds exactly one day that exists in every period,
+        as ('days', n) or ('months', n). Return None otherwise."""
+        rule = self.rrule
+        freq, interval = rule._freq, rule._interval
+        if rule._bynweekday or rule._bynmonthday:
+            return None
+        if freq == DAILY and not self._has_day_filter():
+            return ('days', interval)
+        if (freq == WEEKLY and rule._byweekday and len(rule._byweekday) == 1 and
+                not (rule._bymonth or rule._bymonthday)):
+            return ('days', 7 * interval)
+        if (freq == MONTHLY and not (rule._bymonth or rule._byweekday) and
+                len(rule._bymonthday) == 1 and rule._bymonthday[0] <= 28):
+            return ('months', interval)
+        if (freq == YEARLY and not rule._byweekday and rule._bymonth and
+                len(rule._bymonth) == 1 and len(rule._bymonthday) == 1):
+            month, day = rule._bymonth[0], rule._bymonthday[0]
+            if day <= calendar.monthrange(2001, month)[1]:
+                return ('months', 12 * interval)
+        return None
+
+    def _advance(self, day, k):
+        """Return the day k strides after day."""
+        kind, n = self.stride
+        if kind == 'days':
+            return date.fromordinal(day.toordinal() + k * n)
+        year, month = divmod(day.year * 12 + day.month - 1 + k * n, 12)
+        return date(year, month + 1, day.day)
+
+    def _nweekdays_of_year(self, year):
+        """Return the day-of-year indexes picked by BYWEEKDAY=+n/-n counted over a whole year."""
+        found = self._year_nweekdays.get(year)
+        if found is None:
+            yearlen = 365 + calendar.isleap(year)
+            jan1 = date(year, 1, 1).weekday()
+            found = set()
+            for wday, n in self.rrule._bynweekday:
+                if n > 0:
+                    i = (n - 1) * 7 + (wday - jan1) % 7
+                else:
+                    last = yearlen - 1
+                    i = last + (n + 1) * 7 - ((jan1 + last) % 7 - wday) % 7
+                if 0 <= i < yearlen:
+                    found.add(i)
+            # Only the most recent year is kept; scans move through years in order.
+            self._year_nweekdays = {year: found}
+        return found
+
+    def month_days(self, year, month):
+        """Return the sorted days of the month the rule selects, without
+        regard to DTSTART, COUNT or UNTIL."""
+        rule = self.rrule
+        freq, interval = rule._freq, rule._interval
+        if rule._bymonth and month not in rule._bymonth:
+            return []
+        if freq == YEARLY and (year - rule._dtstart.year) % interval:
+            return []
+        if freq == MONTHLY and (year * 12 + month - 1 - self.month_index) % interval:
+            return []
+        first_weekday, mdays = calendar.monthrange(year, month)
+        monthdays = None
+        if rule._bymonthday or rule._bynmonthday:
+            monthdays = set(rule._bymonthday)
+            monthdays.update([mdays + 1 + n for n in rule._bynmonthday])
+        if freq == DAILY and interval > 1:
+            first_ordinal = date(year, month, 1).toordinal()
+            days = range(1 + (self.ordinal - first_ordinal) % interval, mdays + 1, interval)
+            if monthdays:
+                days = [d for d in days if d in monthdays]
+        elif monthdays:
+            days = sorted([d for d in monthdays if 1 <= d <= mdays])
+        else:
+            days = range(1, mdays + 1)
+        if freq == WEEKLY and interval > 1:
+            first_ordinal = date(year, month, 1).toordinal() - 1
+            days = [d for d in days
+                    if (first_ordinal + d - self.week_ordinal) // 7 % interval == 0]
+        if self.weekdays:
+            weekdays = self.weekdays
+            days = [d for d in days if (first_weekday + d - 1) % 7 in weekdays]
+        if rule._bynweekday:
+            if freq == MONTHLY or rule._bymonth:
+                picked = set()
+                last_weekday = (first_weekday + mdays - 1) % 7
+                for wday, n in rule._bynweekday:
+                    if n > 0:
+                        d = 1 + (n - 1) * 7 + (wday - first_weekday) % 7
+                    else:
+                        d = mdays + (n + 1) * 7 - (last_weekday - wday) % 7
+                    picked.add(d)
+                days = [d for d in days if d in picked]
+            else:
+                picked = self._nweekdays_of_year(year)
+                before = (calendar.isleap(year) and M366RANGE or M365RANGE)[month - 1] - 1
+                days = [d for d in days if before + d in picked]
+        return days
+
+    def _months_forward(self, year, month, limit=datetime.max.year):
+        """Yield the months from year/month onwards that the rule's period
+        and BYMONTH allow, up to the end of the year limit."""
+        rule = self.rrule
+        freq, interval, bymonth = rule._freq, rule._interval, rule._bymonth
+        first_year = rule._dtstart.year
+        index = year * 12 + month - 1
+        end = limit * 12 + 11
+        step = 1
+        if freq == MONTHLY:
+            index += (self.month_index - index) % interval
+            step = interval
+        while index <= end:
+            year, month = divmod(index, 12)
+            if freq == YEARLY and (year - first_year) % interval:
+                index = (year + (first_year - year) % interval) * 12
+                continue
+            if not bymonth or month + 1 in bymonth:
+                yield year, month + 1
+            index += step
+
+    def _months_backward(self, year, month, stop):
+        """Yield the months from year/month back to the month stop that the
+        rule's period and BYMONTH allow."""
+        rule = self.rrule
+        freq, interval, bymonth = rule._freq, rule._interval, rule._bymonth
+        first_year = rule._dtstart.year
+        index = year * 12 + month - 1
+        end = stop[0] * 12 + stop[1] - 1
+        step = 1
+        if freq == MONTHLY:
+            index -= (index - self.month_index) % interval
+            step = interval
+        while index >= end:
+            year, month = divmod(index, 12)
+            if freq == YEARLY and (year - first_year) % interval:
+                index = (year - (year - first_year) % interval) * 12 + 11
+                continue
+            if not bymonth or month + 1 in bymonth:
+                yield year, month + 1
+            index -= step
+
+    def _valid_days(self, start):
+        """Yield each selected day on or after the date start, in order."""
+        for year, month in self._months_forward(start.year, start.month, self.limit_year):
+            for d in self.month_days(year, month):
+                day = date(year, month, d)
+                if day >= start:
+                    yield day
+
+    def _first_daily(self):
+        if not self.timeset:
+            return None
+        start = self.rrule._dtstart.date()
+        for day in self._valid_days(start):
+            if day == start:
+                times = self.start_times
+            else:
+                times = self.timeset
+            if times:
+                return datetime.combine(day, times[0])
+        return None
+
+    def _nth_daily(self, n, first):
+        timeset = self.timeset
+        per_day = len(timeset)
+        first_day = first.date()
+        if first_day == self.rrule._dtstart.date():
+            first_times = self.start_times
+        else:
+            first_times = timeset
+        if n <= len(first_times):
+            return datetime.combine(first_day, first_times[n - 1])
+        n -= len(first_times)
+        if self.stride:
+            k, i = divmod(n - 1, per_day)
+            try:
+                return datetime.combine(self._advance(first_day, k + 1), timeset[i])
+            except (OverflowError, ValueError):
+                return self._last_daily(datetime.max.replace(tzinfo=first.tzinfo), first)
+        last = None
+        for year, month in self._months_forward(first_day.year, first_day.month):
+            days = [d for d in self.month_days(year, month)
+                    if date(year, month, d) > first_day]
+            if not days:
+                continue
+            if n > len(days) * per_day:
+                n -= len(days) * per_day
+                last = datetime.combine(date(year, month, days[-1]), timeset[-1])
+                continue
+            k, i = divmod(n - 1, per_day)
+            return datetime.combine(date(year, month, days[k]), timeset[i])
+        return last
+
+    def _last_daily(self, bound, first):
+        first_day = first.date()
+        bound_day = bound.date()
+        dtstart = self.rrule._dtstart
+        stop = (first_day.year, first_day.month)
+        for year, month in self._months_backward(bound_day.year, bound_day.month, stop):
+            for d in reversed(self.month_days(year, month)):
+                day = date(year, month, d)
+                if day > bound_day:
+                    continue
+                if day < first_day:
+                    return None
+                for t in reversed(self.timeset):
+                    res = datetime.combine(day, t)
+                    if res <= bound and res >= dtstart:
+                        return res
+        return None
+
+    def _slot(self, day, seconds):
+        hour, rest = divmod(seconds, 3600)
+        minute, second = divmod(rest, 60)
+        return datetime.combine(day, time(hour, minute, second, tzinfo=self.rrule._tzinfo))
+
+    def _first_subdaily(self):
+        dtstart = self.rrule._dtstart
+        if not self.filtered:
+            return dtstart
+        start = dtstart.date()
+        for day in self._valid_days(start):
+            if day == start:
+                return dtstart
+            return self._slot(day, self.offset)
+        return None
+
+    def _nth_subdaily(self, n, first):
+        dtstart = self.rrule._dtstart
+        if not self.filtered:
+            try:
+                return dtstart + timedelta(seconds=(n - 1) * self.step)
+            except OverflowError:
+                return self._last_subdaily(datetime.max.replace(tzinfo=first.tzinfo), first)
+        slots = self.slots
+        first_day = first.date()
+        if first == dtstart:
+            first_seconds = self.start_seconds
+        else:
+            first_seconds = self.offset
+        first_slots = (SECONDS_PER_DAY - first_seconds + self.step - 1) // self.step
+        if n <= first_slots:
+            return self._slot(first_day, first_seconds + (n - 1) * self.step)
+        n -= first_slots
+        last = None
+        for year, month in self._months_forward(first_day.year, first_day.month):
+            days = [d for d in self.month_days(year, month)
+                    if date(year, month, d) > first_day]
+            if not days:
+                continue
+            if n > len(days) * slots:
+                n -= len(days) * slots
+                last = self._slot(date(year, month, days[-1]), self.offset + (slots - 1) * self.step)
+                continue
+            k, i = divmod(n - 1, slots)
+            return self._slot(date(year, month, days[k]), self.offset + i * self.step)
+        return last
+
+    def _last_subdaily(self, bound, first):
+        step = self.step
+        if not self.filtered:
+            delta = bound - first
+            seconds = delta.days * SECONDS_PER_DAY + delta.seconds
+            if seconds < 0:
+                return None
+            return first + timedelta(seconds=seconds // step * step)
+        first_day = first.date()
+        bound_day = bound.date()
+        last_slot = self.offset + (self.slots - 1) * step
+        stop = (first_day.year, first_day.month)
+        for year, month in self._months_backward(bound_day.year, bound_day.month, stop):
+            for d in reversed(self.month_days(year, month)):
+                day = date(year, month, d)
+                if day > bound_day:
+                    continue
+                if day < first_day:
+                    return None
+                seconds = last_slot
+                if day == bound_day:
+                    bound_seconds = bound.hour * 3600 + bound.minute * 60 + bound.second
+                    if bound_seconds < self.offset:
+                        continue
+                    seconds = self.offset + (bound_seconds - self.offset) // step * step
+                res = self._slot(day, seconds)
+                if res >= first:
+                    return res
+                return None
+        return None
+
+
+class known_bounds(object):
+    """The first and last occurrence of a rule, worked out already; stands in
+    for an rrule_bounds."""
+
+    __slots__ = ('_first', '_last')
+
+    def __init__(self, first, last):
+        self._first = first
+        self._last = last
+
+    def first(self):
+        return self._first
+
+    def last(self):
+        return self._last
+
+    def found(self):
+        return {"first": self._first, "last": self._last}
+
+    def __reduce__(self):
+        return known_bounds, (self._first, self._last)
+
+
+def first_occurrence(rrule):
+    """Return the first occurrence of rrule."""
+    return rrule_bounds(rrule).first()
+
+
+def last_occurrence(rrule):
+    """Return the last occurrence of rrule."""
+    return rrule_bounds(rrule).last()
@@ -7,10 +7,6 @@ Created by William Bert on 2011-08-22.
 Copyright (c) 2011 __MyCompanyName__. All rights reserved.
 """
 
-import sys
-import os
-import unittest
-
 from datetime import datetime, time
 
 from dateutil.rrule import rrule as rr
@@ -18,11 +14,142 @@ from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SEC
 from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU, weekdays
 from dateutil.rrule import weekday
 
+# The rrule attributes that decide whether two rules are equal.
+COMPARED_ATTRS = (
+    '_byeaster',
+    '_byhour',
+    '_byminute',
+    '_bymonth',
+    '_bymonthday',
+    '_bynmonthday',
+    '_bynweekday',
+    '_bysecond',
+    '_bysetpos',
+    '_byweekday',
+    '_byweekno',
+    '_byyearday',
+    '_count',
+    '_dtstart',
+    '_freq',
+    '_interval',
+    '_timeset',
+    '_tzinfo',
+    '_until',
+    '_wkst',
+)
+
+TIMESET_INDEX = COMPARED_ATTRS.index('_timeset')
+TZINFO_INDEX = COMPARED_ATTRS.index('_tzinfo')
+
+
+def zone_key(tz):
+    """Return a hashable key for the time zone tz that is the same for
+    separately built instances of one zone.
+
+    dateutil's tzutc, tzoffset and tzfile define __eq__ but not __hash__, so
+    two gettz("America/New_York") hash differently; zones are keyed by their
+    repr instead, which names them (tzfile's file, tzoffset's name and
+    offset)."""
+    if tz is None:
+        return None
+    return repr(tz)
+
+
+def rule_key(rule):
+    """Return a tuple of the compared attributes of rule, for any dateutil rrule.
+    Rules with equal keys are equal rules.
+
+    The times of day in _timeset carry the rule's tzinfo, which dateutil's tzfile
+    cannot give an offset for without a date, so they are keyed without it; the
+    tzinfo itself is keyed by zone_key."""
+    key = [getattr(rule, p) for p in COMPARED_ATTRS]
+    timeset = key[TIMESET_INDEX]
+    if timeset and timeset[0].tzinfo is not None:
+        key[TIMESET_INDEX] = tuple([t.replace(tzinfo=None) for t in timeset])
+    key[TZINFO_INDEX] = zone_key(key[TZINFO_INDEX])
+    return tuple(key)
+
+
+# The parameters of dateutil's rrule.
+RRULE_PARAMS = frozenset(['freq', 'dtstart', 'interval', 'wkst', 'count', 'until', 'bysetpos', 'bymonth',
+                          'bymonthday', 'byyearday', 'byeaster', 'byweekno', 'byweekday', 'byhour',
+                          'byminute', 'bysecond'])
+
+
+# The parameters dateutil fills in from dtstart when they are not given.
+FILLED_PARAMS = frozenset(['bymonth', 'bymonthday', 'byweekday', 'byhour', 'byminute', 'bysecond'])
+
+
+def mark_given(rule, names):
+    """Record that rule was built with the parameters names, so that
+    rrule_params keeps those of them dateutil could have filled in. Returns
+    rule."""
+    rule._given_params = FILLED_PARAMS & frozenset(names)
+    return rule
+
+
+def rrule_params(rule, explicit=False):
+    """Return the parameters, as a dict of keyword arguments, that build rule
+    with dateutil's rrule.
+
+    Unless explicit is True, the day and time of day parameters dateutil
+    fills in from dtstart when they are not given are left out, so that a
+    rule built from the parameters with dtstart, freq or the day parameters
+    changed gets them filled in afresh rather than keeping the old ones.
+
+    dateutil does not record which parameters it filled in. For rules that
+    mark_given was called on (rrule_eq, and rules from replace_rrule and
+    ics_stream do this), only those are left out. For other rules, any that
+    equal what dateutil would fill in are, so that e.g. WEEKLY on MO from a
+    Monday moves with a new dtstart like plain WEEKLY from a Monday does."""
+    dtstart, freq = rule._dtstart, rule._freq
+    given = getattr(rule, '_given_params', None)
+    filled = lambda name: given is None or name not in given
+    byweekday = [wday for wday in rule._byweekday or ()]
+    byweekday += [weekday(wday, n) for wday, n in rule._bynweekday or ()]
+    bymonthday = rule._bymonthday + rule._bynmonthday
+    params = dict(freq=freq, dtstart=dtstart, interval=rule._interval, wkst=rule._wkst,
+                  count=rule._count, until=rule._until, bysetpos=rule._bysetpos,
+                  bymonth=rule._bymonth, bymonthday=bymonthday or None, byyearday=rule._byyearday,
+                  byeaster=rule._byeaster, byweekno=rule._byweekno, byweekday=byweekday or None,
+                  byhour=rule._byhour, byminute=rule._byminute, bysecond=rule._bysecond)
+    if explicit:
+        return params
+    if not (rule._byweekno or rule._byyearday or rule._bynmonthday or rule._bynweekday or
+            rule._byeaster is not None):
+        if (freq == YEARLY and not byweekday and rule._bymonth and rule._bymonthday == (dtstart.day,) and
+                filled('bymonthday')):
+            del params['bymonthday']
+            if rule._bymonth == (dtstart.month,) and filled('bymonth'):
+                del params['bymonth']
+        elif (freq == MONTHLY and not byweekday and rule._bymonthday == (dtstart.day,) and
+                filled('bymonthday')):
+            del params['bymonthday']
+        elif (freq == WEEKLY and not bymonthday and rule._byweekday == (dtstart.weekday(),) and
+                filled('byweekday')):
+            del params['byweekday']
+    for name, default_freq, value in (('byhour', HOURLY, dtstart.hour), ('byminute', MINUTELY, dtstart.minute),
+                                      ('bysecond', SECONDLY, dtstart.second)):
+        if freq < default_freq and params[name] == (value,) and filled(name):
+            del params[name]
+    return params
+
+
+def replace_rrule(rule, **changes):
+    """Return a rule of the same class as rule, built from its parameters
+    (see rrule_params) with those in changes replaced."""
+    unknown = set(changes) - RRULE_PARAMS
+    if unknown:
+        raise TypeError, "not rrule parameters: %s" % ", ".join(sorted(unknown))
+    params = rrule_params(rule)
+    params.update(changes)
+    params['cache'] = rule._cache is not None
+    return mark_given(rule.__class__(**params), [name for name, value in params.items() if value is not None])
+
 
 class rrule_eq(rr): 
     """Wrapper class around an rrule that provides __eq__ and __ne__ methods."""
     
-    # This is for debugging only
     def __init__(self, freq, dtstart=None,
                  interval=1, wkst=None, count=None, until=None, bysetpos=None,
                  bymonth=None, bymonthday=None, byyearday=None, byeaster=None,
@@ -35,95 +162,23 @@ class rrule_eq(rr):
                  byweekno=byweekno, byweekday=byweekday,
                  byhour=byhour, byminute=byminute, bysecond=bysecond,
                  cache=cache) # rrule is an old-style class
-        self._pprint()
+        mark_given(self, [name for name, value in (('bymonth', bymonth), ('bymonthday', bymonthday),
+                                                   ('byweekday', byweekday), ('byhour', byhour),
+                                                   ('byminute', byminute), ('bysecond', bysecond))
+                          if value is not None])
         
     def __eq__(self, other):
-        """Compare two human_rrule instances."""
-        
-        attrs = [
-         '_byeaster',
-         '_byhour',
-         '_byminute',
-         '_bymonth',
-         '_bymonthday',
-         '_bynmonthday',
-         '_bynweekday',
-         '_bysecond',
-         '_bysetpos',
-         '_byweekday',
-         '_byweekno',
-         '_byyearday',
-         '_count',
-         '_dtstart',
-         '_freq',
-         '_interval',
-         '_timeset',
-         '_tzinfo',
-         '_until',
-         '_wkst',
-        ]
-         
-        for p in attrs:
-            if getattr(self, p) != getattr(other, p):
-                return False
-            
-        return True
+        """Compare two human_rrule instances, by their rule_key so that rules
+        that are equal hash equal."""
+        return rule_key(self) == rule_key(other)
         
     def __ne__(self, other):
         return not (self == other)
 
+    def __hash__(self):
+        return hash(rule_key(self))
+
     def _pprint(self):
-        """Temp method"""
-        attrs = [
-         '_byeaster',
-         '_byhour',
-         '_byminute',
-         '_bymonth',
-         '_bymonthday',
-         '_bynmonthday',
-         '_bynweekday',
-         '_bysecond',
-         '_bysetpos',
-         '_byweekday',
-         '_byweekno',
-         '_byyearday',
-         '_count',
-         '_dtstart',
-         '_freq',
-         '_interval',
-         '_timeset',
-         '_tzinfo',
-         '_until',
-         '_wkst',
-        ]
-         
-        for p in attrs:
+        """Print the compared attributes, for debugging."""
+        for p in COMPARED_ATTRS:
             print "%s\t\t%s" % (p, getattr(self, p))
-
-class rrule_eqTests(unittest.TestCase):
-    def setUp(self):
-        pass
-
-    def test_equals(self):
-        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15))
-        r2 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15))
-        self.assertTrue(r1==r2)
-
-        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=MO)
-        r2 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=MO)
-        self.assertTrue(r1==r2)
-
-    def test_not_equals(self):
-        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15))
-        r2 = rrule_eq(MONTHLY, dtstart=datetime(2012, 8, 15))
-        self.assertFalse(r1==r2)
-
-        r2 = rrule_eq(DAILY, dtstart=datetime(2011, 8, 15))
-        self.assertFalse(r1==r2)
-
-        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=MO)
-        r2 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=TU)
-        self.assertFalse(r1==r2)
-        
-if __name__ == '__main__':
-	unittest.main()
\ No newline at end of file
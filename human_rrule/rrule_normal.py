@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+rrule_normal.py
+
+Rewrites rrules into a canonical form, so that rules written differently
+but with the same occurrences compare, hash and cache alike.
+
+rule_key already sees through the defaults dateutil fills in from DTSTART,
+e.g. WEEKLY from a Monday and WEEKLY on MO. normalize goes further: it
+sorts and deduplicates the BY* parts, drops the ones that select every
+month, weekday, day, hour, minute or second without narrowing anything,
+drops a week start that cannot matter, moves DTSTART to the first
+occurrence (or, for WEEKLY rules with BYSETPOS, to the start of its week)
+and UNTIL to the last one. equivalent also treats COUNT and
+UNTIL as the same when they end the rule on the same occurrence.
+"""
+
+from datetime import timedelta
+
+from dateutil.rrule import YEARLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY
+from dateutil.rrule import weekday
+
+from rrule_eq import COMPARED_ATTRS, rrule_params, rule_key
+from rrule_bounds import rrule_bounds, known_bounds, budget_exceeded
+
+ALL_MONTHS = tuple(range(1, 13))
+ALL_WEEKDAYS = tuple(range(7))
+ALL_MONTHDAYS = tuple(range(1, 32))
+ALL_HOURS = tuple(range(24))
+ALL_MINUTES = ALL_SECONDS = tuple(range(60))
+
+COUNT_INDEX = COMPARED_ATTRS.index('_count')
+UNTIL_INDEX = COMPARED_ATTRS.index('_until')
+
+# The occurrence key of every rule without occurrences.
+NO_OCCURRENCES = ()
+
+
+def _sorted(values):
+    if not values:
+        return values
+    return tuple(sorted(set(values)))
+
+
+def _sorted_weekdays(values):
+    """Sort plain weekdays (ints) and nth weekdays (dateutil weekdays)."""
+    if not values:
+        return values
+    keys = sorted(set([(wday.weekday, wday.n or 0) if isinstance(wday, weekday) else (wday, 0)
+                       for wday in values]))
+    return [weekday(wday, n) if n else wday for wday, n in keys]
+
+
+def _day_filters(params, without):
+    """Return True if params select days by something besides without, so
+    that dropping without does not make dateutil fill in days from
+    DTSTART."""
+    return bool([name for name in ('byweekno', 'byyearday', 'bymonthday', 'byweekday', 'byeaster')
+                 if name != without and params[name] is not None and
+                 (params[name] or name in ('byweekday', 'byeaster'))])
+
+
+def _new_start(rule, params, first):
+    """Return the DTSTART to give the normalized rule, whose first
+    occurrence is first.
+
+    dateutil builds the first week of a WEEKLY rule only from DTSTART's
+    weekday on, so BYSETPOS picks from fewer days in it than in the other
+    weeks: such a rule may only start on the first day of a week."""
+    if not (params['freq'] == WEEKLY and params['bysetpos']):
+        return first
+    week_start = first - timedelta(days=(first.weekday() - params['wkst']) % 7)
+    if week_start <= rule._dtstart:
+        return rule._dtstart
+    return week_start
+
+
+def normalize_with_bounds(rule, budget=None):
+    """Return the normalized rule and a known_bounds of its first and last
+    occurrences, or None for the bounds if budget ran out finding them; see
+    normalize."""
+    params = rrule_params(rule, explicit=True)
+    freq = params['freq']
+    for name in ('bysetpos', 'bymonth', 'bymonthday', 'byyearday', 'byeaster', 'byweekno', 'byhour',
+                 'byminute', 'bysecond'):
+        params[name] = _sorted(params[name])
+    params['byweekday'] = _sorted_weekdays(params['byweekday'])
+
+    # Every month is still not redundant for YEARLY rules on nth weekdays,
+    # which BYMONTH makes nth of the month rather than of the year.
+    nth_weekdays = [wday for wday in params['byweekday'] or () if isinstance(wday, weekday)]
+    if (params['bymonth'] == ALL_MONTHS and _day_filters(params, 'bymonth') and
+            not (freq == YEARLY and nth_weekdays)):
+        params['bymonth'] = None
+    if params['byweekday'] == list(ALL_WEEKDAYS) and (freq >= DAILY or _day_filters(params, 'byweekday')):
+        params['byweekday'] = None
+    if params['bymonthday'] == ALL_MONTHDAYS and (freq >= DAILY or _day_filters(params, 'bymonthday')):
+        params['bymonthday'] = None
+    if params['byhour'] == ALL_HOURS and freq >= HOURLY:
+        params['byhour'] = None
+    if params['byminute'] == ALL_MINUTES and freq >= MINUTELY:
+        params['byminute'] = None
+    if params['bysecond'] == ALL_SECONDS and freq == SECONDLY:
+        params['bysecond'] = None
+    # The week start only moves the boundaries of weeks, which matter to
+    # BYWEEKNO and to WEEKLY rules that skip weeks or pick by BYSETPOS.
+    if not params['byweekno'] and not (freq == WEEKLY and (params['interval'] > 1 or params['bysetpos'])):
+        params['wkst'] = 0
+
+    bounds = rrule_bounds(rule, budget)
+    try:
+        first = bounds.first()
+        last = (rule._count or rule._until) and bounds.last() or None
+    except budget_exceeded:
+        bounds = None
+    else:
+        bounds = known_bounds(first, last)
+        if first is not None:
+            params['dtstart'] = _new_start(rule, params, first)
+            if params['until'] is not None:
+                params['until'] = last
+    params['cache'] = rule._cache is not None
+    return rule.__class__(**params), bounds
+
+
+def normalize(rule, budget=None):
+    """Return a rule of the same class as rule, with the same occurrences,
+    in canonical form.
+
+    The defaults dateutil derives from DTSTART are given explicitly, the BY*
+    parts are sorted, redundant ones are dropped, and DTSTART and UNTIL are
+    moved to the first and last occurrences (see _new_start). With an
+    iteration_budget that runs out, DTSTART and UNTIL are left as they are."""
+    return normalize_with_bounds(rule, budget)[0]
+
+
+def normal_key(rule, budget=None):
+    """Return the rule_key of the normalized rule, under which rules written
+    differently share cache entries. The entry then holds the description of
+    the normalized rule, whose wording may differ from the rule's own, e.g.
+    in the order it lists weekdays."""
+    return rule_key(normalize(rule, budget))
+
+
+def occurrence_key(rule, budget=None):
+    """Return a key that is equal for rules with the same occurrences.
+
+    It is the normal_key with COUNT replaced by UNTIL at the last occurrence,
+    so e.g. COUNT=1 and UNTIL at DTSTART have the same key, unlike their
+    descriptions. Rules with no occurrences all have NO_OCCURRENCES."""
+    rule, bounds = normalize_with_bounds(rule, budget)
+    key = list(rule_key(rule))
+    if bounds is not None:
+        if bounds.first() is None:
+            return NO_OCCURRENCES
+        if bounds.last() is not None:
+            key[COUNT_INDEX] = None
+            key[UNTIL_INDEX] = bounds.last()
+    return tuple(key)
+
+
+def equivalent(a, b, budget=None):
+    """Return True if the rules a and b have the same occurrences, as far
+    as their normal forms show: it may miss equivalences the normal form
+    does not capture, but never reports rules that differ as equivalent."""
+    return occurrence_key(a, budget) == occurrence_key(b, budget)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+rule_registry.py
+
+Interns rrules so that every event with an equal rule (see rrule_eq) shares a
+single rule object and a single set of rendered descriptions.
+"""
+
+import sys
+import threading
+import weakref
+
+import instrumentation
+from human_rrule2 import human_rrule, DEFAULT_DATE_FORMAT, DEFAULT_TIME_FORMAT
+from rrule_eq import rule_key
+from rrule_bounds import rrule_bounds
+
+
+def rule_footprint(rule):
+    """Return the approximate number of bytes a dateutil rrule occupies,
+    counting its instance dict and the values and tuples it holds."""
+    size = sys.getsizeof(rule) + sys.getsizeof(rule.__dict__)
+    for value in rule.__dict__.values():
+        size += sys.getsizeof(value)
+        if isinstance(value, tuple):
+            size += sum([sys.getsizeof(item) for item in value])
+    return size
+
+
+class interned_rule(object):
+    """A rule shared by everything that interned an equal rule, along with its
+    descriptions, which are rendered once per format, and its first and last
+    occurrences, found once. Immutable."""
+
+    __slots__ = ('rule', 'key', '_descriptions', '_bounds', '__weakref__')
+
+    def __init__(self, rule, key):
+        object.__setattr__(self, 'rule', rule)
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, '_descriptions', {})
+        object.__setattr__(self, '_bounds', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError, "interned_rule is immutable"
+
+    def get_description(self, date_format=DEFAULT_DATE_FORMAT, time_format=DEFAULT_TIME_FORMAT):
+        formats = (date_format, time_format)
+        description = self._descriptions.get(formats)
+        if description is None:
+            description = human_rrule(self.rule, bounds=self.bounds()).get_description(date_format, time_format)
+            self._descriptions[formats] = description
+        return description
+
+    def bounds(self):
+        """Return the rrule_bounds of the rule, which keeps its first and last
+        occurrences once found."""
+        if self._bounds is None:
+            object.__setattr__(self, '_bounds', rrule_bounds(self.rule))
+        return self._bounds
+
+
+class rule_registry(object):
+    """Hands out one interned_rule per distinct rule.
+
+    Entries are held weakly: once nothing refers to an interned_rule any more it
+    is dropped from the registry. Safe to share between threads."""
+
+    def __init__(self):
+        self._entries = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.requests = self.created = 0
+
+    def intern(self, rule):
+        """Return the interned_rule for rule, registering rule if no equal rule is live."""
+        key = rule_key(rule)
+        with self._lock:
+            self.requests += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = interned_rule(rule, key)
+                self._entries[key] = entry
+                self.created += 1
+                if instrumentation.enabled:
+                    instrumentation.count("rule_registry.misses")
+            elif instrumentation.enabled:
+                instrumentation.count("rule_registry.hits")
+            return entry
+
+    def stats(self):
+        """Return counters and memory estimates as a dict.
+
+        shared is the number of intern() calls answered with an existing rule;
+        bytes_saved estimates the memory those calls saved by not keeping a
+        rule of their own, using the footprint of a live rule."""
+        entries = self._entries.values()
+        footprint = entries and rule_footprint(entries[0].rule) or 0
+        shared = self.requests - self.created
+        return {
+            'live': len(entries),
+            'requests': self.requests,
+            'created': self.created,
+            'shared': shared,
+            'rule_bytes': footprint,
+            'bytes_saved': shared * footprint,
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+vector_bounds.py
+
+Computes the first and last occurrences of many simple rrules at once with
+NumPy array arithmetic, instead of one rrule_bounds per rule.
+
+The simple rules are those with COUNT or UNTIL that select one day every
+fixed number of days or months, at one time of day: DAILY rules without
+BY* day filters, WEEKLY rules on one weekday, MONTHLY rules on one day of
+the month up to the 28th and YEARLY rules on one day of one month, each
+with any interval. Each of their occurrences is then the first one plus a
+whole number of strides, so both bounds follow from a few integer
+operations over the whole batch.
+
+NumPy is optional: without it, batch_bounds leaves every rule to the
+per-rule path.
+"""
+
+import calendar
+from datetime import date
+
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY
+
+from rrule_bounds import known_bounds
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DAYS, MONTHS = "days", "months"
+
+SECONDS_PER_DAY = 86400
+
+# Occurrences are compared as integer keys: days since day 1 * 86400 +
+# seconds for DAYS rules, and (month index * 32 + day of month) * 86400 +
+# seconds for MONTHS rules. Both grow by a fixed amount per stride.
+MONTH_KEY_UNIT = 32 * SECONDS_PER_DAY
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH_MONTH = 1970 * 12
+MAX_DAY_KEY = (date.max.toordinal() + 1) * SECONDS_PER_DAY - 1
+MAX_MONTH_KEY = ((date.max.year * 12 + 11) * 32 + 31) * SECONDS_PER_DAY + SECONDS_PER_DAY - 1
+
+NO_LIMIT = 2 ** 62
+
+
+def _seconds(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def vectorizable(rule):
+    """Return DAYS or MONTHS if batch_bounds can compute the bounds of rule,
+    by the kind of stride between its occurrences, and None otherwise."""
+    freq = rule._freq
+    if freq not in (YEARLY, MONTHLY, WEEKLY, DAILY) or len(rule._timeset) != 1:
+        return None
+    if not (rule._count or rule._until):
+        return None
+    if rule._until and rule._until.tzinfo is not rule._dtstart.tzinfo:
+        return None
+    if (rule._bysetpos or rule._byweekno or rule._byyearday or rule._byeaster or
+            rule._bynweekday or rule._bynmonthday):
+        return None
+    bymonth, byweekday, bymonthday = rule._bymonth, rule._byweekday, rule._bymonthday
+    if freq == DAILY and not (bymonth or byweekday or bymonthday):
+        return DAYS
+    if freq == WEEKLY and byweekday and len(byweekday) == 1 and not (bymonth or bymonthday):
+        return DAYS
+    if freq == MONTHLY and not (bymonth or byweekday) and len(bymonthday) == 1 and bymonthday[0] <= 28:
+        return MONTHS
+    # Not February 29th, which does not come round every interval years.
+    if (freq == YEARLY and not byweekday and bymonth and len(bymonth) == 1 and len(bymonthday) == 1 and
+            bymonthday[0] <= calendar.monthrange(2001, bymonth[0])[1]):
+        return MONTHS
+    return None
+
+
+def _row(rule, shape):
+    """Return the key of the occurrence candidate in dtstart's period, the key
+    of dtstart, the key difference between occurrences, the count and the key
+    of until (or -1) of rule."""
+    dtstart = rule._dtstart
+    time_of_day = _seconds(rule._timeset[0])
+    start_seconds = _seconds(dtstart)
+    if shape == DAYS:
+        start_day = dtstart.toordinal()
+        if rule._freq == DAILY:
+            day, step = start_day, rule._interval
+        else:
+            week = start_day - (dtstart.weekday() - rule._wkst) % 7
+            day, step = week + (rule._byweekday[0] - rule._wkst) % 7, 7 * rule._interval
+        candidate = day * SECONDS_PER_DAY + time_of_day
+        start = start_day * SECONDS_PER_DAY + start_seconds
+        period = step * SECONDS_PER_DAY
+        until = rule._until and rule._until.toordinal() * SECONDS_PER_DAY + _seconds(rule._until)
+    else:
+        start_month = dtstart.year * 12 + dtstart.month - 1
+        if rule._freq == MONTHLY:
+            month, step = start_month, rule._interval
+        else:
+            month, step = dtstart.year * 12 + rule._bymonth[0] - 1, 12 * rule._interval
+        candidate = (month * 32 + rule._bymonthday[0]) * SECONDS_PER_DAY + time_of_day
+        start = (start_month * 32 + dtstart.day) * SECONDS_PER_DAY + start_seconds
+        period = step * MONTH_KEY_UNIT
+        until = rule._until
+        if until:
+            until = ((until.year * 12 + until.month - 1) * 32 + until.day) * SECONDS_PER_DAY + _seconds(until)
+    return candidate, start, period, rule._count or 0, until or -1
+
+
+def _to_datetimes(keys, months):
+    """Convert keys to datetime objects."""
+    days, seconds = numpy.divmod(keys, SECONDS_PER_DAY)
+    month_index, day_of_month = numpy.divmod(days, 32)
+    month_days = ((month_index - EPOCH_MONTH).astype("datetime64[M]").astype("datetime64[D]").astype(numpy.int64) +
+                  day_of_month - 1)
+    days = numpy.where(months, month_days, days - EPOCH_ORDINAL)
+    stamps = days.astype("datetime64[D]") + seconds.astype("timedelta64[s]")
+    return stamps.astype(object).tolist()
+
+
+def batch_bounds(rules):
+    """Return, for each of rules, a known_bounds of its first and last
+    occurrences if it is vectorizable, or None if its bounds have to be found
+    with rrule_bounds, e.g. by human_rrule(rule, bounds=None). Rules whose
+    occurrences would run past datetime.max also get None."""
+    rules = list(rules)
+    found = [None] * len(rules)
+    if numpy is None:
+        return found
+    indexes, rows, shapes = [], [], []
+    for i, rule in enumerate(rules):
+        shape = vectorizable(rule)
+        if shape:
+            indexes.append(i)
+            rows.append(_row(rule, shape))
+            shapes.append(shape == MONTHS)
+    if not rows:
+        return found
+    candidate, start, period, count, until = numpy.array(rows, dtype=numpy.int64).T
+    months = numpy.array(shapes)
+    max_key = numpy.where(months, MAX_MONTH_KEY, MAX_DAY_KEY)
+
+    # The first occurrence is the candidate in dtstart's period, unless that
+    # comes before dtstart.
+    first_k = (candidate < start).astype(numpy.int64)
+    last_k = numpy.where(count > 0, first_k + count - 1, NO_LIMIT)
+    last_k = numpy.minimum(last_k, numpy.where(until >= 0, (until - candidate) // period, NO_LIMIT))
+    last_k = numpy.minimum(last_k, (max_key - candidate) // period + 1)
+    occurs = last_k >= first_k
+    last_k = numpy.where(occurs, last_k, first_k)
+    first_key = candidate + first_k * period
+    last_key = candidate + last_k * period
+    in_range = last_key <= max_key
+    first_key = numpy.where(in_range, first_key, candidate)
+    last_key = numpy.where(in_range, last_key, candidate)
+
+    firsts = _to_datetimes(first_key, months)
+    lasts = _to_datetimes(last_key, months)
+    for i, first, last, occurred, computed in zip(indexes, firsts, lasts, occurs.tolist(), in_range.tolist()):
+        if not computed:
+            continue
+        if not occurred:
+            found[i] = known_bounds(None, None)
+            continue
+        tzinfo = rules[i]._tzinfo
+        if tzinfo is not None:
+            first, last = first.replace(tzinfo=tzinfo), last.replace(tzinfo=tzinfo)
+        found[i] = known_bounds(first, last)
+    return found
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+wire_format.py
+
+Encodes human_rrule instances and description_snapshots as compact byte
+strings for sending between processes, e.g. over a multiprocessing queue or
+a task broker, in place of pickling them.
+
+An encoded human_rrule carries its rule's parameters, the keys built so far
+and the bounds found so far, so that from_bytes rebuilds it without
+rendering or iterating anything. The bytes are a version byte followed by a
+marshal-ed tuple of plain values: datetimes become integers, weekdays
+integers or pairs, and time zones a pickle, sent once per value. Like
+pickle, from_bytes must only be given bytes from a trusted source.
+"""
+
+import cPickle
+import marshal
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import weekday
+
+from human_rrule2 import human_rrule
+from description_snapshot import description_snapshot
+from rrule_eq import rrule_eq, rrule_params, mark_given, zone_key
+
+WIRE_VERSION = 1
+
+# marshal's own format version; 2 is the newest Python 2 reads.
+MARSHAL_VERSION = 2
+
+RULE, SNAPSHOT = 0, 1
+
+# The rule classes that can be encoded, by code.
+RULE_CLASSES = (rr, rrule_eq)
+
+# The rrule parameters besides dtstart, in the order they are encoded.
+PARAMS = ('freq', 'interval', 'wkst', 'count', 'until', 'bysetpos', 'bymonth', 'bymonthday', 'byyearday',
+          'byeaster', 'byweekno', 'byweekday', 'byhour', 'byminute', 'bysecond')
+
+KEYS = ("interval", "occurrence", "period", "begin_time", "terminal", "timezone")
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = 10 ** 6
+
+# Time zones and their pickles, both ways, so that each zone is pickled once
+# and decoded datetimes share their zone objects. Zones are keyed by
+# rrule_eq.zone_key, so that separately built instances of one zone, as
+# gettz gives, share an entry; each memo starts over once it holds
+# TZ_MEMO_SIZE of them.
+TZ_MEMO_SIZE = 256
+
+_tz_pickles = {}
+_tz_objects = {}
+
+
+def _memoize(memo, key, value):
+    if len(memo) >= TZ_MEMO_SIZE:
+        memo.clear()
+    memo[key] = value
+    return value
+
+
+def _pickle_tz(tz):
+    if tz is None:
+        return None
+    key = zone_key(tz)
+    data = _tz_pickles.get(key)
+    if data is None:
+        data = _memoize(_tz_pickles, key, cPickle.dumps(tz, 2))
+        if data not in _tz_objects:
+            _memoize(_tz_objects, data, tz)
+    return data
+
+
+def _unpickle_tz(data):
+    if data is None:
+        return None
+    tz = _tz_objects.get(data)
+    if tz is None:
+        tz = _memoize(_tz_objects, data, cPickle.loads(data))
+    return tz
+
+
+def _encode_datetime(dt, tz):
+    """Encode dt, whose zone is usually tz, which is sent once for all of them."""
+    if dt is None:
+        return None
+    delta = dt.replace(tzinfo=None) - _EPOCH
+    value = (delta.days * 86400 + delta.seconds) * _ONE_SECOND + delta.microseconds
+    if dt.tzinfo is not tz:
+        return (value, _pickle_tz(dt.tzinfo))
+    return value
+
+
+def _decode_datetime(value, tz):
+    if value is None:
+        return None
+    if isinstance(value, tuple):
+        value, tz = value[0], _unpickle_tz(value[1])
+    seconds, microseconds = divmod(value, _ONE_SECOND)
+    dt = _EPOCH + timedelta(seconds=seconds, microseconds=microseconds)
+    if tz is not None:
+        dt = dt.replace(tzinfo=tz)
+    return dt
+
+
+def _encode_rule(hr):
+    rule = hr.rrule
+    if rule.__class__ not in RULE_CLASSES:
+        raise ValueError, "cannot encode a rule of class %s" % rule.__class__.__name__
+    items, found, lazy, approximate = hr._get_state()
+    tz = rule._tzinfo
+    params = rrule_params(rule)
+    params["until"] = _encode_datetime(params["until"], tz)
+    if params.get("byweekday"):
+        # Plain weekdays are ints, nth weekdays dateutil weekday objects.
+        params["byweekday"] = tuple([(wday.weekday, wday.n) if isinstance(wday, weekday) else wday
+                                     for wday in params["byweekday"]])
+    items = dict(items)
+    built = 0
+    values = []
+    for i, key in enumerate(KEYS):
+        if key in items:
+            built |= 1 << i
+            values.append(items[key])
+    bounds = 0
+    if "first" in found:
+        bounds |= 1
+    if "last" in found:
+        bounds |= 2
+    return (RULE, RULE_CLASSES.index(rule.__class__), _pickle_tz(tz), _encode_datetime(rule._dtstart, tz),
+            tuple([params.get(name, False) for name in PARAMS]),
+            bounds, _encode_datetime(found.get("first"), tz), _encode_datetime(found.get("last"), tz),
+            built, tuple(values), lazy, approximate)
+
+
+def _decode_rule(payload):
+    (kind, class_code, tz, dtstart, params, bounds, first, last, built, values, lazy, approximate) = payload
+    tz = _unpickle_tz(tz)
+    # Parameters rrule_params left out, to be filled in from dtstart, are False.
+    params = dict([(name, value) for name, value in zip(PARAMS, params) if value is not False])
+    params["dtstart"] = _decode_datetime(dtstart, tz)
+    params["until"] = _decode_datetime(params.get("until"), tz)
+    if params.get("byweekday"):
+        params["byweekday"] = [weekday(*wday) if isinstance(wday, tuple) else wday
+                               for wday in params["byweekday"]]
+    rule = mark_given(RULE_CLASSES[class_code](**params), [name for name, value in params.items()
+                                                             if value is not None])
+    found = {}
+    if bounds & 1:
+        found["first"] = _decode_datetime(first, tz)
+    if bounds & 2:
+        found["last"] = _decode_datetime(last, tz)
+    values = iter(values)
+    items = [(key, values.next()) for i, key in enumerate(KEYS) if built & (1 << i)]
+    return human_rrule._from_state(rule, items, found, lazy, approximate)
+
+
+def to_bytes(description):
+    """Return the human_rrule or description_snapshot description encoded
+    as a byte string."""
+    if isinstance(description, human_rrule):
+        payload = _encode_rule(description)
+    elif isinstance(description, description_snapshot):
+        tz = description.start and description.start.tzinfo
+        seen_from = description.seen_from
+        if seen_from is not None:
+            seen_from = (seen_from[0], _encode_datetime(seen_from[1], tz), _encode_datetime(seen_from[2], tz))
+        payload = (SNAPSHOT, description._fragments, _pickle_tz(tz), _encode_datetime(description.start, tz),
+                   _encode_datetime(description.until, tz), seen_from)
+    else:
+        raise ValueError, "cannot encode %r" % (description,)
+    return chr(WIRE_VERSION) + marshal.dumps(payload, MARSHAL_VERSION)
+
+
+def from_bytes(data):
+    """Return the human_rrule or description_snapshot encoded in the byte
+    string data by to_bytes."""
+    if not data or ord(data[0]) != WIRE_VERSION:
+        raise ValueError, "not wire format version %d data" % WIRE_VERSION
+    payload = marshal.loads(data[1:])
+    if payload[0] == RULE:
+        return _decode_rule(payload)
+    kind, fragments, tz, start, until = payload[:5]
+    tz = _unpickle_tz(tz)
+    # Snapshots seen from another zone carry it last.
+    seen_from = len(payload) > 5 and payload[5] or None
+    if seen_from is not None:
+        seen_from = (seen_from[0], _decode_datetime(seen_from[1], tz), _decode_datetime(seen_from[2], tz))
+    return description_snapshot(fragments, _decode_datetime(start, tz), _decode_datetime(until, tz), seen_from)
@@ -8,6 +8,7 @@ setup(name='human_rrule',
       author_email="william.bert@gmail.com",
       packages=['human_rrule'],
       package_dir={'human_rrule': 'human_rrule'},
+      scripts=['scripts/human-rrule'],
       requires=['dateutil(>=1.5, <2.0)'],
       provides=['human_rrule'],
       )
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_batch.py
+
+Tests for human_rrule.batch.
+"""
+
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import FR, SU
+
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule import batch
+from human_rrule.batch import idescribe_many, describe_many
+
+
+class batchTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10),
+            rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=10),
+            rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10),
+            rr(MONTHLY, interval=2, byweekday=SU(1), dtstart=datetime(2011, 8, 15, 21, 0, 0), until=datetime(2012, 8, 15)),
+            rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=10),
+        ]
+        self.expected = [human_rrule(rule).get_description("%m/%d/%Y") for rule in self.rules]
+
+    def test_in_process(self):
+        rendered = []
+        describe_chunk = batch._describe_chunk
+        def counting(args):
+            rendered.extend(args[0])
+            return describe_chunk(args)
+        batch._describe_chunk = counting
+        try:
+            self.assertEqual(describe_many(self.rules, "%m/%d/%Y", workers=1, chunksize=2), self.expected)
+        finally:
+            batch._describe_chunk = describe_chunk
+        self.assertEqual(len(rendered), 3)
+
+    def test_pool(self):
+        descriptions = idescribe_many(iter(self.rules * 50), "%m/%d/%Y", workers=2, chunksize=1)
+        self.assertEqual(list(descriptions), self.expected * 50)
+
+    def test_errors(self):
+        rules = [self.rules[0], rr("a", dtstart=datetime(2011, 8, 15), count=2), self.rules[1]]
+        self.assertRaises(Exception, describe_many, rules, workers=1)
+        descriptions = describe_many(rules, "%m/%d/%Y", workers=1, errors="return")
+        self.assertEqual(descriptions[0::2], self.expected[:2])
+        self.assertTrue(isinstance(descriptions[1], Exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_catalogs.py
+
+Tests for human_rrule.catalogs.
+"""
+
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY
+from dateutil.rrule import MO, WE, FR
+
+from human_rrule.catalogs import _catalogs, _registered, rule_parts, analyse, register_catalog, get_catalog, \
+    available_locales
+
+
+class catalogsTests(unittest.TestCase):
+    def setUp(self):
+        self.monthly = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        self.weekly = rr(WEEKLY, interval=2, byweekday=(WE, MO), dtstart=datetime(2011, 8, 15, 9),
+                         until=datetime(2011, 12, 31))
+        self.yearly = rr(YEARLY, bymonth=(3, 9), bymonthday=-1, interval=3, dtstart=datetime(2011, 8, 15), count=1)
+
+    def describe(self, locale, rule, until=None):
+        return get_catalog(locale).describe(analyse(rule), rule[0], until)
+
+    def test_analyse(self):
+        self.assertEqual(analyse(self.weekly), rule_parts("week", 2, (0, 2), (), (), (), (), None, True,
+                                                          (), (), (), (), ()))
+        self.assertEqual(analyse(self.monthly).nweekdays, ((4, 3),))
+
+    def test_english(self):
+        self.assertEqual(self.describe("en", self.monthly),
+                         u"every month on the third Friday starting at 12:01 AM August 19, 2011 ten times")
+        self.assertEqual(self.describe("en_US", self.weekly, datetime(2011, 12, 28, 9)),
+                         u"every other week on Monday and Wednesday starting at 09:00 AM August 15, 2011 "
+                         u"until 09:00 AM December 28, 2011")
+        self.assertEqual(self.describe("en", self.yearly),
+                         u"every third year on the last day of the month in March and September "
+                         u"starting at 12:00 AM September 30, 2011 once")
+
+    def test_locales(self):
+        self.assertEqual(self.describe("es", self.monthly),
+                         u"cada mes el tercer viernes a partir del 19 de agosto de 2011 a las 00:01, 10 veces")
+        self.assertEqual(self.describe("fr", self.weekly, datetime(2011, 12, 28, 9)),
+                         u"toutes les 2 semaines le lundi et mercredi à partir du 15 août 2011 à 09:00 "
+                         u"jusqu'au 28 décembre 2011 à 09:00")
+        self.assertEqual(self.describe("de-AT", self.monthly),
+                         u"jeden Monat am dritten Freitag ab 19. August 2011, 00:01 Uhr, 10 Mal")
+        self.assertTrue(set(["en", "es", "fr", "de"]) <= set(available_locales()))
+        self.assertRaises(ValueError, get_catalog, "xx")
+
+    def test_rare_parts(self):
+        setpos = rr(MONTHLY, byweekday=(MO, WE, FR), bysetpos=-1, dtstart=datetime(2011, 8, 15, 9), count=3)
+        self.assertEqual(self.describe("en", setpos),
+                         u"every month on Monday, Wednesday and Friday taking the last of each month "
+                         u"starting at 09:00 AM August 31, 2011 three times")
+        hours = rr(DAILY, byhour=(9, 17), dtstart=datetime(2011, 8, 15, 9), count=4)
+        self.assertEqual(self.describe("de", hours), u"jeden Tag um 9 und 17 Uhr ab 15. August 2011, 09:00 Uhr, 4 Mal")
+        weeks = rr(YEARLY, byweekno=(1, 20), byweekday=MO, dtstart=datetime(2011, 8, 15, 9), count=4)
+        self.assertEqual(self.describe("es", weeks),
+                         u"cada año el lunes en la semana 1 y 20 del año a partir del 02 de enero de 2012 a las "
+                         u"09:00, 4 veces")
+        yeardays = rr(YEARLY, byyearday=-1, dtstart=datetime(2011, 8, 15, 9), count=4)
+        self.assertEqual(self.describe("fr", yeardays),
+                         u"chaque an le dernier jour de l'année à partir du 31 décembre 2011 à 09:00 4 fois")
+        easter = rr(YEARLY, byeaster=(0, -2), dtstart=datetime(2011, 8, 15, 9), count=3)
+        self.assertEqual(self.describe("en", easter),
+                         u"every year on the second day before Easter Sunday and Easter Sunday "
+                         u"starting at 09:00 AM April 06, 2012 three times")
+        # The hour filled in from DTSTART is not named.
+        self.assertEqual(analyse(rr(DAILY, byhour=9, dtstart=datetime(2011, 8, 15, 9))).hours, ())
+
+    def test_register(self):
+        class pirate(object):
+            WEEKDAYS = [u"Moonday", u"Tuesday", u"Wednesday", u"Thursday", u"Fryday", u"Saturday", u"Sunday"]
+            MONTHS = get_catalog("en").months
+            UNITS = {"month": (u"moon", u"moons")}
+            PATTERNS = dict(get_catalog("en").patterns, every=u"each {unit}, arr")
+            DATE_FORMAT, TIME_FORMAT = "%d %B %Y", "%H:%M"
+            cardinal = staticmethod(str)
+            ordinal = staticmethod(lambda n: "%d." % n)
+        register_catalog("en_PIRATE", pirate)
+        try:
+            self.assertEqual(self.describe("en-PIRATE", self.monthly),
+                             u"each moon, arr on the 3. Fryday starting at 00:01 19 August 2011 10 times")
+            # Parts the catalog cannot word are not left out.
+            del pirate.PATTERNS["setpos"]
+            register_catalog("en_PIRATE", pirate)
+            self.assertRaises(ValueError, self.describe, "en-PIRATE",
+                              rr(MONTHLY, byweekday=(MO, FR), bysetpos=1, dtstart=datetime(2011, 8, 15), count=3))
+            pirate.SENTENCE = ("interval", "days", "start")
+            register_catalog("en_PIRATE", pirate)
+            self.assertRaises(ValueError, self.describe, "en-PIRATE", self.monthly)
+        finally:
+            _registered.pop("en_PIRATE")
+            _catalogs.pop("en_PIRATE")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_cli.py
+
+Tests for human_rrule.cli.
+"""
+
+import json
+import unittest
+from StringIO import StringIO
+
+from human_rrule.cli import main
+
+
+class cliTests(unittest.TestCase):
+    def setUp(self):
+        self.input = "\n".join([
+            "DTSTART:19970902T090000;RRULE:FREQ=DAILY;INTERVAL=10;COUNT=5",
+            '{"id": 7, "rrule": "RRULE:FREQ=MONTHLY;BYDAY=3FR;COUNT=10", "dtstart": "20110815T000100"}',
+            "",
+            "RRULE:FREQ=WEEKLY",
+            "{not json",
+            "DTSTART:19970902T090000;RRULE:FREQ=MONTHLY;INTERVAL=x;COUNT=5",
+            "DTSTART:19970902T090000;RRULE:FREQ=DAILY;INTERVAL=10;COUNT=5",
+        ]) + "\n"
+
+    def run_main(self, *argv):
+        stdout, stderr = StringIO(), StringIO()
+        status = main(list(argv), StringIO(self.input), stdout, stderr)
+        return status, [json.loads(line) for line in stdout.getvalue().splitlines()], stderr.getvalue()
+
+    def test_main(self):
+        status, output, stats = self.run_main("--workers", "1", "--chunk-size", "2")
+        self.assertEqual(status, 1)
+        self.assertEqual(len(output), 6)
+        self.assertEqual(output[0]["rrule"], "DTSTART:19970902T090000;RRULE:FREQ=DAILY;INTERVAL=10;COUNT=5")
+        self.assertTrue(output[0]["description"].endswith("five times"))
+        self.assertEqual(output[1]["id"], 7)
+        self.assertEqual(output[1]["description"],
+                         u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times")
+        self.assertTrue(output[2]["error"].startswith("ValueError: no DTSTART"))
+        self.assertEqual(output[3]["input"], "{not json")
+        self.assertTrue("error" in output[4])
+        self.assertEqual(output[5], output[0])
+        self.assertEqual(stats, "")
+
+    def test_options(self):
+        status, output, stats = self.run_main("--workers", "2", "--date-format", "%m/%d/%Y",
+                                              "--time-format", "%H:%M", "--stats")
+        self.assertEqual(output[1]["description"], u"each third Friday of the month starting at 00:01 08/19/2011 ten times")
+        self.assertTrue(stats.startswith("records: 6 (3 errors)"))
+        self.assertTrue("p99" in stats)
+
+    def test_field_types(self):
+        self.input = "\n".join([
+            '{"rrule": 5}',
+            '{"rrule": "RRULE:FREQ=WEEKLY;COUNT=2", "dtstart": 20110815}',
+            '{"rrule": "RRULE:FREQ=WEEKLY;COUNT=2", "dtstart": "20110815T090000"}',
+        ])
+        status, output, stats = self.run_main("--workers", "1")
+        self.assertEqual(status, 1)
+        self.assertEqual(output[0]["error"], "ValueError: the rrule field must be a string, not int")
+        self.assertEqual(output[1]["error"], "ValueError: the dtstart field must be a string, not int")
+        self.assertTrue(output[2]["description"].endswith("two times"))
+
+if __name__ == '__main__':
+    unittest.main()
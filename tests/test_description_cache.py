@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_description_cache.py
+
+Tests for human_rrule.description_cache.
+"""
+
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import FR
+
+from human_rrule.description_cache import description_cache
+
+
+class description_cacheTests(unittest.TestCase):
+    def setUp(self):
+        self.monthly = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        self.weekly = rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=10)
+
+    def test_hits(self):
+        cache = description_cache()
+        correct = u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times"
+        self.assertEqual(cache.get_description(self.monthly), correct)
+        same = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        self.assertEqual(cache.get_description(same), correct)
+        cache.get_description(same, time_format="%H:%M")
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+
+    def test_eviction(self):
+        cache = description_cache(maxsize=2)
+        cache.get_description(self.monthly)
+        cache.get_description(self.weekly)
+        cache.get_description(self.monthly)
+        cache.get_description(self.weekly, "%m/%d/%Y")
+        self.assertEqual(cache.evictions, 1)
+        cache.get_description(self.monthly)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2})
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 2})
+
+if __name__ == '__main__':
+    unittest.main()
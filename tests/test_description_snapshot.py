@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_description_snapshot.py
+
+Tests for human_rrule.description_snapshot.
+"""
+
+import pickle
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, SECONDLY
+from dateutil.rrule import MO, FR, SU
+from dateutil.tz import gettz
+
+import human_rrule.description_snapshot as description_snapshot_module
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.description_snapshot import description_snapshot
+
+
+class description_snapshotTests(unittest.TestCase):
+    def setUp(self):
+        dtstart = datetime(2011, 8, 15, 9)
+        self.rules = [
+            rr(MONTHLY, byweekday=FR(3), dtstart=dtstart, count=10),
+            rr(MONTHLY, interval=2, byweekday=SU(1), dtstart=dtstart, until=datetime(2012, 8, 15)),
+            rr(WEEKLY, byweekday=MO, dtstart=dtstart),
+            rr(YEARLY, bymonth=3, bymonthday=1, dtstart=dtstart.replace(tzinfo=gettz("America/New_York")), count=3),
+            rr(DAILY, dtstart=dtstart, until=datetime(2011, 9, 1)),
+            rr(HOURLY, interval=3, dtstart=dtstart, count=2),
+            rr(SECONDLY, bymonthday=2, dtstart=dtstart, count=2),
+        ]
+
+    def test_same_text(self):
+        for rule in self.rules:
+            hr = human_rrule(rule)
+            snapshot = hr.snapshot()
+            self.assertEqual(snapshot.get_description(), hr.get_description())
+            self.assertEqual(snapshot.get_description("%m/%d/%Y", "%H:%M"), hr.get_description("%m/%d/%Y", "%H:%M"))
+
+    def test_compact(self):
+        first = human_rrule(self.rules[0]).snapshot()
+        other = human_rrule(rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2012, 1, 1), count=10)).snapshot()
+        self.assertTrue(first._fragments is other._fragments)
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertRaises(AttributeError, setattr, first, "start", None)
+        self.assertEqual(first["occurrence"], human_rrule(self.rules[0])["occurrence"])
+        self.assertRaises(KeyError, lambda: human_rrule(self.rules[2]).snapshot()["terminal"])
+
+    def test_shared_bounded(self):
+        limit = description_snapshot_module.SHARED_FRAGMENTS
+        description_snapshot_module.SHARED_FRAGMENTS = 5
+        try:
+            first = human_rrule(rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=2)).snapshot()
+            for count in range(3, 13):
+                human_rrule(rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=count)).snapshot()
+            self.assertTrue(len(description_snapshot_module._shared_fragments) <= 5)
+            again = human_rrule(rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=2)).snapshot()
+        finally:
+            description_snapshot_module.SHARED_FRAGMENTS = limit
+        # The first wording was dropped, so the two no longer share it.
+        self.assertFalse(again._fragments is first._fragments)
+        self.assertEqual(again, first)
+        self.assertEqual(hash(again), hash(first))
+
+    def test_pickle(self):
+        snapshot = human_rrule(self.rules[1]).snapshot()
+        copy = pickle.loads(pickle.dumps(snapshot, 2))
+        self.assertEqual(copy, snapshot)
+        self.assertEqual(hash(copy), hash(snapshot))
+        self.assertTrue(copy._fragments is snapshot._fragments)
+        self.assertEqual(copy.get_description(), snapshot.get_description())
+        self.assertNotEqual(copy, human_rrule(self.rules[0]).snapshot())
+
+if __name__ == '__main__':
+    unittest.main()
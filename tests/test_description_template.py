@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_description_template.py
+
+Tests for human_rrule.description_template.
+"""
+
+import unittest
+from datetime import datetime
+
+from human_rrule.description_template import compile_format, compile_template
+
+
+class description_templateTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_format_datetime(self):
+        dts = [datetime(2011, 8, 15, 0, 1), datetime(2012, 2, 29, 12, 0, 5), datetime(1999, 12, 31, 23, 59, 59)]
+        formats = ["%I:%M %p %B %d, %Y", "%H:%M %m/%d/%Y", "%H:%M:%S %p %a %b %y", "%A %d%% %j", "no directives"]
+        for datetime_format in formats:
+            format_datetime = compile_format(datetime_format)
+            for dt in dts:
+                self.assertEqual(format_datetime(dt), dt.strftime(datetime_format))
+
+    def test_render(self):
+        hr = {"interval": u"each", "occurrence": u" first Sunday", "period": "of the month",
+              "terminal": "ten times", "timezone": None}
+        hr = type('fake_human_rrule', (dict,), {'_get_starttime': lambda self: datetime(2011, 10, 2, 21)})(hr)
+        self.assertEqual(compile_template().render(hr),
+                         u"each first Sunday of the month starting at 09:00 PM October 02, 2011 ten times")
+        template = compile_template("%m/%d/%Y", "%H:%M", ("occurrence", "begin_time"))
+        self.assertEqual(template.render(hr), u"first Sunday starting at 21:00 10/02/2011")
+        self.assertTrue(template is compile_template("%m/%d/%Y", "%H:%M", ("occurrence", "begin_time")))
+        # Fragments joined from empty parts hold runs of spaces.
+        hr["occurrence"] = u", ,  January 1 15  October"
+        self.assertEqual(template.render(hr), u", , January 1 15 October starting at 21:00 10/02/2011")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_fan_out.py
+
+Tests for human_rrule.fan_out.
+"""
+
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import WEEKLY
+from dateutil.rrule import MO
+from dateutil.tz import gettz
+
+from human_rrule import instrumentation
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.fan_out import viewer, describe_for_viewers
+
+
+class fan_outTests(unittest.TestCase):
+    def setUp(self):
+        self.new_york = gettz("America/New_York")
+        self.london = gettz("Europe/London")
+        # Starts in summer time and ends in winter time.
+        self.rule = rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 8, 15, 9, tzinfo=self.new_york),
+                       until=datetime(2011, 12, 31, tzinfo=self.new_york))
+
+    def test_viewers(self):
+        viewers = [viewer(), viewer(self.london), viewer(self.london, "%d/%m/%Y", "%H:%M"),
+                   viewer(self.london, "%d/%m/%Y", locale="es_ES"), viewer(self.london)]
+        descriptions = describe_for_viewers(self.rule, viewers)
+        self.assertEqual(descriptions[0], human_rrule(self.rule).get_description())
+        own = u"each Monday of the week starting at 09:00 AM August 15, 2011 until 09:00 AM December 26, 2011 " \
+              u"in the %s time zone" % self.new_york
+        self.assertEqual(descriptions[1], own + u" (starting at 02:00 PM August 15, 2011 until 02:00 PM December 26, "
+                                                u"2011 in the %s time zone)" % self.london)
+        self.assertEqual(descriptions[2], u"each Monday of the week starting at 09:00 15/08/2011 until 09:00 "
+                                          u"26/12/2011 in the %s time zone (starting at 14:00 15/08/2011 until "
+                                          u"14:00 26/12/2011 in the %s time zone)" % (self.new_york, self.london))
+        self.assertTrue(descriptions[3].startswith(u"cada semana el lunes a partir del 15/08/2011 a las 09:00"),
+                        descriptions[3])
+        self.assertTrue(descriptions[3].endswith(u"(a partir del 15/08/2011 a las 14:00 hasta el 26/12/2011 a "
+                                                 u"las 14:00 en la zona horaria %s)" % self.london),
+                        descriptions[3])
+        self.assertEqual(descriptions[4], descriptions[1])
+        self.assertEqual(describe_for_viewers(self.rule, [viewer(gettz("America/New_York"))]), [descriptions[0]])
+
+    def test_other_day(self):
+        # Monday 21:00 in New York is Tuesday in Tokyo; the days named stay
+        # those of New York, next to the times in Tokyo.
+        tokyo = gettz("Asia/Tokyo")
+        rule = rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 8, 15, 21, tzinfo=self.new_york), count=3)
+        description = u"each Monday of the week starting at 09:00 PM August 15, 2011 three times in the %s " \
+                      u"time zone (starting at 10:00 AM August 16, 2011 in the %s time zone)" % (self.new_york, tokyo)
+        self.assertEqual(describe_for_viewers(rule, [viewer(tokyo)]), [description])
+        self.assertEqual(human_rrule(rule).get_description_in(tokyo), description)
+        self.assertTrue(human_rrule(rule).get_description_in(tokyo, locale="es").endswith(
+            u"(a partir del 16 de agosto de 2011 a las 10:00 en la zona horaria %s)" % tokyo))
+
+    def test_floating(self):
+        rule = rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 8, 15, 9), count=3)
+        hr = human_rrule(rule)
+        self.assertEqual(describe_for_viewers(hr, [viewer(self.london)]), [hr.get_description()])
+        self.assertEqual(hr.get_description_in(self.london, locale="es_ES"), hr.get_description(locale="es_ES"))
+
+    def test_one_analysis(self):
+        viewers = [viewer(zone, date_format)
+                   for zone in (self.london, gettz("Asia/Tokyo"), None)
+                   for date_format in ("%B %d, %Y", "%d/%m/%Y", "%Y-%m-%d")] * 100
+        instrumentation.reset()
+        instrumentation.enable()
+        try:
+            descriptions = describe_for_viewers(self.rule, viewers)
+        finally:
+            instrumentation.disable()
+        recorded = instrumentation.snapshot()
+        instrumentation.reset()
+        self.assertEqual(len(descriptions), 900)
+        self.assertEqual(recorded["counters"]["bounds.analytic"], 1)
+        self.assertEqual(recorded["timers"]["render"]["count"], 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_human_rrule2.py
+
+Tests for human_rrule.human_rrule2.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY
+from dateutil.rrule import MO, TU, FR, SU
+
+from human_rrule import instrumentation
+from human_rrule.int2word import int2word
+from human_rrule.rrule_eq import rrule_eq
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.rrule_bounds import iteration_budget
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+class human_rruleTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_int_as_ordinal(self):
+        self.assertEqual(human_rrule.int_as_ordinal(1), "first")
+        self.assertEqual(human_rrule.int_as_ordinal(11), "eleventh")
+        self.assertEqual(human_rrule.int_as_ordinal(30), "thirtieth")
+        self.assertEqual(human_rrule.int_as_ordinal(44), "forty fourth")
+        self.assertEqual(human_rrule.int_as_ordinal(59), "fifty ninth")
+        self.assertEqual(human_rrule.int_as_ordinal(160), "one hundred sixtieth")
+        self.assertEqual(human_rrule.int_as_ordinal(200), "two hundredth")
+        self.assertEqual(human_rrule.int_as_ordinal(278), "two hundred seventy eighth")    
+        self.assertEqual(human_rrule.int_as_ordinal(10000), "ten thousandth")
+        self.assertEqual(human_rrule.int_as_ordinal(1000012), "one million twelfth")
+        self.assertEqual(human_rrule.int_as_ordinal(-1), "last")
+        self.assertEqual(human_rrule.int_as_ordinal(-3), "third to last")
+
+    def test_int2word(self):
+        self.assertEqual(int2word(0), "zero")
+        self.assertEqual(int2word(10), "ten")
+        self.assertEqual(int2word(1784), "one thousand seven hundred eighty four")
+        self.assertEqual(int2word(2000017), "two million seventeen")
+        self.assertEqual(int2word(10 ** 60), "one vigintillion")
+        self.assertRaises(ValueError, int2word, -1)
+        
+        
+    def test_invalid_freq(self):    
+        testrr = rrule_eq("a", byweekday=MO, dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15))
+        self.assertRaises(ValueError, human_rrule, rrule=testrr)
+    
+        testrr = rrule_eq(None, byweekday=MO, dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15))
+        self.assertRaises(ValueError, human_rrule, rrule=testrr)
+        
+    def test_secondly(self):
+        correct = u"each second starting at 00:00:00 AM August 15, 2011 ten times"
+        testrr = rrule_eq(SECONDLY, dtstart=datetime(2011, 8, 15), count=10)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)
+        
+        correct = "each second of the twenty first day of the month starting at 00:00:00 AM August 21, 2011 ten times"
+        testrr = rrule_eq(SECONDLY, dtstart=datetime(2011, 8, 15), count=10, bymonthday=21)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)
+        
+    def test_minutely(self):
+        correct = u"each minute starting at 00:00:00 AM August 15, 2011 ten times"
+        testrr = rrule_eq(MINUTELY, dtstart=datetime(2011, 8, 15), count=10)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)
+        
+    def test_hourly(self):
+        correct = u"each hour starting at 00:00:00 AM August 15, 2011 ten times"
+        testrr = rrule_eq(HOURLY, dtstart=datetime(2011, 8, 15), count=10)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(time_format="%H:%M:%S %p"), correct)        
+            
+    def test_weekly(self):
+        correct = u"each Monday of the week starting at 12:00 AM August 15, 2011 ten times"
+        testrr = rrule_eq(WEEKLY, dtstart=datetime(2011, 8, 15), count=10)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(), correct)
+        
+    def test_yearly(self):
+        correct = u"each August 15 of the year starting at 12:00 AM August 15, 2011 ten times"
+        testrr = rrule_eq(YEARLY, dtstart=datetime(2011, 8, 15), count=10)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(), correct)
+
+        correct = u"each Tuesday of the year starting at 12:00 AM August 16, 2011 ten times"
+        testrr = rrule_eq(YEARLY, dtstart=datetime(2011, 8, 15), count=10, byweekday=TU)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(), correct)
+
+    def test_monthly(self):
+        correct = u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times"
+        testrr = rrule_eq(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(), correct)
+
+        correct = u"every other first Sunday of the month starting at 09:00 PM October 02, 2011 until 09:00 PM August 05, 2012"
+        testrr = rrule_eq(MONTHLY, interval=2, byweekday=SU(1), dtstart=datetime(2011, 8, 15, 21, 0, 0), until=datetime(2012, 8, 15))
+        hr = human_rrule(testrr)
+        self.assertEqual(hr.get_description(), correct)
+
+        correct = u"every other first Sunday of the month starting at 09:00 PM 10/02/2011 until 09:00 PM 08/05/2012"
+        self.assertEqual(hr.get_description(date_format="%m/%d/%Y"), correct)
+
+        correct = u"every other first Sunday of the month starting at 21:00 October 02, 2011 until 21:00 August 05, 2012"
+        self.assertEqual(hr.get_description(time_format="%H:%M"), correct)
+
+    def test_lazy(self):
+        testrr = rrule_eq(MONTHLY, interval=2, byweekday=SU(1), dtstart=datetime(2011, 8, 15, 21, 0, 0), until=datetime(2012, 8, 15))
+        eager = human_rrule(testrr)
+        hr = human_rrule(testrr, lazy=True)
+        self.assertEqual(hr["occurrence"], u" first Sunday")
+        self.assertEqual(dict.keys(hr), ["occurrence"])
+        self.assertEqual(len(hr), len(eager))
+        self.assertTrue("terminal" in hr)
+        self.assertEqual(sorted(hr.keys()), sorted(eager.keys()))
+        self.assertEqual(hr, eager)
+        self.assertEqual(hr.get_description(), eager.get_description())
+
+        testrr = rrule_eq(DAILY, dtstart=datetime(2011, 8, 15))
+        hr = human_rrule(testrr, lazy=True)
+        self.assertFalse("terminal" in hr)
+        self.assertEqual(hr.get("terminal"), None)
+        hr["interval"] = u"every"
+        eager = human_rrule(testrr)
+        eager["interval"] = u"every"
+        self.assertEqual(sorted(hr.items()), sorted(eager.items()))
+
+    def test_lazy_copy(self):
+        testrr = rrule_eq(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        eager = human_rrule(testrr)
+        hr = human_rrule(testrr, lazy=True)
+        self.assertEqual(hr.copy(), dict(eager))
+        self.assertEqual(type(hr.copy()), dict)
+        self.assertEqual(json.loads(json.dumps(hr.copy())), json.loads(json.dumps(eager)))
+        self.assertEqual(dict(**hr.copy()), dict(eager))
+
+    def test_import(self):
+        # Modules only some methods use are imported on first use.
+        script = ("import sys, human_rrule.human_rrule2; "
+                  "print [name for name in sys.modules if name.split('.')[-1] in "
+                  "('catalogs', 'occurrence_cursor', 'description_snapshot')]")
+        self.assertEqual(subprocess.check_output([sys.executable, "-c", script], cwd=ROOT).strip(), "[]")
+
+    def test_set_rrule(self):
+        hr = human_rrule(rrule_eq(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10))
+        testrr = rrule_eq(WEEKLY, dtstart=datetime(2011, 8, 15), until=datetime(2011, 10, 1))
+        hr.rrule = testrr
+        self.assertTrue(hr.rrule is testrr)
+        correct = u"each Monday of the week starting at 12:00 AM August 15, 2011 until 12:00 AM September 26, 2011"
+        self.assertEqual(hr.get_description(), correct)
+        self.assertEqual(hr._get_untiltime(), datetime(2011, 9, 26))
+
+    def test_locale(self):
+        hr = human_rrule(rrule_eq(MONTHLY, interval=14, byweekday=FR(-1), dtstart=datetime(2011, 8, 15, 0, 1),
+                                  until=datetime(2013, 1, 1)))
+        self.assertEqual(hr.get_description(locale="en"),
+                         u"every fourteenth month on the last Friday starting at 12:01 AM August 26, 2011 "
+                         u"until 12:01 AM October 26, 2012")
+        self.assertEqual(hr.get_description("%d/%m/%Y", locale="es_ES"),
+                         u"cada 14 meses el último viernes a partir del 26/08/2011 a las 00:01 "
+                         u"hasta el 26/10/2012 a las 00:01")
+
+    def test_instrumentation(self):
+        rule = rr(MONTHLY, byweekday=FR(-2), bysetpos=1, dtstart=datetime(2011, 8, 15), until=datetime(2011, 12, 31))
+        instrumentation.reset()
+        human_rrule(rule).get_description()
+        self.assertEqual(instrumentation.snapshot(), {"timers": {}, "counters": {}})
+        instrumentation.enable()
+        try:
+            human_rrule(rule).get_description()
+        finally:
+            instrumentation.disable()
+        recorded = instrumentation.snapshot()
+        instrumentation.reset()
+        for stage in ("build.occurrence", "build.terminal", "bounds.first", "bounds.last", "render", "render.format"):
+            self.assertTrue(stage in recorded["timers"], stage)
+        self.assertEqual(recorded["counters"]["bounds.iterated"], 1)
+        self.assertEqual(recorded["counters"]["occurrences_iterated"], 6)
+        self.assertTrue(recorded["counters"]["ordinal_conversions"] >= 1)
+
+    def test_update_rrule(self):
+        rule = rr(MONTHLY, byweekday=FR(-2), bysetpos=1, dtstart=datetime(2011, 8, 15), count=10)
+        for lazy in (False, True):
+            hr = human_rrule(rule, lazy=lazy)
+            hr["interval"] = u"every"
+            occurrence = hr["occurrence"]
+            hr.update_rrule(count=3)
+            self.assertEqual(hr["terminal"], u"three times")
+            self.assertEqual(hr["interval"], u"every")
+            self.assertTrue(hr["occurrence"] is occurrence)
+            self.assertEqual(hr.rrule._count, 3)
+            hr.update_rrule(count=None, until=datetime(2011, 9, 1))
+            self.assertEqual(hr._get_starttime(), datetime(2011, 8, 19))
+            self.assertEqual(hr._get_untiltime(), datetime(2011, 8, 19))
+            hr.update_rrule(until=datetime(2011, 12, 31), byweekday=MO)
+            fresh = human_rrule(hr.rrule)
+            fresh["interval"] = u"every"
+            self.assertEqual(hr, fresh)
+            self.assertEqual(hr.get_description(), fresh.get_description())
+            hr.update_rrule(until=None)
+            self.assertFalse("terminal" in hr)
+        self.assertRaises(ValueError, hr.update_rrule, freq=9)
+        self.assertEqual(hr.rrule._freq, MONTHLY)
+
+    def test_budget(self):
+        rule = rr(MONTHLY, byweekday=FR(-2), bysetpos=1, dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15))
+        exact = human_rrule(rule, budget=iteration_budget(occurrences=100))
+        self.assertFalse(exact.approximate)
+        self.assertEqual(exact.get_description(), human_rrule(rule).get_description())
+        hr = human_rrule(rule, budget=iteration_budget(occurrences=5))
+        self.assertTrue(hr.approximate)
+        self.assertEqual(hr.get_description(), u"each second to last Friday of the month starting at 12:00 AM "
+                                               u"August 19, 2011 until 12:00 AM August 15, 2012")
+        hr.rrule = rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=3)
+        self.assertFalse(hr.approximate)
+        # A rule without occurrences has no begin time to describe.
+        empty = rr(MONTHLY, bymonth=2, bymonthday=31, bysetpos=1, dtstart=datetime(2011, 8, 15),
+                   until=datetime(2013, 8, 15))
+        hr = human_rrule(empty, budget=iteration_budget(occurrences=5, periods=200000))
+        self.assertEqual(hr["begin_time"], "")
+        self.assertEqual(hr.get_description(), u"each February 31 of the month")
+        self.assertEqual(hr.snapshot().get_description(), u"each February 31 of the month")
+
+    def test_upcoming(self):
+        hr = human_rrule(rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 8, 15, 9), count=10))
+        self.assertEqual(hr.upcoming(2, datetime(2011, 9, 1)), [datetime(2011, 9, 5, 9), datetime(2011, 9, 12, 9)])
+        self.assertEqual(hr.remaining(datetime(2011, 9, 5, 9)), 7)
+        self.assertEqual(hr.between(datetime(2011, 10, 11), datetime(2012, 1, 1)), [datetime(2011, 10, 17, 9)])
+        self.assertEqual(hr.upcoming(1), [])
+        hr.update_rrule(count=20)
+        self.assertEqual(hr.remaining(datetime(2011, 9, 5, 9)), 17)
+        self.assertEqual(human_rrule(rr(DAILY, dtstart=datetime(2011, 8, 15))).remaining(), None)
+
+         
+         
+    # def test_get_dict_vals(self):
+        # d1 = { 
+            # 'a': "I",
+            # 'b': {
+                # 'a': "am",
+                # 'b': "a"
+                # },
+            # 'c': "recursive",
+            # 'd': {
+                # "a": "but",
+                # "b": "simple"
+                # },
+            # 'e': "function."
+        # } 
+
+        # l = ["I", "am", "a", "recursive", "but", "simple", "function."]
+        # dict_vals = human_rrule._get_dict_vals(d1)
+        # for i in dict_vals:
+            # self.assertIn(i, l)
+        # for i in l:
+            # self.assertIn(i, dict_vals)
+
+if __name__ == '__main__':
+    unittest.main()
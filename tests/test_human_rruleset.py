@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_human_rruleset.py
+
+Tests for human_rrule.human_rruleset.
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import rruleset
+from dateutil.rrule import MONTHLY, WEEKLY, DAILY
+from dateutil.rrule import MO, WE, FR
+
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.human_rruleset import human_rruleset
+from human_rrule.rule_registry import rule_registry
+
+
+class human_rrulesetTests(unittest.TestCase):
+    def setUp(self):
+        self.weekly = rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 8, 15, 9), until=datetime(2011, 12, 31))
+        self.monthly = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 9), count=5)
+        self.ruleset = rruleset()
+        self.ruleset.rrule(self.weekly)
+        self.ruleset.rrule(self.monthly)
+        self.ruleset.rdate(datetime(2011, 12, 25, 9))
+        self.ruleset.exdate(datetime(2011, 8, 15, 9))
+        self.ruleset.exdate(datetime(2011, 12, 25, 9))
+        self.ruleset.exrule(rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 12, 1, 9), count=4))
+
+    def test_description(self):
+        hr = human_rruleset(self.ruleset, rule_registry())
+        self.assertEqual(hr.get_description(), u", ".join([
+            u" and ".join([human_rrule(self.weekly).get_description(), human_rrule(self.monthly).get_description()]),
+            u"also on 09:00 AM December 25, 2011",
+            u"except on 09:00 AM August 15, 2011 and 09:00 AM December 25, 2011",
+            u"except each Monday of the week starting at 09:00 AM December 05, 2011 four times",
+        ]))
+
+    def test_bounds(self):
+        hr = human_rruleset(self.ruleset, rule_registry())
+        self.assertEqual(hr.first(), datetime(2011, 8, 19, 9))
+        self.assertEqual(hr.last(), datetime(2011, 12, 16, 9))
+        unbounded = rruleset()
+        unbounded.rrule(rr(DAILY, dtstart=datetime(2011, 8, 15)))
+        self.assertEqual(human_rruleset(unbounded).last(), None)
+        self.assertEqual(human_rruleset(rruleset()).first(), None)
+
+    def test_differential(self):
+        """Compare the bounds of random sets with iterating them."""
+        rand = random.Random(1908)
+        start = datetime(2011, 8, 15, 9)
+        for i in range(100):
+            ruleset = rruleset()
+            rules = []
+            for j in range(rand.randint(1, 3)):
+                freq = rand.choice((MONTHLY, WEEKLY, DAILY))
+                rule = rr(freq, interval=rand.randint(1, 3), byweekday=rand.choice((None, MO, (WE, FR))),
+                          dtstart=start + timedelta(days=rand.randint(0, 30)), count=rand.randint(1, 12))
+                rules.append(rule)
+                ruleset.rrule(rule)
+            for j in range(rand.randint(0, 3)):
+                ruleset.rdate(start + timedelta(days=rand.randint(0, 200)))
+            occurrences = [dt for rule in rules for dt in rule]
+            for j in range(rand.randint(0, 4)):
+                ruleset.exdate(rand.choice(occurrences))
+            if rand.random() < 0.3:
+                ruleset.exrule(rr(DAILY, dtstart=start + timedelta(days=rand.randint(0, 60)), count=10))
+            expected = list(ruleset)
+            hr = human_rruleset(ruleset, rule_registry())
+            self.assertEqual(hr.first(), expected and expected[0] or None)
+            self.assertEqual(hr.last(), expected and expected[-1] or None)
+
+    def test_shared(self):
+        registry = rule_registry()
+        sets = []
+        for day in range(1, 11):
+            ruleset = rruleset()
+            ruleset.rrule(rr(WEEKLY, byweekday=MO, dtstart=datetime(2011, 8, 15, 9), until=datetime(2011, 12, 31)))
+            ruleset.rdate(datetime(2011, 9, day, 9))
+            sets.append(human_rruleset(ruleset, registry))
+        for hr in sets:
+            hr.get_description()
+            hr.last()
+        self.assertEqual(registry.stats()['created'], 1)
+        self.assertTrue(sets[0]._rules[0] is sets[9]._rules[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_ics_stream.py
+
+Tests for human_rrule.ics_stream.
+"""
+
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import MONTHLY
+
+from human_rrule.ics_stream import unfold, parse_line, rrule_from_string, iter_rules, describe_ics
+
+
+class ics_streamTests(unittest.TestCase):
+    def setUp(self):
+        self.ics = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VTIMEZONE\r
+TZID:America/New_York\r
+BEGIN:DAYLIGHT\r
+DTSTART:19700308T020000\r
+RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU\r
+END:DAYLIGHT\r
+END:VTIMEZONE\r
+BEGIN:VEVENT\r
+UID:monthly@example.com\r
+DTSTART:20110815T000100\r
+RRULE:FREQ=MONTHLY;BYDAY=3FR;\r
+ COUNT=10\r
+BEGIN:VALARM\r
+TRIGGER:-PT15M\r
+RRULE:FREQ=DAILY\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:once@example.com\r
+DTSTART:20110815T090000\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:weekly@example.com\r
+DTSTART;TZID="America/New_York":20110815T090000\r
+RRULE:FREQ=WEEKLY;UNTIL=20110905T130000Z\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:floating@example.com\r
+DTSTART;VALUE=DATE:20110815\r
+RRULE:FREQ=YEARLY;UNTIL=20150815T000000Z\r
+END:VEVENT\r
+END:VCALENDAR\r
+""".splitlines(True)
+
+    def test_unfold(self):
+        self.assertEqual(list(unfold(["A:b\r\n", " c\r\n", "\td\r\n", "E:f\n"])), ["A:bcd", "E:f"])
+
+    def test_parse_line(self):
+        self.assertEqual(parse_line('DTSTART;TZID="Europe/Paris";VALUE=DATE-TIME:20110815T090000'),
+                         ("DTSTART", {"TZID": "Europe/Paris", "VALUE": "DATE-TIME"}, "20110815T090000"))
+        self.assertRaises(ValueError, parse_line, "no colon")
+
+    def test_describe_ics(self):
+        described = list(describe_ics(self.ics))
+        self.assertEqual([uid for uid, description in described],
+                         ["monthly@example.com", "weekly@example.com", "floating@example.com"])
+        self.assertEqual(described[0][1],
+                         u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times")
+        self.assertTrue(described[1][1].startswith(u"each Monday of the week starting at 09:00 AM August 15, 2011 "
+                                                   u"until 09:00 AM September 05, 2011"))
+        self.assertTrue(described[2][1].endswith(u"until 12:00 AM August 15, 2015"))
+
+    def test_rrule_from_string(self):
+        rule = rrule_from_string("DTSTART:19970902T090000;RRULE:FREQ=DAILY;INTERVAL=10;COUNT=5")
+        self.assertEqual(list(rule)[-1], datetime(1997, 10, 12, 9))
+        rule = rrule_from_string("DTSTART:19970902T090000\nRRULE:FREQ=DAILY;COUNT=5")
+        self.assertEqual(rule._count, 5)
+        rule = rrule_from_string("FREQ=WEEKLY;COUNT=2", datetime(2011, 8, 15))
+        self.assertEqual(list(rule), [datetime(2011, 8, 15), datetime(2011, 8, 22)])
+        self.assertRaises(ValueError, rrule_from_string, "RRULE:FREQ=DAILY")
+        self.assertRaises(ValueError, rrule_from_string, "SUMMARY:x;RRULE:FREQ=DAILY")
+        self.assertRaises(ValueError, rrule_from_string, "DTSTART:19970902T090000;RRULE:FREQ=SOMETIMES")
+
+    def test_invalid(self):
+        lines = ["BEGIN:VEVENT", "UID:bad", "DTSTART:2011", "RRULE:FREQ=DAILY", "END:VEVENT",
+                 "BEGIN:VEVENT", "UID:good", "DTSTART:20110815", "RRULE:FREQ=DAILY;COUNT=2", "END:VEVENT"]
+        self.assertRaises(ValueError, list, iter_rules(lines))
+        self.assertEqual([uid for uid, rule in iter_rules(lines, skip_invalid=True)], ["good"])
+
+    def test_describe_common_rules(self):
+        lines = []
+        for i, rule in enumerate(["FREQ=MONTHLY;BYMONTHDAY=-1;COUNT=3", "FREQ=YEARLY;BYWEEKNO=1,20;COUNT=3",
+                                  "FREQ=YEARLY;BYYEARDAY=100;COUNT=3", "FREQ=DAILY;INTERVAL=15;COUNT=3"]):
+            lines.extend(["BEGIN:VEVENT", "UID:%d" % i, "DTSTART:20110815T090000", "RRULE:" + rule, "END:VEVENT"])
+        self.assertEqual([description for uid, description in describe_ics(lines)], [
+            u"each last day of the month starting at 09:00 AM August 31, 2011 three times",
+            u"each first and twentieth week of the year starting at 09:00 AM January 02, 2012 three times",
+            u"each one hundredth day of the year starting at 09:00 AM April 09, 2012 three times",
+            u"every fifteenth day of the day starting at 09:00 AM August 15, 2011 three times",
+        ])
+
+    def test_undescribable(self):
+        class failing_cache(object):
+            def get_description(self, rule, date_format, time_format):
+                if rule._freq == MONTHLY:
+                    raise TypeError("cannot describe")
+                return u"described"
+        lines = self.ics
+        self.assertRaises(ValueError, list, describe_ics(lines, cache=failing_cache()))
+        described = list(describe_ics(lines, cache=failing_cache(), skip_invalid=True))
+        self.assertEqual([uid for uid, description in described], ["weekly@example.com", "floating@example.com"])
+        try:
+            list(describe_ics(lines, cache=failing_cache()))
+        except ValueError, e:
+            self.assertEqual(str(e), "event monthly@example.com: cannot describe its rule: TypeError: cannot describe")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_instrumentation.py
+
+Tests for human_rrule.instrumentation.
+"""
+
+import threading
+import unittest
+
+from human_rrule.instrumentation import disable, add_hook, remove_hook, snapshot, reset, record, count, registry
+
+
+class instrumentationTests(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def tearDown(self):
+        disable()
+        reset()
+
+    def test_registry(self):
+        seen = []
+        hook = lambda *args: seen.append(args)
+        add_hook(hook)
+        try:
+            record("render", 0.5)
+            record("render", 1.5)
+            count("ordinal_conversions")
+            count("ordinal_conversions", 2)
+        finally:
+            remove_hook(hook)
+        count("ordinal_conversions")
+        self.assertEqual(snapshot(), {
+            "timers": {"render": {"count": 2, "total": 2.0, "mean": 1.0, "max": 1.5}},
+            "counters": {"ordinal_conversions": 4},
+        })
+        self.assertEqual(seen, [("timer", "render", 0.5), ("timer", "render", 1.5),
+                                ("counter", "ordinal_conversions", 1), ("counter", "ordinal_conversions", 2)])
+
+    def test_threads(self):
+        def work():
+            record("render", 1.0)
+            count("ordinal_conversions")
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        work()
+        recorded = snapshot()
+        self.assertEqual(recorded["timers"]["render"]["count"], 5)
+        self.assertEqual(recorded["counters"], {"ordinal_conversions": 5})
+
+    def test_finished_threads(self):
+        def work():
+            record("render", 1.0)
+            count("ordinal_conversions")
+        for i in range(50):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        # Each thread drops the dicts of those that finished before it.
+        self.assertTrue(len(registry._threads) <= 2)
+        recorded = snapshot()
+        self.assertEqual(recorded["timers"]["render"]["count"], 50)
+        self.assertEqual(recorded["counters"], {"ordinal_conversions": 50})
+        reset()
+        self.assertEqual(snapshot(), {"timers": {}, "counters": {}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_nonblocking.py
+
+Tests for human_rrule.nonblocking.
+"""
+
+import time
+import unittest
+from datetime import datetime
+from multiprocessing import TimeoutError
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY, MINUTELY
+from dateutil.rrule import FR
+
+from human_rrule import instrumentation
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.nonblocking import CancelledError, is_cheap, describer
+
+
+class manual_executor(object):
+    """Runs the jobs handed to it only when told to."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def apply_async(self, func, args, callback):
+        self.jobs.append((func, args, callback))
+
+    def run(self):
+        func, args, callback = self.jobs.pop(0)
+        callback(func(*args))
+
+
+class nonblockingTests(unittest.TestCase):
+    def setUp(self):
+        self.cheap = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        self.expensive = [rr(MINUTELY, byminute=(0, 30), dtstart=datetime(2011, 8, 15, 9), until=datetime(2011, 8, day))
+                          for day in (16, 17, 18)]
+        self.executor = manual_executor()
+        self.describer = describer(self.executor, limit=2)
+
+    def test_is_cheap(self):
+        self.assertTrue(is_cheap(self.cheap))
+        self.assertTrue(is_cheap(rr(WEEKLY, dtstart=datetime(2011, 8, 15), until=datetime(2111, 8, 15))))
+        self.assertTrue(is_cheap(rr(MINUTELY, byminute=(0, 30), dtstart=datetime(2011, 8, 15), count=10)))
+        self.assertFalse(is_cheap(self.expensive[0]))
+
+    def test_inline(self):
+        pending = self.describer.describe(self.cheap)
+        self.assertTrue(pending.done())
+        self.assertEqual(pending.result(), human_rrule(self.cheap).get_description())
+        self.assertEqual(self.executor.jobs, [])
+        # The rule is analysed once, to tell it is cheap and to describe it.
+        instrumentation.reset()
+        instrumentation.enable()
+        try:
+            self.describer.describe(self.cheap).result()
+        finally:
+            instrumentation.disable()
+        recorded = instrumentation.snapshot()
+        instrumentation.reset()
+        self.assertEqual(recorded["counters"]["bounds.analytic"], 1)
+
+    def test_limit(self):
+        seen = []
+        pendings = [self.describer.describe(rule) for rule in self.expensive]
+        pendings[0].add_done_callback(seen.append)
+        self.assertEqual(len(self.executor.jobs), 2)
+        self.assertFalse(pendings[0].done())
+        self.assertRaises(TimeoutError, pendings[0].result, 0)
+        self.executor.run()
+        self.assertEqual(seen, [pendings[0]])
+        self.assertEqual(len(self.executor.jobs), 2)
+        self.executor.run()
+        self.executor.run()
+        self.assertEqual([pending.result() for pending in pendings],
+                         [human_rrule(rule).get_description() for rule in self.expensive])
+
+    def test_cancel(self):
+        pendings = [self.describer.describe(rule) for rule in self.expensive]
+        self.assertFalse(pendings[0].cancel())
+        self.assertTrue(pendings[2].cancel())
+        self.assertTrue(pendings[2].cancelled())
+        self.assertRaises(CancelledError, pendings[2].result)
+        self.executor.run()
+        self.executor.run()
+        self.assertEqual(self.executor.jobs, [])
+
+    def test_timeout(self):
+        pending = self.describer.describe(self.expensive[0], timeout=0.01)
+        waiting = self.describer.describe(self.expensive[1])
+        last = self.describer.describe(self.expensive[2], timeout=0.01)
+        seen = []
+        last.add_done_callback(seen.append)
+        time.sleep(0.2)
+        # The watchdog timed out the waiting description without anyone polling it.
+        self.assertEqual(seen, [last])
+        self.assertRaises(TimeoutError, last.result)
+        self.assertRaises(TimeoutError, pending.result)
+        self.executor.run()
+        self.executor.run()
+        self.assertEqual(self.executor.jobs, [])
+        self.assertRaises(TimeoutError, pending.result)
+        self.assertEqual(waiting.result(), human_rrule(self.expensive[1]).get_description())
+
+    def test_forget_done(self):
+        pendings = [self.describer.describe(self.expensive[i % 3], timeout=60) for i in range(10)]
+        self.assertEqual(len(self.describer._deadlines), 10)
+        while self.executor.jobs:
+            self.executor.run()
+        self.assertTrue(all([pending.done() for pending in pendings]))
+        # The watchdog no longer holds on to descriptions that are done.
+        self.assertEqual(self.describer._deadlines, [])
+
+    def test_describe_many(self):
+        invalid = rr("a", dtstart=datetime(2011, 8, 15), count=2)
+        pending = self.describer.describe_many([self.cheap] + self.expensive[:2])
+        self.assertFalse(pending.done())
+        self.executor.run()
+        self.executor.run()
+        self.assertEqual(pending.result(), [human_rrule(rule).get_description()
+                                            for rule in [self.cheap] + self.expensive[:2]])
+        self.assertRaises(ValueError, self.describer.describe_many([invalid, self.expensive[0]]).result)
+        self.executor.run()
+        pending = self.describer.describe_many(self.expensive)
+        self.assertTrue(pending.cancel())
+        self.executor.run()
+        self.executor.run()
+        self.assertEqual(self.executor.jobs, [])
+
+    def test_thread_pool(self):
+        threaded = describer(limit=2, timeout=10)
+        try:
+            descriptions = threaded.describe_many(self.expensive * 2).result()
+        finally:
+            threaded.close()
+        self.assertEqual(descriptions, [human_rrule(rule).get_description() for rule in self.expensive * 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_occurrence_cursor.py
+
+Tests for human_rrule.occurrence_cursor.
+"""
+
+import pickle
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY
+from dateutil.rrule import MO, WE, FR
+
+from human_rrule.occurrence_cursor import occurrence_cursor, COUNTED_AHEAD
+
+
+class occurrence_cursorTests(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime(2011, 8, 15, 9)
+
+    def test_polling(self):
+        rule = rr(HOURLY, interval=5, dtstart=self.start, until=self.start + timedelta(days=30))
+        cursor = occurrence_cursor(rule)
+        occurrences = list(rule)
+        now = self.start - timedelta(hours=1)
+        while now < occurrences[-1] + timedelta(hours=5):
+            ahead = [dt for dt in occurrences if dt >= now]
+            self.assertEqual(cursor.upcoming(3, now), ahead[:3])
+            self.assertEqual(cursor.remaining(now), len(ahead))
+            now += timedelta(minutes=97)
+        # Each occurrence was computed once, however many times it was polled.
+        self.assertTrue(cursor._exhausted)
+        self.assertEqual(cursor.passed, len(occurrences))
+
+    def test_backward(self):
+        rule = rr(DAILY, dtstart=self.start, count=10)
+        cursor = occurrence_cursor(rule)
+        self.assertEqual(cursor.upcoming(1, datetime(2011, 8, 20)), [datetime(2011, 8, 20, 9)])
+        self.assertEqual(cursor.upcoming(1, datetime(2011, 8, 16)), [datetime(2011, 8, 16, 9)])
+        self.assertEqual(cursor.remaining(datetime(2011, 8, 16)), 9)
+        self.assertEqual(cursor.remaining(datetime(2011, 9, 1)), 0)
+
+    def test_remaining_from_position(self):
+        iterations = []
+
+        class counted(rr):
+            def __iter__(self):
+                iterations.append(self)
+                return rr.__iter__(self)
+
+        # BYSETPOS rules are not analysed, so the rest is counted.
+        rule = counted(DAILY, byhour=(9, 10), bysetpos=1, dtstart=self.start, until=datetime(2011, 12, 1))
+        occurrences = list(rule)
+        del iterations[:]
+        cursor = occurrence_cursor(rule)
+        self.assertEqual(cursor.upcoming(1, datetime(2011, 8, 20)), [datetime(2011, 8, 20, 9)])
+        self.assertEqual(cursor.remaining(datetime(2011, 8, 20)), 103)
+        self.assertEqual(len(cursor._ahead), COUNTED_AHEAD)
+        self.assertEqual(cursor.upcoming(2, datetime(2011, 8, 31)), [datetime(2011, 8, 31, 9),
+                                                                     datetime(2011, 9, 1, 9)])
+        self.assertEqual(len(iterations), 1)
+        # Past those kept ahead, the iteration starts over once.
+        self.assertEqual(cursor.between(datetime(2011, 10, 30), datetime(2011, 11, 2)),
+                         [dt for dt in occurrences if datetime(2011, 10, 30) <= dt < datetime(2011, 11, 2)])
+        self.assertEqual(cursor.remaining(datetime(2011, 11, 29)), 2)
+        self.assertEqual(cursor.upcoming(5, datetime(2011, 11, 29)), occurrences[-2:])
+        self.assertEqual(len(iterations), 2)
+
+    def test_remaining_analysed(self):
+        rule = rr(MINUTELY, dtstart=datetime(2020, 1, 1), until=datetime(2026, 1, 1))
+        cursor = occurrence_cursor(rule)
+        self.assertEqual(cursor.remaining(datetime(2020, 1, 2)), 3155041)
+        self.assertEqual(len(cursor._ahead), 1)
+        rule = rr(MONTHLY, byweekday=FR(-1), dtstart=self.start, until=datetime(2013, 3, 29, 9))
+        self.assertEqual(occurrence_cursor(rule).remaining(datetime(2012, 1, 1)), 15)
+
+    def test_differential(self):
+        """Compare with dateutil's after and between on random rules and times."""
+        rand = random.Random(2112)
+        for i in range(50):
+            freq = rand.choice((MONTHLY, WEEKLY, DAILY, HOURLY))
+            kwargs = {"interval": rand.randint(1, 3), "byweekday": rand.choice((None, MO, (WE, FR)))}
+            if rand.random() < 0.5:
+                kwargs["count"] = rand.randint(1, 50)
+            else:
+                kwargs["until"] = self.start + timedelta(days=rand.randint(0, 200))
+            rule = rr(freq, dtstart=self.start, **kwargs)
+            occurrences = list(rule)
+            cursor = occurrence_cursor(rule)
+            for j in range(10):
+                start = self.start + timedelta(days=rand.randint(-10, 220), hours=rand.randint(0, 23))
+                end = start + timedelta(days=rand.randint(0, 30))
+                self.assertEqual(cursor.between(start, end), rule.between(start, end, inc=True) and
+                                 [dt for dt in rule.between(start, end, inc=True) if dt < end])
+                self.assertEqual(cursor.upcoming(1, start), [dt for dt in [rule.after(start, inc=True)] if dt])
+                self.assertEqual(cursor.remaining(start), len([dt for dt in occurrences if dt >= start]))
+
+    def test_pickle(self):
+        cursor = occurrence_cursor(rr(DAILY, dtstart=self.start, until=datetime(2011, 9, 1)))
+        self.assertEqual(cursor.remaining(datetime(2011, 8, 20)), 12)
+        copy = pickle.loads(pickle.dumps(cursor))
+        self.assertEqual((copy.position, copy.passed, copy._total), (None, 0, 17))
+        self.assertEqual(copy.upcoming(1, datetime(2011, 8, 31)), [datetime(2011, 8, 31, 9)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_persistent_cache.py
+
+Tests for human_rrule.persistent_cache.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta, tzinfo
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import FR
+
+from human_rrule import batch
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.persistent_cache import persistent_cache, persistent_key
+
+
+class fixed_offset(tzinfo):
+    def utcoffset(self, dt):
+        return timedelta(hours=1)
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
+class persistent_cacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "descriptions.db")
+        self.monthly = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        self.weekly = rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=10)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_warm_start(self):
+        cache = persistent_cache(self.path)
+        correct = u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times"
+        self.assertEqual(cache.get_description(self.monthly), correct)
+        cache.get_description(self.weekly, time_format="%H:%M")
+        cache.close()
+        warm = persistent_cache(self.path)
+        same = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+        self.assertEqual(warm.get_description(same), correct)
+        self.assertEqual(warm.lookup(self.weekly), None)
+        self.assertEqual(warm.lookup(self.weekly, time_format="%H:%M"),
+                         human_rrule(self.weekly).get_description(time_format="%H:%M"))
+        self.assertEqual(warm.stats(), {'hits': 2, 'misses': 1, 'size': 2})
+        warm.clear()
+        self.assertEqual(warm.stats(), {'hits': 0, 'misses': 0, 'size': 0})
+        warm.close()
+
+    def test_version(self):
+        cache = persistent_cache(self.path, version="1")
+        cache.get_description(self.monthly)
+        cache.close()
+        self.assertEqual(len(persistent_cache(self.path, version="1")), 1)
+        self.assertEqual(len(persistent_cache(self.path, version="2")), 0)
+
+    def test_rolling_upgrade(self):
+        # Old and new workers sharing the file keep each other's entries.
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE descriptions (key TEXT PRIMARY KEY, description TEXT)")
+        connection.close()
+        old = persistent_cache(self.path, version="1", flush_every=1)
+        new = persistent_cache(self.path, version="2", flush_every=1)
+        old.store(self.monthly, u"old")
+        new.store(self.monthly, u"new")
+        self.assertEqual(persistent_cache(self.path, version="1").lookup(self.monthly), u"old")
+        self.assertEqual(old.lookup(self.monthly), u"old")
+        self.assertEqual(new.lookup(self.monthly), u"new")
+        new.store(self.weekly, u"new")
+        self.assertEqual(new.prune(), 1)
+        self.assertEqual(old.lookup(self.monthly), None)
+        self.assertEqual((len(old), len(new)), (0, 2))
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall(),
+                         [(u"versioned_descriptions",)])
+        connection.close()
+        old.close()
+        new.close()
+
+    def test_batched_writes(self):
+        cache = persistent_cache(self.path, flush_every=2)
+        other = persistent_cache(self.path)
+        cache.store(self.monthly, u"monthly")
+        self.assertEqual(other.lookup(self.monthly), None)
+        cache.store(self.weekly, u"weekly")
+        self.assertEqual(other.lookup(self.monthly), u"monthly")
+        cache.close()
+        other.close()
+
+    def test_unstable_key(self):
+        rule = rr(WEEKLY, dtstart=datetime(2011, 8, 15, tzinfo=fixed_offset()), count=10)
+        self.assertEqual(persistent_key(rule), None)
+        self.assertEqual(len(persistent_key(self.weekly)), 40)
+        cache = persistent_cache(self.path)
+        self.assertEqual(cache.get_description(rule), human_rrule(rule).get_description())
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_batch(self):
+        rules = [self.monthly, self.weekly] * 3
+        expected = [human_rrule(rule).get_description() for rule in rules]
+        self.assertEqual(batch.describe_many(rules, workers=2, chunksize=1, cache_path=self.path), expected)
+        rendered = []
+        original = human_rrule.get_description
+        def counting(self, *args):
+            rendered.append(self)
+            return original(self, *args)
+        human_rrule.get_description = counting
+        try:
+            self.assertEqual(batch.describe_many(rules, workers=1, cache_path=self.path), expected)
+        finally:
+            human_rrule.get_description = original
+        self.assertEqual(rendered, [])
+        batch._caches.pop(self.path).close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_rrule_bounds.py
+
+Tests for human_rrule.rrule_bounds.
+"""
+
+import random
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY
+from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU
+
+from human_rrule.rrule_bounds import budget_exceeded, iteration_budget, rrule_bounds, first_occurrence, \
+    last_occurrence, PERIODS_PER_OCCURRENCE
+
+
+class rrule_boundsTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def assertMatchesIteration(self, rule):
+        bounds = rrule_bounds(rule)
+        occurrences = list(rule)
+        expected_first = occurrences and occurrences[0] or None
+        expected_last = occurrences and occurrences[-1] or None
+        self.assertEqual(bounds.first(), expected_first, "first of %r" % rule.__dict__)
+        self.assertEqual(bounds.last(), expected_last, "last of %r" % rule.__dict__)
+
+    def test_analytic(self):
+        self.assertTrue(rrule_bounds(rr(MINUTELY, dtstart=datetime(2011, 8, 15), count=10)).analytic)
+        self.assertTrue(rrule_bounds(rr(MONTHLY, dtstart=datetime(2011, 8, 15), byweekday=FR(3))).analytic)
+        self.assertFalse(rrule_bounds(rr(MONTHLY, dtstart=datetime(2011, 8, 15), byweekday=FR, bysetpos=-1)).analytic)
+        self.assertFalse(rrule_bounds(rr(YEARLY, dtstart=datetime(2011, 8, 15), byweekno=20)).analytic)
+        self.assertFalse(rrule_bounds(rr(HOURLY, dtstart=datetime(2011, 8, 15), byminute=(0, 30))).analytic)
+
+    def test_plain_stepping(self):
+        dtstart = datetime(2011, 8, 15, 21, 7, 3)
+        horizons = {
+            YEARLY: timedelta(days=4000),
+            MONTHLY: timedelta(days=1000),
+            WEEKLY: timedelta(days=200),
+            DAILY: timedelta(days=60),
+            HOURLY: timedelta(hours=50),
+            MINUTELY: timedelta(minutes=70),
+            SECONDLY: timedelta(seconds=90),
+        }
+        for freq, horizon in horizons.items():
+            for interval in (1, 2, 5, 7):
+                self.assertMatchesIteration(rr(freq, dtstart=dtstart, interval=interval, count=40))
+                self.assertMatchesIteration(rr(freq, dtstart=dtstart, interval=interval,
+                                               until=dtstart + horizon))
+
+    def test_large_count(self):
+        rule = rr(SECONDLY, dtstart=datetime(2011, 8, 15), count=100000)
+        self.assertEqual(last_occurrence(rule), datetime(2011, 8, 16, 3, 46, 39))
+        rule = rr(DAILY, dtstart=datetime(2011, 8, 15), count=100000)
+        self.assertEqual(last_occurrence(rule), datetime(2011, 8, 15) + timedelta(days=99999))
+
+    def test_sparse_start(self):
+        rule = rr(YEARLY, dtstart=datetime(2011, 8, 15), bymonth=2, bymonthday=29, byweekday=MO, count=3)
+        self.assertMatchesIteration(rule)
+        self.assertEqual(first_occurrence(rule), datetime(2016, 2, 29))
+
+    def test_never_occurs(self):
+        rule = rr(YEARLY, dtstart=datetime(2011, 8, 15), bymonth=2, bymonthday=30)
+        self.assertEqual(first_occurrence(rule), None)
+        self.assertEqual(last_occurrence(rule), None)
+        rule = rr(DAILY, dtstart=datetime(2011, 8, 15), until=datetime(2011, 8, 14))
+        self.assertEqual(last_occurrence(rule), None)
+
+    def test_budget(self):
+        rule = rr(MONTHLY, byweekday=FR, bysetpos=-1, dtstart=datetime(2011, 8, 15), count=24)
+        bounds = rrule_bounds(rule, iteration_budget(occurrences=10))
+        self.assertEqual(bounds.first(), datetime(2011, 8, 26))
+        self.assertRaises(budget_exceeded, bounds.last)
+        self.assertRaises(budget_exceeded, bounds.last)
+        self.assertEqual(rrule_bounds(rule, iteration_budget(occurrences=25)).last(), datetime(2013, 7, 26))
+        rule = rr(HOURLY, byminute=(0, 30), dtstart=datetime(2011, 8, 15), until=datetime(2012, 8, 15))
+        self.assertRaises(budget_exceeded, rrule_bounds(rule, iteration_budget(seconds=0)).last)
+        # Analysed rules are not limited.
+        rule = rr(SECONDLY, dtstart=datetime(2011, 8, 15), count=100000)
+        self.assertEqual(rrule_bounds(rule, iteration_budget(occurrences=1)).last(), datetime(2011, 8, 16, 3, 46, 39))
+
+    def test_budget_without_occurrences(self):
+        # dateutil tries every hour until the year 9999 without finding one.
+        rule = rr(HOURLY, byweekno=1, bymonth=6, byminute=(0, 30), dtstart=datetime(2011, 8, 15))
+        start = time.time()
+        self.assertRaises(budget_exceeded, rrule_bounds(rule, iteration_budget(seconds=0.05)).first)
+        self.assertTrue(time.time() - start < 1)
+        # An occurrences budget also limits the periods scanned.
+        rule = rr(HOURLY, bymonth=2, bymonthday=30, byminute=(0, 30), dtstart=datetime(2011, 8, 15), count=3)
+        start = time.time()
+        bounds = rrule_bounds(rule, iteration_budget(occurrences=5))
+        self.assertRaises(budget_exceeded, bounds.first)
+        self.assertEqual(bounds._scanned, 5 * PERIODS_PER_OCCURRENCE + 1)
+        self.assertTrue(time.time() - start < 1)
+        rule = rr(YEARLY, bymonth=2, bymonthday=29, bysetpos=1, dtstart=datetime(2011, 8, 15), count=3)
+        self.assertRaises(budget_exceeded, rrule_bounds(rule, iteration_budget(periods=4)).last)
+        self.assertEqual(rrule_bounds(rule, iteration_budget(periods=10)).last(), datetime(2020, 2, 29))
+
+    def test_carry_first(self):
+        rule = rr(MONTHLY, byweekday=FR, bysetpos=-1, dtstart=datetime(2011, 8, 15), count=24)
+        bounds = rrule_bounds(rule)
+        bounds.first()
+        carried = rrule_bounds(rr(MONTHLY, byweekday=FR, bysetpos=-1, dtstart=datetime(2011, 8, 15), count=2))
+        carried.carry_first(bounds)
+        self.assertEqual(carried._first, datetime(2011, 8, 26))
+        self.assertEqual(carried.last(), datetime(2011, 9, 30))
+        carried = rrule_bounds(rr(MONTHLY, byweekday=FR, bysetpos=-1, dtstart=datetime(2011, 8, 15),
+                                  until=datetime(2011, 8, 20)))
+        carried.carry_first(bounds)
+        self.assertEqual(carried.first(), None)
+
+    def test_differential(self):
+        """Compare randomly built rules against dateutil iteration."""
+        import random
+        rand = random.Random(1108)
+        weekdays = (MO, TU, WE, TH, FR, SA, SU)
+        for i in range(400):
+            freq = rand.choice((YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY))
+            kwargs = {
+                'dtstart': datetime(rand.randint(1999, 2012), rand.randint(1, 12), rand.randint(1, 28),
+                                    rand.randint(0, 23), rand.choice((0, 15, 59)), rand.choice((0, 30))),
+                'interval': rand.choice((1, 1, 2, 3, 4, 6, 7, 12)),
+                'wkst': rand.choice((0, 6)),
+            }
+            if rand.random() < 0.3:
+                kwargs['bymonth'] = tuple(rand.sample(range(1, 13), rand.randint(1, 3)))
+            if rand.random() < 0.3:
+                kwargs['bymonthday'] = tuple(rand.sample(range(-31, 0) + range(1, 32), rand.randint(1, 3)))
+            if rand.random() < 0.4:
+                if freq <= MONTHLY and rand.random() < 0.5:
+                    kwargs['byweekday'] = tuple([rand.choice(weekdays)(rand.choice((1, 2, 3, 4, 5, -1, -2)))
+                                                 for j in range(rand.randint(1, 2))])
+                else:
+                    kwargs['byweekday'] = tuple(rand.sample(weekdays, rand.randint(1, 4)))
+            if freq < HOURLY and rand.random() < 0.3:
+                kwargs['byhour'] = tuple(rand.sample(range(24), rand.randint(1, 3)))
+            if freq == HOURLY:
+                horizon = timedelta(days=rand.randint(0, 40))
+            elif freq == MINUTELY:
+                horizon = timedelta(hours=rand.randint(0, 60))
+            elif freq == SECONDLY:
+                horizon = timedelta(minutes=rand.randint(0, 90))
+            else:
+                horizon = timedelta(days=rand.randint(0, 3000))
+            if rand.random() < 0.5:
+                kwargs['count'] = rand.randint(1, 60)
+            else:
+                kwargs['until'] = kwargs['dtstart'] + horizon
+            self.assertMatchesIteration(rr(freq, **kwargs))
+
+if __name__ == '__main__':
+    unittest.main()
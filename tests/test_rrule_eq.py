@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_rrule_eq.py
+
+Tests for human_rrule.rrule_eq.
+"""
+
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY
+from dateutil.rrule import MO, TU, FR
+from dateutil.tz import gettz, tzutc
+
+from human_rrule.description_cache import description_cache
+from human_rrule.ics_stream import rrule_from_string
+from human_rrule.rrule_eq import rule_key, replace_rrule, rrule_eq
+
+
+class rrule_eqTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_equals(self):
+        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15))
+        r2 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15))
+        self.assertTrue(r1==r2)
+
+        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=MO)
+        r2 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=MO)
+        self.assertTrue(r1==r2)
+
+    def test_not_equals(self):
+        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15))
+        r2 = rrule_eq(MONTHLY, dtstart=datetime(2012, 8, 15))
+        self.assertFalse(r1==r2)
+
+        r2 = rrule_eq(DAILY, dtstart=datetime(2011, 8, 15))
+        self.assertFalse(r1==r2)
+
+        r1 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=MO)
+        r2 = rrule_eq(DAILY, dtstart=datetime(2012, 8, 15), byweekday=TU)
+        self.assertFalse(r1==r2)
+
+    def test_hash(self):
+        r1 = rrule_eq(MONTHLY, dtstart=datetime(2012, 8, 15), byweekday=FR(3), count=10)
+        r2 = rrule_eq(MONTHLY, dtstart=datetime(2012, 8, 15), byweekday=FR(3), count=10)
+        self.assertEqual(hash(r1), hash(r2))
+        self.assertEqual(len(set([r1, r2])), 1)
+        self.assertEqual(rule_key(r1), rule_key(rr(MONTHLY, dtstart=datetime(2012, 8, 15), byweekday=FR(3), count=10)))
+        eastern = gettz("America/New_York")
+        r1 = rr(WEEKLY, dtstart=datetime(2012, 8, 15, 9, tzinfo=eastern), count=3)
+        r2 = rr(WEEKLY, dtstart=datetime(2012, 8, 15, 9, tzinfo=eastern), count=3)
+        self.assertEqual(len(set([rule_key(r1), rule_key(r2)])), 1)
+
+    def test_hash_zones(self):
+        # dateutil's zones do not hash, so each instance would hash apart.
+        for zone in (tzutc, lambda: gettz("America/New_York")):
+            r1 = rrule_eq(WEEKLY, dtstart=datetime(2012, 8, 15, 9, tzinfo=zone()), count=3)
+            r2 = rrule_eq(WEEKLY, dtstart=datetime(2012, 8, 15, 9, tzinfo=zone()), count=3)
+            self.assertTrue(r1._tzinfo is not r2._tzinfo)
+            self.assertEqual(r1, r2)
+            self.assertEqual(hash(r1), hash(r2))
+            self.assertEqual(len(set([r1, r2])), 1)
+        cache = description_cache()
+        for i in range(2):
+            cache.get_description(rr(WEEKLY, dtstart=datetime(2012, 8, 15, 9, tzinfo=gettz("America/New_York")),
+                                     count=3))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_replace_rrule(self):
+        rules = [
+            rr(YEARLY, dtstart=datetime(2012, 8, 15, 9)),
+            rr(YEARLY, bymonthday=15, dtstart=datetime(2012, 8, 15, 9)),
+            rr(YEARLY, bymonth=(3, 8), dtstart=datetime(2012, 8, 15, 9)),
+            rr(MONTHLY, byweekday=(FR(3), MO(-1), TU), bymonthday=(1, -1), dtstart=datetime(2012, 8, 15), count=5),
+            rr(WEEKLY, interval=2, wkst=MO, dtstart=datetime(2012, 8, 15), until=datetime(2013, 1, 1)),
+            rr(DAILY, byhour=(9, 17), bysetpos=-1, dtstart=datetime(2012, 8, 15, 9, 30)),
+            rr(HOURLY, byminute=(0, 30), dtstart=datetime(2012, 8, 15, 9, 30)),
+        ]
+        for rule in rules:
+            self.assertEqual(rule_key(replace_rrule(rule)), rule_key(rule))
+        rule = replace_rrule(rrule_eq(MONTHLY, dtstart=datetime(2012, 8, 15), count=3), byweekday=FR(3))
+        self.assertTrue(isinstance(rule, rrule_eq))
+        self.assertEqual(list(rule), [datetime(2012, 8, 17), datetime(2012, 9, 21), datetime(2012, 10, 19)])
+        # What dateutil filled in from dtstart is filled in afresh.
+        rule = replace_rrule(rr(WEEKLY, dtstart=datetime(2012, 8, 15), count=3), dtstart=datetime(2012, 8, 16))
+        self.assertEqual(rule._byweekday, (3,))
+        self.assertRaises(TypeError, replace_rrule, rule, bymonthdays=1)
+
+    def test_replace_given(self):
+        monday, wednesday = datetime(2012, 8, 13), datetime(2012, 8, 15)
+        # A weekday given explicitly stays, even when dtstart's.
+        pinned = rrule_eq(WEEKLY, byweekday=MO, dtstart=monday, count=2)
+        self.assertEqual(replace_rrule(pinned, dtstart=wednesday)._byweekday, (0,))
+        self.assertEqual(replace_rrule(replace_rrule(pinned, count=3), dtstart=wednesday)._byweekday, (0,))
+        self.assertEqual(replace_rrule(rrule_eq(WEEKLY, dtstart=monday, count=2), dtstart=wednesday)._byweekday, (2,))
+        rule = rrule_from_string("DTSTART:20120813T000000;RRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=2")
+        self.assertEqual(replace_rrule(rule, dtstart=wednesday)._byweekday, (0,))
+        rule = rrule_eq(YEARLY, bymonth=8, dtstart=wednesday, count=2)
+        rule = replace_rrule(rule, dtstart=datetime(2012, 3, 3))
+        self.assertEqual((rule._bymonth, rule._bymonthday), ((8,), (3,)))
+        # dateutil's own rules do not say, so dtstart's weekday is taken as filled in.
+        plain = rr(WEEKLY, byweekday=MO, dtstart=monday, count=2)
+        self.assertEqual(replace_rrule(plain, dtstart=wednesday)._byweekday, (2,))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_rrule_normal.py
+
+Tests for human_rrule.rrule_normal.
+"""
+
+import random
+import unittest
+from datetime import datetime
+from itertools import islice
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY
+from dateutil.rrule import MO, TU, WE, TH, FR, SU
+
+import human_rrule.description_cache as description_cache_module
+from human_rrule.description_cache import description_cache
+from human_rrule.rrule_bounds import iteration_budget
+from human_rrule.rrule_eq import rule_key
+from human_rrule.rrule_normal import normalize, normal_key, occurrence_key, equivalent, NO_OCCURRENCES
+
+
+class rrule_normalTests(unittest.TestCase):
+    def setUp(self):
+        self.monday = datetime(2011, 8, 15, 9, 30)
+
+    def assertSameOccurrences(self, a, b, n=200):
+        self.assertEqual(list(islice(a, n)), list(islice(b, n)))
+
+    def test_defaults(self):
+        implicit = rr(WEEKLY, dtstart=self.monday, count=5)
+        explicit = rr(WEEKLY, byweekday=MO, byhour=9, byminute=30, bysecond=0, dtstart=self.monday, count=5)
+        self.assertEqual(normal_key(implicit), normal_key(explicit))
+        self.assertEqual(normalize(implicit)._byweekday, (MO.weekday,))
+
+    def test_by_parts(self):
+        shuffled = rr(WEEKLY, byweekday=(FR, MO, WE, MO), dtstart=self.monday, count=6)
+        ordered = rr(WEEKLY, byweekday=(MO, WE, FR), dtstart=self.monday, count=6)
+        self.assertEqual(normal_key(shuffled), normal_key(ordered))
+        every_month = rr(MONTHLY, bymonth=range(1, 13), bymonthday=15, dtstart=self.monday)
+        self.assertEqual(normal_key(every_month), normal_key(rr(MONTHLY, bymonthday=15, dtstart=self.monday)))
+        every_day = rr(DAILY, byweekday=(MO, TU, WE, TH, FR, 5, SU), dtstart=self.monday, count=10)
+        self.assertEqual(normal_key(every_day), normal_key(rr(DAILY, dtstart=self.monday, count=10)))
+
+    def test_keeps_nth_of_month(self):
+        # Every month turns the first Sunday of the year into that of each month.
+        rule = rr(YEARLY, bymonth=range(1, 13), byweekday=SU(1), dtstart=self.monday, count=12)
+        self.assertNotEqual(normal_key(rule), normal_key(rr(YEARLY, byweekday=SU(1), dtstart=self.monday,
+                                                             count=12)))
+        self.assertSameOccurrences(normalize(rule), rule)
+
+    def test_bounds(self):
+        late_start = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 1, 9),
+                        until=datetime(2012, 1, 31))
+        normal = normalize(late_start)
+        self.assertEqual(normal._dtstart, datetime(2011, 8, 19, 9))
+        self.assertEqual(normal._until, datetime(2012, 1, 20, 9))
+        clamped = rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 19, 9), until=datetime(2012, 1, 20, 9))
+        self.assertEqual(normal_key(late_start), normal_key(clamped))
+        self.assertSameOccurrences(normal, late_start)
+
+    def test_weekly_setpos(self):
+        # The first week runs from DTSTART, a Wednesday, so its second day is
+        # the Friday; the rule may not start on that Friday.
+        rule = rr(WEEKLY, byweekday=(MO, WE, FR), bysetpos=2, dtstart=datetime(2020, 1, 1), count=3)
+        self.assertSameOccurrences(normalize(rule), rule)
+        later = rr(WEEKLY, byweekday=(MO, WE, FR), bysetpos=2, dtstart=datetime(2020, 1, 4), count=3)
+        self.assertEqual(normalize(later)._dtstart, datetime(2020, 1, 6))
+        self.assertSameOccurrences(normalize(later), later)
+
+    def test_equivalent(self):
+        once = rr(DAILY, dtstart=self.monday, count=1)
+        self.assertTrue(equivalent(once, rr(DAILY, dtstart=self.monday, until=self.monday)))
+        self.assertNotEqual(normal_key(once), normal_key(rr(DAILY, dtstart=self.monday, until=self.monday)))
+        self.assertFalse(equivalent(once, rr(DAILY, dtstart=self.monday, count=2)))
+        self.assertFalse(equivalent(rr(DAILY, dtstart=self.monday), rr(DAILY, dtstart=self.monday, interval=2)))
+        never = rr(DAILY, dtstart=self.monday, until=datetime(2011, 8, 1))
+        self.assertEqual(occurrence_key(never), NO_OCCURRENCES)
+
+    def test_budget(self):
+        # BYSETPOS rules are iterated, so a budget of one occurrence runs out
+        # finding the last of them and the bounds are left alone.
+        rule = rr(MONTHLY, byweekday=(MO, TU, WE, TH, FR), bysetpos=-1, dtstart=datetime(2011, 8, 1),
+                  until=datetime(2013, 1, 1))
+        normal = normalize(rule, iteration_budget(occurrences=1))
+        self.assertEqual((normal._dtstart, normal._until), (rule._dtstart, rule._until))
+        self.assertEqual(normalize(rule)._until, datetime(2012, 12, 31))
+
+    def test_same_occurrences(self):
+        choice = random.Random(25).choice
+        for i in range(150):
+            params = dict(freq=choice((YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY)),
+                          interval=choice((1, 1, 2, 3)),
+                          dtstart=datetime(2011, choice((1, 2, 8, 12)), choice((1, 15, 29, 31)) % 28 + 1,
+                                           choice((0, 9))),
+                          wkst=choice((MO, SU)))
+            if choice((True, False)):
+                params['count'] = choice((1, 7, 30))
+            else:
+                params['until'] = datetime(2013, 3, 1)
+            params['byweekday'] = choice((None, (FR, MO, MO), tuple(range(7)), SU(-1), (MO(1), FR(-1))))
+            if params['freq'] in (YEARLY, MONTHLY):
+                params['bymonth'] = choice((None, range(1, 13), (6, 1)))
+                params['bymonthday'] = choice((None, (31, 1, 1), range(1, 32)))
+            params['bysetpos'] = choice((None, None, (1, -1)))
+            if params['freq'] == WEEKLY and params['byweekday'] in ((FR, MO, MO), tuple(range(7))):
+                params['bysetpos'] = choice((None, 2, (2, -1)))
+            rule = rr(**params)
+            self.assertSameOccurrences(normalize(rule), rule, 50)
+
+    def test_cache(self):
+        cache = description_cache(normalize=True)
+        cache.get_description(rr(WEEKLY, byweekday=(FR, MO), dtstart=self.monday, count=4))
+        description = cache.get_description(rr(WEEKLY, byweekday=(MO, FR), dtstart=datetime(2011, 8, 14, 9, 30),
+                                                count=4))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # A rule whose own key is cached is not normalized again.
+        normalized = []
+        original = description_cache_module.normalize_with_bounds
+        description_cache_module.normalize_with_bounds = lambda rule: normalized.append(rule) or original(rule)
+        try:
+            cache.get_description(rr(WEEKLY, byweekday=(FR, MO), dtstart=self.monday, count=4))
+        finally:
+            description_cache_module.normalize_with_bounds = original
+        self.assertEqual((normalized, cache.hits, cache.misses), ([], 2, 1))
+        self.assertEqual(description, u"each Monday, Friday of the week starting at 09:30 AM August 15, 2011 "
+                                      u"four times")
+        self.assertEqual(rule_key(normalize(normalize(rr(WEEKLY, dtstart=self.monday)))),
+                         normal_key(rr(WEEKLY, dtstart=self.monday)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_rule_registry.py
+
+Tests for human_rrule.rule_registry.
+"""
+
+import gc
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import MONTHLY, WEEKLY
+from dateutil.rrule import FR
+
+from human_rrule.rule_registry import rule_registry
+
+
+class rule_registryTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def make_rule(self):
+        return rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15, 0, 1), count=10)
+
+    def test_intern(self):
+        registry = rule_registry()
+        first = registry.intern(self.make_rule())
+        second = registry.intern(self.make_rule())
+        self.assertTrue(first is second)
+        self.assertFalse(registry.intern(rr(WEEKLY, dtstart=datetime(2011, 8, 15))) is first)
+        correct = u"each third Friday of the month starting at 12:01 AM August 19, 2011 ten times"
+        self.assertEqual(second.get_description(), correct)
+        self.assertTrue(first.get_description() is second.get_description())
+        self.assertRaises(AttributeError, setattr, first, 'rule', None)
+        stats = registry.stats()
+        self.assertEqual((stats['requests'], stats['created'], stats['shared']), (3, 2, 1))
+        self.assertTrue(stats['bytes_saved'] > 0)
+
+    def test_weak(self):
+        registry = rule_registry()
+        entry = registry.intern(self.make_rule())
+        self.assertEqual(len(registry), 1)
+        del entry
+        gc.collect()
+        self.assertEqual(len(registry), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_vector_bounds.py
+
+Tests for human_rrule.vector_bounds.
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY
+from dateutil.rrule import MO, TU, WE, TH, FR, SA, SU
+from dateutil.tz import gettz
+
+from human_rrule import vector_bounds
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.rrule_bounds import rrule_bounds
+from human_rrule.vector_bounds import DAYS, MONTHS, vectorizable, batch_bounds
+
+
+class vector_boundsTests(unittest.TestCase):
+    def test_vectorizable(self):
+        dtstart = datetime(2011, 8, 15, 9, 30)
+        self.assertEqual(vectorizable(rr(DAILY, interval=3, dtstart=dtstart, count=10)), DAYS)
+        self.assertEqual(vectorizable(rr(WEEKLY, byweekday=FR, dtstart=dtstart, count=10)), DAYS)
+        self.assertEqual(vectorizable(rr(MONTHLY, bymonthday=28, dtstart=dtstart, count=10)), MONTHS)
+        self.assertEqual(vectorizable(rr(YEARLY, dtstart=dtstart, until=datetime(2020, 1, 1))), MONTHS)
+        self.assertEqual(vectorizable(rr(DAILY, dtstart=dtstart)), None)
+        self.assertEqual(vectorizable(rr(HOURLY, dtstart=dtstart, count=10)), None)
+        self.assertEqual(vectorizable(rr(DAILY, byhour=(9, 17), dtstart=dtstart, count=10)), None)
+        self.assertEqual(vectorizable(rr(WEEKLY, byweekday=(MO, FR), dtstart=dtstart, count=10)), None)
+        self.assertEqual(vectorizable(rr(MONTHLY, bymonthday=31, dtstart=dtstart, count=10)), None)
+        self.assertEqual(vectorizable(rr(MONTHLY, byweekday=FR(3), dtstart=dtstart, count=10)), None)
+        self.assertEqual(vectorizable(rr(YEARLY, bymonth=2, bymonthday=29, dtstart=dtstart, count=10)), None)
+
+    def test_without_numpy(self):
+        numpy, vector_bounds.numpy = vector_bounds.numpy, None
+        try:
+            self.assertEqual(batch_bounds([rr(DAILY, dtstart=datetime(2011, 8, 15), count=10)]), [None])
+        finally:
+            vector_bounds.numpy = numpy
+
+    @unittest.skipIf(vector_bounds.numpy is None, "NumPy is not installed")
+    def test_differential(self):
+        """Compare the bounds of randomly built rules with rrule_bounds."""
+        rand = random.Random(1508)
+        tz = gettz("America/New_York")
+        rules = []
+        for i in range(500):
+            freq = rand.choice((YEARLY, MONTHLY, WEEKLY, DAILY))
+            kwargs = {"interval": rand.choice((1, 1, 2, 3, 7)), "wkst": rand.randint(0, 6)}
+            if freq == WEEKLY and rand.random() < 0.6:
+                kwargs["byweekday"] = rand.choice((MO, TU, WE, TH, FR, SA, SU))
+            elif freq == MONTHLY and rand.random() < 0.6:
+                kwargs["bymonthday"] = rand.randint(1, 28)
+            elif freq == YEARLY and rand.random() < 0.6:
+                kwargs["bymonth"], kwargs["bymonthday"] = rand.randint(1, 12), rand.randint(1, 28)
+            if rand.random() < 0.3:
+                kwargs["byhour"] = rand.randint(0, 23)
+            dtstart = datetime(rand.randint(1990, 2030), rand.randint(1, 12), rand.randint(1, 28),
+                               rand.randint(0, 23), rand.choice((0, 30)))
+            if rand.random() < 0.2:
+                dtstart = dtstart.replace(tzinfo=tz)
+            if rand.random() < 0.5:
+                kwargs["count"] = rand.randint(1, 300)
+            else:
+                kwargs["until"] = dtstart + timedelta(days=rand.randint(-5, 3000), hours=rand.randint(0, 23))
+            rules.append(rr(freq, dtstart=dtstart, **kwargs))
+        for rule, known in zip(rules, batch_bounds(rules)):
+            bounds = rrule_bounds(rule)
+            self.assertEqual((known.first(), known.last()), (bounds.first(), bounds.last()), rule.__dict__)
+
+    @unittest.skipIf(vector_bounds.numpy is None, "NumPy is not installed")
+    def test_batch(self):
+        rules = [
+            rr(WEEKLY, dtstart=datetime(2011, 8, 15), count=10),
+            rr(MONTHLY, byweekday=FR(3), dtstart=datetime(2011, 8, 15), count=10),
+            rr(DAILY, dtstart=datetime(2011, 8, 15), until=datetime(2011, 8, 14)),
+            rr(DAILY, dtstart=datetime(2011, 8, 15), count=10 ** 7),
+        ]
+        found = batch_bounds(rules)
+        self.assertEqual((found[0].first(), found[0].last()), (datetime(2011, 8, 15), datetime(2011, 10, 17)))
+        self.assertEqual(found[1], None)
+        self.assertEqual((found[2].first(), found[2].last()), (None, None))
+        # Past datetime.max, left to rrule_bounds.
+        self.assertEqual(found[3], None)
+        self.assertEqual(human_rrule(rules[0], bounds=found[0]).get_description(),
+                         human_rrule(rules[0]).get_description())
+
+if __name__ == '__main__':
+    unittest.main()
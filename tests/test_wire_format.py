@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_wire_format.py
+
+Tests for human_rrule.wire_format.
+"""
+
+import cPickle
+import unittest
+from datetime import datetime
+
+from dateutil.rrule import rrule as rr
+from dateutil.rrule import YEARLY, MONTHLY, WEEKLY, DAILY, MINUTELY
+from dateutil.rrule import MO, FR, SU
+from dateutil.tz import gettz, tzoffset, tzutc
+
+from human_rrule import instrumentation, wire_format
+from human_rrule.human_rrule2 import human_rrule
+from human_rrule.rrule_eq import rrule_eq, rule_key
+from human_rrule.wire_format import to_bytes, from_bytes, WIRE_VERSION
+
+
+class wire_formatTests(unittest.TestCase):
+    def setUp(self):
+        dtstart = datetime(2011, 8, 15, 9, 30, 15)
+        ny = gettz("America/New_York")
+        self.rules = [
+            rr(MONTHLY, byweekday=FR(3), dtstart=dtstart, count=10),
+            rr(MONTHLY, interval=2, byweekday=(SU(1), MO(-1)), dtstart=dtstart, until=datetime(2012, 8, 15)),
+            rr(WEEKLY, byweekday=MO, dtstart=dtstart.replace(tzinfo=ny), until=datetime(2012, 1, 1, tzinfo=ny)),
+            rr(YEARLY, byeaster=0, dtstart=datetime(1961, 1, 1, tzinfo=tzutc()), count=3),
+            rr(DAILY, dtstart=dtstart),
+            rr(MINUTELY, byminute=(0, 30), dtstart=dtstart, count=5),
+            rrule_eq(MONTHLY, byweekday=FR(-2), bysetpos=1, dtstart=dtstart, until=datetime(2011, 12, 31)),
+        ]
+
+    def test_round_trip(self):
+        for rule in self.rules:
+            for lazy in (False, True):
+                hr = human_rrule(rule, lazy=lazy)
+                description = hr.get_description()
+                copy = from_bytes(to_bytes(hr))
+                self.assertEqual(rule_key(copy.rrule), rule_key(rule))
+                self.assertTrue(copy.rrule.__class__ is rule.__class__)
+                self.assertEqual(sorted(dict.items(copy)), sorted(dict.items(hr)))
+                self.assertEqual(copy.get_description(), description)
+                self.assertEqual(copy, hr)
+
+    def test_no_iteration(self):
+        hr = human_rrule(self.rules[-1])
+        data = to_bytes(hr)
+        instrumentation.reset()
+        instrumentation.enable()
+        try:
+            from_bytes(data).get_description("%m/%d/%Y")
+        finally:
+            instrumentation.disable()
+        recorded = instrumentation.snapshot()
+        instrumentation.reset()
+        self.assertFalse("occurrences_iterated" in recorded["counters"])
+        self.assertFalse("build.occurrence" in recorded["timers"])
+
+    def test_snapshot(self):
+        for rule in self.rules[:4]:
+            snapshot = human_rrule(rule).snapshot()
+            data = to_bytes(snapshot)
+            self.assertEqual(from_bytes(data), snapshot)
+            self.assertTrue(len(data) < len(cPickle.dumps(snapshot, 2)))
+        seen = human_rrule(self.rules[2]).snapshot().in_zone(gettz("Asia/Tokyo"))
+        copy = from_bytes(to_bytes(seen))
+        self.assertEqual(copy, seen)
+        self.assertEqual(copy.get_description(), seen.get_description())
+
+    def test_zone_memo(self):
+        wire_format._tz_pickles.clear()
+        wire_format._tz_objects.clear()
+        for i in range(wire_format.TZ_MEMO_SIZE * 2):
+            ny = gettz("America/New_York")
+            to_bytes(human_rrule(rr(DAILY, dtstart=datetime(2011, 8, 15, 9, tzinfo=ny), count=3)))
+        self.assertEqual(len(wire_format._tz_pickles), 1)
+        for i in range(wire_format.TZ_MEMO_SIZE * 2):
+            to_bytes(human_rrule(rr(DAILY, dtstart=datetime(2011, 8, 15, 9, tzinfo=tzoffset(None, i * 60)),
+                                    count=3)))
+        self.assertTrue(len(wire_format._tz_pickles) <= wire_format.TZ_MEMO_SIZE)
+        self.assertTrue(len(wire_format._tz_objects) <= wire_format.TZ_MEMO_SIZE)
+
+    def test_invalid(self):
+        data = to_bytes(human_rrule(self.rules[0]))
+        self.assertEqual(ord(data[0]), WIRE_VERSION)
+        self.assertRaises(ValueError, from_bytes, chr(WIRE_VERSION + 1) + data[1:])
+        self.assertRaises(ValueError, from_bytes, "")
+        self.assertRaises(ValueError, to_bytes, self.rules[0])
+
+if __name__ == '__main__':
+    unittest.main()